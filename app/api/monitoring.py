@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.services import llm_cache, llm_resilience, stt, telemetry
+
+router = APIRouter(prefix="/monitoring")
+# Prometheus가 기본 경로(/metrics)로 수집할 수 있도록 prefix 없이 등록
+metrics_router = APIRouter()
+
+
+@router.get("/stt")
+def stt_stats():
+    return stt.get_pool().stats()
+
+
+@router.get("/llm_cache")
+def llm_cache_stats():
+    cache = llm_cache.get_cache()
+    return cache.stats() if cache is not None else {"backend": "off"}
+
+
+@router.get("/llm")
+def llm_stats():
+    return llm_resilience.stats()
+
+
+@metrics_router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(
+        telemetry.render_prometheus(), media_type="text/plain; version=0.0.4")
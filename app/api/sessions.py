@@ -1,7 +1,19 @@
-from app.services import firebase_crud, llm_service, rag
+from app.services import (
+    audio_assets,
+    firebase_crud,
+    firebase_crud_async,
+    llm_service,
+    ownership,
+    question_bank,
+    rag,
+    stt,
+    telemetry,
+    tts,
+    vad,
+)
+from app.services.interview import InterviewEngine
+from app.services.jobs import FINAL_EVAL, job_queue
 from app.models.schemas import (
-    EvaluationSchema,
-    InteractionLogSchema,
     ReportResponse,
     SessionCreateResponse,
     SessionCreateSchema,
@@ -9,26 +21,32 @@ from app.models.schemas import (
     SessionJoinResponse,
     SessionProfilePayload,
 )
+from app.config import STT_STREAM_SAMPLE_RATE
 from pydantic import BaseModel
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    HTTPException,
+    WebSocket,
+    WebSocketDisconnect,
+)
 from google import genai
 from google.genai import types
-from pydub import AudioSegment
-from pydub.effects import speedup
 import asyncio
-import edge_tts
-import io
-import speech_recognition as sr
-import os
+import json
 import re
 import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional, Tuple
 
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
-SPEED_UP_RATE = 1.2
+INTERVIEW_GREETING = "안녕하세요. 지금부터 면접을 시작하겠습니다. 질문을 들으신 뒤, 답변해주세요."
+INTERVIEW_CLOSING = "수고하셨습니다. 면접이 종료되었습니다. 좋은 결과 있길 바랍니다."
+INTERVIEW_SAVE_ERROR = "면접 기록을 저장하지 못했습니다. 잠시 후 다시 연결해주세요."
 
 TEMP_RAG_DB = {
     "company_overview": "회사 개요",
@@ -121,11 +139,9 @@ def join_session(code: str, req: SessionJoinRequest):
     if not session_id:
         raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
     # Firestore에서 세션 정보 조회
-    db = firebase_crud.get_db()
-    doc = db.collection("sessions").document(session_id).get()
-    if not doc.exists:
+    data = firebase_crud.get_session(session_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="세션이 존재하지 않습니다.")
-    data = doc.to_dict()
     # 이름, 비밀번호 검증
     if not firebase_crud.verify_password(req.password, data.get("pw_hash", "")):
         raise HTTPException(status_code=401, detail="비밀번호가 일치하지 않습니다.")
@@ -137,33 +153,32 @@ def join_session(code: str, req: SessionJoinRequest):
 def persona_api(code: str):
 
     session_id = firebase_crud.get_session_id_by_code(code)
-    db = firebase_crud.get_db()
-    doc = db.collection("sessions").document(session_id).get()
-    if not doc.exists:
+    if not session_id:
+        raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
+    data = firebase_crud.get_session(session_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="세션이 존재하지 않습니다.")
-    data = doc.to_dict()
+    telemetry.bind_session(session_id)
     company = data.get("company")
     position = data.get("position")
-    rag_info_ref = db.collection("jobs").document(f"({company}, {position})")
-    rag_info = rag_info_ref.get()
-    if rag_info.exists:
-        rag_info = rag_info.to_dict()
-    else:
-        rag_info = TEMP_RAG_DB
-    persona_dict = llm_service.generate_persona(rag_info, company, position)
+    # 질문 은행에 사전 생성된 페르소나 템플릿이 있으면 LLM 호출 없이 사용
+    persona_dict = question_bank.sample_persona(company, position)
+    if persona_dict is None:
+        rag_info = firebase_crud.get_job_info(company, position) or TEMP_RAG_DB
+        persona_dict = llm_service.generate_persona(
+            rag_info, company, position)
     persona = persona_dict.get("persona", "") if isinstance(
         persona_dict, dict) else ""
     # Firestore에 persona 저장
-    if not session_id:
-        raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
-
-    db.collection("sessions").document(session_id).update(
+    firebase_crud.update_session(
+        session_id,
         {
             "persona": persona,
             "persona_name": persona_dict.get("persona_name", ""),
             "department": persona_dict.get("department", ""),
         }
     )
+    telemetry.flush_session(session_id)
     return PersonaResponse(
         persona_name=persona_dict.get("persona_name", ""),
         department=persona_dict.get("department", ""),
@@ -177,12 +192,9 @@ def get_persona(code: str):
     if not session_id:
         raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
 
-    db = firebase_crud.get_db()
-    doc = db.collection("sessions").document(session_id).get()
-    if not doc.exists:
+    data = firebase_crud.get_session(session_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="세션이 존재하지 않습니다.")
-
-    data = doc.to_dict()
     persona_name = data.get("persona_name", "")
     department = data.get("department", "")
     return PersonaResponse(
@@ -192,21 +204,22 @@ def get_persona(code: str):
 
 
 @router.post("/sessions/{code}/questions", response_model=GenerateQuestionsResponse)
-def questions_api(code: str, req: GenerateQuestionsRequest):
-    session_id = firebase_crud.get_session_id_by_code(code)
+async def questions_api(
+    code: str, req: GenerateQuestionsRequest, background_tasks: BackgroundTasks
+):
+    session_id = await firebase_crud_async.get_session_id_by_code(code)
     if not session_id:
         raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
-    db = firebase_crud.get_db()
-    doc = db.collection("sessions").document(session_id).get()
-    if not doc.exists:
+    data = await firebase_crud_async.get_session(session_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="세션이 존재하지 않습니다.")
-    data = doc.to_dict()
     persona = data.get("persona")
     if not persona:
         raise HTTPException(
             status_code=400,
             detail="세션에 페르소나가 없습니다. 먼저 페르소나를 생성하세요.",
         )
+    telemetry.bind_session(session_id)
     user_info = {
         "company": data.get("company", ""),
         "position": data.get("position", ""),
@@ -218,17 +231,17 @@ def questions_api(code: str, req: GenerateQuestionsRequest):
 
     company = data.get("company")
     position = data.get("position")
-    rag_info_ref = db.collection("jobs").document(f"({company}, {position})")
-    rag_info = rag_info_ref.get()
-    if rag_info.exists:
-        rag_info = rag_info.to_dict()
-    else:
-        rag_info = TEMP_RAG_DB
-
-    keywords = rag.get_top_keywords_by_category(user_info)
-    questions = llm_service.generate_questions(
-        persona, keywords, user_info, rag_info, req.num_questions
+    # 질문 은행 캐시 우선, 없으면 LLM으로 생성
+    questions = await asyncio.to_thread(
+        question_bank.sample_questions, company, position, persona, req.num_questions
     )
+    if questions is None:
+        rag_info = await firebase_crud_async.get_job_info(company, position) or TEMP_RAG_DB
+
+        keywords = await rag.get_top_keywords_by_category_async(user_info)
+        questions = await llm_service.generate_questions_async(
+            persona, keywords, user_info, rag_info, req.num_questions
+        )
     print(questions)
     if not isinstance(questions, list) or len(questions) == 0:
         raise HTTPException(
@@ -245,8 +258,15 @@ def questions_api(code: str, req: GenerateQuestionsRequest):
                 "difficulty": None,  # 난이도 필드 예약
             }
         )
-    db.collection("sessions").document(session_id).update(
-        {"questions": questions_with_meta}
+    # 질문이 바뀌면 이전 진행 상태는 버림
+    await firebase_crud_async.update_session(
+        session_id, {"questions": questions_with_meta, "interview_state": None})
+    await telemetry.flush_session_async(session_id)
+    # 음성 면접에서 합성을 기다리지 않도록 질문 음성을 미리 만들어 둠
+    background_tasks.add_task(
+        tts.prerender,
+        [INTERVIEW_GREETING, INTERVIEW_CLOSING]
+        + [q["text"] for q in questions_with_meta],
     )
     return GenerateQuestionsResponse(questions=questions_with_meta)
 
@@ -299,19 +319,75 @@ def save_interview_info(code: str, payload: SessionInterviewInfoPayload):
     return {"message": "Interview info saved successfully"}
 
 
+async def _claim_session(websocket: WebSocket, session_id: str) -> Optional[ownership.SessionLease]:
+    """
+    면접 소켓의 세션 소유권을 얻는다. 다른 워커가 진행 중이면 넘겨줄 때까지 잠시 기다리고,
+    그래도 얻지 못하면 현재 소유자 정보를 알려준 뒤 연결을 닫고 None을 반환한다.
+    """
+    lease = ownership.SessionLease(session_id)
+    if await lease.acquire():
+        return lease
+    await websocket.send_json({"event": "session_owner", **ownership.public(lease.lease)})
+    await websocket.close(code=4009)
+    return None
+
+
+def _on_lease_lost(websocket: WebSocket, engine: InterviewEngine):
+    """
+    다른 연결/워커가 세션을 넘겨받으면 이 연결은 더 이상 턴을 처리하거나 상태를 저장하지 않고 닫는다.
+    """
+    async def close():
+        try:
+            await websocket.send_json(
+                {"event": "session_moved", "message": "다른 연결에서 면접을 이어서 진행합니다."})
+            await websocket.close(code=4009)
+        except Exception:
+            pass
+
+    def on_lost():
+        engine.detach()
+        asyncio.create_task(close())
+
+    return on_lost
+
+
+@asynccontextmanager
+async def _interview_session(websocket: WebSocket, session_id: str, data: dict):
+    """
+    면접 소켓(/ws/chat, /ws/stt) 공통 준비와 정리.
+    소유권을 얻고 최신 진행 상태로 엔진을 만들어 넘기며(얻지 못하면 None), 연결이 끝나면
+    남은 평가/로그 저장, 세션 LLM 비용 반영, 소유권 해제를 한 번씩 수행한다.
+    """
+    lease = await _claim_session(websocket, session_id)
+    if lease is None:
+        yield None
+        return
+    # 이전 소유자가 마지막으로 저장한 진행 상태를 캐시를 거치지 않고 읽음
+    data = await firebase_crud_async.get_session(session_id, use_cache=False) or data
+    # 이 소켓에서 시작한 평가/꼬리질문 호출 비용을 세션에 합산
+    telemetry.bind_session(session_id)
+    # 재접속이면 체크포인트된 질문(또는 꼬리질문)부터 이어서 진행
+    engine = InterviewEngine.from_session(session_id, data)
+    lease.on_lost = _on_lease_lost(websocket, engine)
+    try:
+        yield engine
+    finally:
+        await engine.close()
+        await telemetry.flush_session_async(session_id)
+        await lease.release()
+
+
 @router.websocket("/sessions/{code}/ws/chat")
 async def chat_ws(websocket: WebSocket, code: str):
     await websocket.accept()
-    session_id = firebase_crud.get_session_id_by_code(code)
+    session_id = await firebase_crud_async.get_session_id_by_code(code)
     if not session_id:
         await websocket.close(code=4001)
         return
-    db = firebase_crud.get_db()
-    doc = db.collection("sessions").document(session_id).get()
-    if not doc.exists:
+    data = await firebase_crud_async.get_session(session_id)
+    if data is None:
         await websocket.close(code=4002)
         return
-    data = doc.to_dict()
     questions = data.get("questions", [])
     if not questions:
         await websocket.send_json(
@@ -319,106 +395,47 @@ async def chat_ws(websocket: WebSocket, code: str):
         )
         await websocket.close(code=4003)
         return
-    turn = 0
-    try:
-        while turn < len(questions):
-            # 질문 전송
-            await websocket.send_json({"question": questions[turn]["text"]})
-            # 답변 수신
-            answer = await websocket.receive_text()
-            # 평가
-            evaluation = llm_service.evaluate_answer(
-                questions[turn]["text"], answer)
-            print(evaluation)
-            # dict가 아니면 빈 dict로 처리
-            if not isinstance(evaluation, dict):
-                evaluation = {}
-            # categories에서 점수/피드백 추출
-            categories = evaluation.get("categories", [])
-            scores = [cat.get("score", 0) for cat in categories]
-            feedbacks = [cat.get("feedback", "") for cat in categories]
-            # InteractionLog 기록 (평가 결과는 클라에 전송X)
-            evaluations = (
-                [EvaluationSchema(categories=categories)] if categories else []
-            )
-            log = InteractionLogSchema(
-                turn=turn + 1,
-                question=questions[turn]["text"],
-                answer=answer,
-                evaluation=evaluations,
+    async with _interview_session(websocket, session_id, data) as engine:
+        if engine is None:
+            return
+        try:
+            while not engine.finished:
+                if engine.detached:
+                    return
+                question_text, is_followup = engine.current_question()
+                # 질문 전송
+                payload = {"question": question_text}
+                if is_followup:
+                    payload["followup"] = True
+                await websocket.send_json(payload)
+                # 답변 수신
+                answer = await websocket.receive_text()
+                # 평가와 꼬리질문 판단을 한 번의 호출로 시작하고, 제때 결론이 나지 않으면 바로 다음 질문으로 진행
+                # (꼬리질문은 질문당 최대 2회)
+                engine.start_answer(answer)
+                await engine.advance()
+            # 남은 평가/인터랙션 로그를 모두 저장한 뒤 종료 상태로 변경하고 최종 평가 요청
+            if not await engine.complete():
+                await websocket.send_json({"error": INTERVIEW_SAVE_ERROR})
+                await websocket.close(code=4005)
+                return
+            await websocket.send_json(
+                {"event": "면접 종료", "message": "모든 질문이 소진되었습니다."}
             )
-            firebase_crud.add_interaction(session_id, log)
-            # 꼬리질문 판단
-            followup_count = 0
-            avg_score = None
-            if scores and len(scores) > 0:
-                try:
-                    avg_score = sum(float(s) for s in scores) / len(scores)
-                except Exception:
-                    avg_score = None
-            need_followup = False
-            if avg_score is not None and avg_score < 3:
-                need_followup = True
-            # 꼬리질문 최대 2회
-            q_and_a_history = [
-                {"question": questions[turn]["text"], "answer": answer}]
-            while need_followup and followup_count < 2:
-                # insufficient_judgment를 활용해 꼬리질문 필요성 및 질문 생성
-                followup_result = llm_service.insufficient_judgment(
-                    data.get("persona", ""), q_and_a_history
-                )
-                if not (
-                    isinstance(followup_result, dict)
-                    and followup_result.get("followup")
-                ):
-                    break
-                followup_q = followup_result.get("question", "")
-                await websocket.send_json({"question": followup_q, "followup": True})
-                followup_answer = await websocket.receive_text()
-                followup_eval = llm_service.evaluate_answer(
-                    followup_q, followup_answer)
-                if not isinstance(followup_eval, dict):
-                    followup_eval = {}
-                followup_categories = followup_eval.get("categories", [])
-                followup_scores = [cat.get("score", 0)
-                                   for cat in followup_categories]
-                followup_evaluations = (
-                    [EvaluationSchema(categories=followup_categories)]
-                    if followup_categories
-                    else []
-                )
-                log = InteractionLogSchema(
-                    turn=turn + 1,
-                    question=followup_q,
-                    answer=followup_answer,
-                    evaluation=followup_evaluations,
-                )
-                firebase_crud.add_interaction(session_id, log)
-                followup_count += 1
-                # q_and_a_history에 추가
-                q_and_a_history.append(
-                    {"question": followup_q, "answer": followup_answer}
-                )
-                # 추가 꼬리질문 필요 여부 재판단
-                need_followup = False
-                avg_score = None
-                if followup_scores and len(followup_scores) > 0:
-                    try:
-                        avg_score = sum(float(s) for s in followup_scores) / len(
-                            followup_scores
-                        )
-                    except Exception:
-                        avg_score = None
-                if avg_score is not None and avg_score < 3:
-                    need_followup = True
-            turn += 1
-        firebase_crud.save_chat_end(session_id)
-        await websocket.send_json(
-            {"event": "면접 종료", "message": "모든 질문이 소진되었습니다."}
-        )
-        await websocket.close()
-    except WebSocketDisconnect:
-        pass
+            await websocket.close()
+        except WebSocketDisconnect:
+            pass
+
+
+@router.get("/sessions/{code}/owner")
+def get_session_owner(code: str):
+    """
+    면접을 진행 중인 워커 조회 (sticky 라우팅용). 진행 중인 워커가 없으면 owner가 null.
+    """
+    session_id = firebase_crud.get_session_id_by_code(code)
+    if not session_id:
+        raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
+    return ownership.public(ownership.owner(session_id))
 
 
 @router.post("/sessions/{code}/chat/end")
@@ -430,53 +447,79 @@ def end_session(code: str):
     if status != "chat_end":
         raise HTTPException(status_code=500, detail="면접 종료 전 채팅을 종료해주세요.")
 
-    # eval 추가
+    # 최종 평가는 백그라운드 작업으로 실행 (이미 제출된 경우 기존 작업 반환)
+    job = job_queue.submit(FINAL_EVAL, session_id)
     return {
         "message": "Interview session ended successfully",
         "final_evaluation": "in-progress",
+        "job_id": job["id"],
     }
 
 
-@router.post("/sessions/{code}/final_eval")
-def final_eval_session(code: str):
-    session_id = firebase_crud.get_session_id_by_code(code)
+async def _ended_session_id(code: str) -> str:
+    session_id = await firebase_crud_async.get_session_id_by_code(code)
     if not session_id:
         raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
-    status = firebase_crud.get_session_status(session_id)
+    status = await firebase_crud_async.get_session_status(session_id)
     if status != "chat_end":
         raise HTTPException(status_code=500, detail="면접이 아직 종료되지 않았습니다.")
+    return session_id
+
+
+@router.post("/sessions/{code}/final_eval")
+async def final_eval_session(code: str):
+    """
+    최종 평가 결과를 반환한다. 아직 없으면 작업을 제출(또는 진행 중인 작업에 합류)하고 끝날 때까지 기다린다.
+    """
+    session_id = await _ended_session_id(code)
+    data = await firebase_crud_async.get_session(session_id)
+    if data and data.get("final_eval"):
+        return data["final_eval"]
+    job = job_queue.submit(FINAL_EVAL, session_id)
+    try:
+        return await job_queue.wait(job["id"])
+    except Exception as e:
+        print("final_eval_error", e)
+        raise HTTPException(status_code=500, detail="최종 평가 실패")
 
-    # 해당 세션의 인터랙션만 추출
-    db = firebase_crud.get_db()
-    interactions_ref = (
-        db.collection("sessions").document(
-            session_id).collection("interactions")
-    )
-    print(interactions_ref)
-    interactions = list(interactions_ref.stream())
-    logs = [x.to_dict() for x in interactions]
-    result = llm_service.final_eval(logs)
 
-    db.collection("sessions").document(
-        session_id).update({"final_eval": result})
-    return result
+@router.post("/sessions/{code}/final_eval/jobs", status_code=202)
+async def submit_final_eval(code: str):
+    session_id = await _ended_session_id(code)
+    return job_queue.submit(FINAL_EVAL, session_id)
+
+
+@router.get("/sessions/{code}/final_eval")
+async def get_final_eval(code: str):
+    """
+    최종 평가 작업 상태를 조회한다. 완료되었으면 result에 결과가 포함된다.
+    """
+    session_id = await firebase_crud_async.get_session_id_by_code(code)
+    if not session_id:
+        raise HTTPException(status_code=404, detail="세션 코드가 유효하지 않습니다.")
+    data = await firebase_crud_async.get_session(session_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail="세션을 찾을 수 없습니다.")
+    job = data.get(f"{FINAL_EVAL}_job")
+    if data.get("final_eval"):
+        return {"status": "done", "job": job, "result": data["final_eval"]}
+    if not job:
+        return {"status": "not_started", "job": None, "result": None}
+    return {"status": job.get("status"), "job": job, "result": None}
 
 
 @router.websocket("/sessions/{code}/ws/stt")
 async def sst_ws(websocket: WebSocket, code: str):
     await websocket.accept()
-    session_id = firebase_crud.get_session_id_by_code(code)
+    session_id = await firebase_crud_async.get_session_id_by_code(code)
     if not session_id:
         await websocket.close(code=4001)
         return
 
-    db = firebase_crud.get_db()
-    doc = db.collection("sessions").document(session_id).get()
-    if not doc.exists:
+    data = await firebase_crud_async.get_session(session_id)
+    if data is None:
         await websocket.close(code=4002)
         return
-
-    data = doc.to_dict()
     questions = data.get("questions", [])
     if not questions:
         await websocket.send_json({"error": "세션에 질문이 없습니다. 먼저 질문을 생성하세요."})
@@ -484,8 +527,8 @@ async def sst_ws(websocket: WebSocket, code: str):
         return
 
     client = genai.Client()
-    SAMPLE_RATE = 24000
-    CHANNELS = 1
+    SAMPLE_RATE = tts.SAMPLE_RATE
+    CHANNELS = tts.CHANNELS
 
     async def ws_safe_send_json(payload) -> bool:
         try:
@@ -544,7 +587,11 @@ async def sst_ws(websocket: WebSocket, code: str):
     #         await websocket.send_json({"error": "TTS 생성에 실패했습니다."})
     #     finally:
     #         await websocket.send_json({"event": "question_audio_end"})
-    async def stream_tts(text: str, voice_name: str = "Sadaltager"):  # voice_name은 시그니처 유지용
+    async def stream_tts(
+        text: str,
+        prefetched: Optional[tts.SpeechPrefetch] = None,
+        voice_name: str = "Sadaltager",  # voice_name은 시그니처 유지용
+    ):
         await ws_safe_send_json({
             "event": "question_audio_start",
             "sample_rate": SAMPLE_RATE,
@@ -552,53 +599,37 @@ async def sst_ws(websocket: WebSocket, code: str):
             "format": "pcm_s16le"
         })
         try:
-            mp3_buf = io.BytesIO()
-            # edge-tts를 통해 MP3 바이트를 생성
-            communicate = edge_tts.Communicate(
-                text, "ko-KR-HyunsuMultilingualNeural")
-            async for chunk in communicate.stream():
-                if chunk.get("type") == "audio" and chunk.get("data"):
-                    mp3_buf.write(chunk["data"])
-            mp3_buf.seek(0)
-
-            # MP3 -> PCM(SAMPLE_RATE, mono, s16le) 변환 및 배속 처리(현재 1.0x)
-            seg = AudioSegment.from_file(mp3_buf, format="mp3")
-
-            try:
-                seg = speedup(seg, playback_speed=SPEED_UP_RATE)
-            except Exception:
-                # speedup 실패 시 프레임레이트 트릭으로 대체 가속
-                seg = seg._spawn(seg.raw_data, overrides={
-                    "frame_rate": int(seg.frame_rate * SPEED_UP_RATE)})
-
-            seg = seg.set_channels(CHANNELS).set_frame_rate(
-                SAMPLE_RATE).set_sample_width(2)
-            pcm_bytes = seg.raw_data
-            if pcm_bytes:
-                await ws_safe_send_bytes(pcm_bytes)
+            # 합성이 끝나기 전부터 고정 크기 PCM 청크를 순서대로 전송
+            sent_any = False
+            # 미리 합성 중인 같은 문장이 있으면 이미 받은 청크부터 바로 전송
+            if prefetched is not None and prefetched.text == text:
+                source = prefetched.stream()
             else:
+                source = tts.stream_pcm(text)
+            async for pcm_chunk in source:
+                if not await ws_safe_send_bytes(pcm_chunk):
+                    break
+                sent_any = True
+            if not sent_any:
                 await ws_safe_send_json({"error": "TTS 응답이 비어있습니다."})
         except Exception:
             await ws_safe_send_json({"error": "TTS 생성에 실패했습니다."})
         finally:
             await ws_safe_send_json({"event": "question_audio_end"})
 
-    async def stream_wav_file(file_path: str, sample_rate: int = 24000, channels: int = 1):
+    async def stream_audio_asset(name: str):
         """
-        로컬 WAV/오디오 파일을 읽어 PCM s16le로 변환하여 바이너리로 스트리밍.
+        앱 시작 시 PCM s16le로 변환해 둔 안내 음성을 바이너리로 스트리밍.
         클라이언트는 'question_audio_start'/'question_audio_end' 이벤트를 재사용해 재생한다.
         """
         await ws_safe_send_json({
             "event": "question_audio_start",
-            "sample_rate": sample_rate,
-            "channels": channels,
+            "sample_rate": SAMPLE_RATE,
+            "channels": CHANNELS,
             "format": "pcm_s16le"
         })
         try:
-            seg = AudioSegment.from_file(file_path)
-            seg = seg.set_channels(channels).set_frame_rate(
-                sample_rate).set_sample_width(2)
-            pcm_bytes = seg.raw_data
+            pcm_bytes = audio_assets.get_pcm(name)
             if pcm_bytes:
                 await ws_safe_send_bytes(pcm_bytes)
             else:
@@ -608,170 +639,154 @@ async def sst_ws(websocket: WebSocket, code: str):
         finally:
             await ws_safe_send_json({"event": "question_audio_end"})
 
-    def transcribe_wav(wav_bytes: bytes) -> str:
+    async def transcribe_wav(wav_bytes: bytes) -> str:
         """
-        클라이언트가 보낸 WAV(PCM s16le, mono, 16kHz 권장)를 그대로 Google Web Speech API(ko-KR)로 전사.
+        STT 워커 풀에서 전사한다. 풀이 가득 차면 안내 후 빈 문자열(재시도)로 처리.
         """
         try:
-            wav_buf = io.BytesIO(wav_bytes)
-            recognizer = sr.Recognizer()
-            with sr.AudioFile(wav_buf) as source:
-                audio_data = recognizer.record(source)
-            text = recognizer.recognize_google(audio_data, language='ko-KR')
-            print("stt_text", text)
-            return text.strip()
-        except sr.UnknownValueError:
-            print("stt_unknown_error")
-            return ""
-        except Exception as e:
-            print("stt_error", e)
+            return await stt.get_pool().transcribe(wav_bytes)
+        except stt.STTBusyError:
+            await ws_safe_send_json({"error": "음성 인식 요청이 많습니다. 잠시 후 다시 답변해주세요."})
             return ""
 
-    turn = 0
-    try:
-        await stream_tts("안녕하세요. 지금부터 면접을 시작하겠습니다. 질문을 들으신 뒤, 답변해주세요.")
-        await asyncio.sleep(5)
-        while turn < len(questions):
-            question_text = questions[turn]["text"]
-            await stream_tts(question_text)
-
-            # STT 재시도 루프: 인식 실패 시 같은 질문에 대해 재녹음을 요청
-            max_retries = 2
-            attempt = 0
-            answer_text = ""
-            while attempt <= max_retries and not answer_text:
-                recv = await websocket.receive()
-
-                wav_bytes = None
-                if recv.get("type") == "websocket.disconnect":
-                    break
-                if "bytes" in recv and recv["bytes"] is not None:
-                    wav_bytes = recv["bytes"]
-                elif "text" in recv and recv["text"]:
-                    pass
+    async def receive_audio_stream(sample_rate: int) -> Tuple[str, str]:
+        """
+        스트리밍 모드: 'audio_stream_start' 이후 PCM s16le mono 프레임을 바이너리로 받고
+        'audio_stream_end'에서 종료한다. 서버 VAD로 나뉜 발화는 끝나는 즉시 전사되어
+        'partial_transcript' 이벤트로 전송되며, 종료 시 전체 답변 텍스트를 반환한다.
+        """
+        async def send_partial(text: str):
+            await ws_safe_send_json({"event": "partial_transcript", "text": text})
+
+        transcriber = stt.StreamingTranscriber(
+            stt.get_pool(), sample_rate=sample_rate, on_partial=send_partial)
+        while True:
+            recv = await websocket.receive()
+            if recv.get("type") == "websocket.disconnect":
+                transcriber.cancel()
+                return "disconnect", ""
+            if recv.get("bytes") is not None:
+                transcriber.feed(recv["bytes"])
+                continue
+            if parse_event(recv.get("text")).get("event") == "audio_stream_end":
+                break
+        text = (await transcriber.finish()).strip()
+        await ws_safe_send_json({"event": "final_transcript", "text": text})
+        return "ok", text
+
+    async def reject_audio_stream(sample_rate) -> Tuple[str, str]:
+        """
+        지원하지 않는 sample_rate로 시작한 스트림은 오류를 알리고 audio_stream_end까지 버린다.
+        빈 답변으로 처리되어 같은 질문에 대해 재녹음을 요청한다.
+        """
+        await ws_safe_send_json({
+            "event": "audio_stream_error",
+            "error": f"지원하지 않는 sample_rate입니다: {sample_rate!r}",
+            "supported_sample_rates": list(vad.SUPPORTED_SAMPLE_RATES),
+        })
+        while True:
+            recv = await websocket.receive()
+            if recv.get("type") == "websocket.disconnect":
+                return "disconnect", ""
+            if recv.get("bytes") is not None:
+                continue
+            if parse_event(recv.get("text")).get("event") == "audio_stream_end":
+                return "ok", ""
+
+    def parse_event(text: Optional[str]) -> dict:
+        try:
+            payload = json.loads(text or "")
+            return payload if isinstance(payload, dict) else {}
+        except ValueError:
+            return {}
 
-                if not wav_bytes:
-                    await ws_safe_send_json({"error": "오디오 응답이 필요합니다."})
-                    try:
-                        await websocket.close(code=4004)
-                    except Exception:
-                        pass
+    async def receive_answer() -> Tuple[str, str]:
+        """
+        답변 하나를 받아 전사한다. (상태, 텍스트) 반환
+        - 상태: ok | disconnect | invalid(오디오가 아닌 메시지)
+        - WAV 한 덩어리 또는 스트리밍 PCM(audio_stream_start ~ audio_stream_end)을 지원
+        """
+        recv = await websocket.receive()
+        if recv.get("type") == "websocket.disconnect":
+            return "disconnect", ""
+        if recv.get("bytes") is not None:
+            return "ok", await transcribe_wav(recv["bytes"])
+        event = parse_event(recv.get("text"))
+        if event.get("event") == "audio_stream_start":
+            sample_rate = vad.parse_sample_rate(
+                event.get("sample_rate", STT_STREAM_SAMPLE_RATE))
+            if sample_rate is None:
+                return await reject_audio_stream(event.get("sample_rate"))
+            return await receive_audio_stream(sample_rate)
+        return "invalid", ""
+
+    async with _interview_session(websocket, session_id, data) as engine:
+        if engine is None:
+            return
+        # 다음에 재생할 문장의 TTS를 미리 합성해 두는 버퍼
+        prefetched: Optional[tts.SpeechPrefetch] = None
+        try:
+            if not engine.finished:
+                prefetched = tts.SpeechPrefetch(engine.current_question()[0])
+            # 이어서 진행하는 경우에는 시작 인사를 생략
+            if not engine.resumed:
+                await stream_tts(INTERVIEW_GREETING)
+                await asyncio.sleep(5)
+            while not engine.finished:
+                if engine.detached:
                     return
-
-                answer_text = transcribe_wav(wav_bytes)
-                if not answer_text:
-                    attempt += 1
-                    if attempt <= max_retries:
-                        retry_audio_path = os.path.abspath(os.path.join(
-                            os.path.dirname(__file__), "../../retry_inform.wav"))
-                        await stream_wav_file(retry_audio_path, sample_rate=SAMPLE_RATE, channels=CHANNELS)
-            evaluation = llm_service.evaluate_answer(
-                question_text, answer_text)
-            if not isinstance(evaluation, dict):
-                evaluation = {}
-
-            categories = evaluation.get("categories", [])
-            scores = [cat.get("score", 0) for cat in categories]
-            evaluations = (
-                [EvaluationSchema(categories=categories)] if categories else []
-            )
-            log = InteractionLogSchema(
-                turn=turn + 1,
-                question=question_text,
-                answer=answer_text,
-                evaluation=evaluations,
-            )
-            firebase_crud.add_interaction(session_id, log)
-
-            followup_count = 0
-            avg_score = None
-            if scores and len(scores) > 0:
+                question_text, is_followup = engine.current_question()
+                await stream_tts(question_text, prefetched)
+
+                # STT 재시도 루프: 인식 실패 시 같은 질문에 대해 재녹음을 요청
+                max_retries = 2
+                attempt = 0
+                answer_text = ""
+                status = "ok"
+                while attempt <= max_retries and not answer_text:
+                    status, answer_text = await receive_answer()
+                    if status == "disconnect":
+                        # 답변을 기록하지 않고 종료해 재접속 시 같은 질문부터 이어서 진행
+                        return
+                    if status == "invalid":
+                        if is_followup:
+                            break
+                        await ws_safe_send_json({"error": "오디오 응답이 필요합니다."})
+                        try:
+                            await websocket.close(code=4004)
+                        except Exception:
+                            pass
+                        return
+
+                    if not answer_text:
+                        attempt += 1
+                        if attempt <= max_retries:
+                            await stream_audio_asset("retry_inform")
+
+                # 평가와 꼬리질문 판단을 한 번의 호출로 시작하고, 기다리는 동안 다음 질문(또는 종료 인사) 음성을 미리 합성
+                engine.start_answer(answer_text, judge=status == "ok")
+                next_text = engine.upcoming_question() or INTERVIEW_CLOSING
+                if prefetched is None or prefetched.text != next_text:
+                    prefetched = tts.SpeechPrefetch(next_text)
+                await engine.advance()
+
+            # 남은 평가/인터랙션 로그를 모두 저장한 뒤 종료 상태로 변경하고 최종 평가 요청
+            if not await engine.complete():
+                await ws_safe_send_json({"error": INTERVIEW_SAVE_ERROR})
                 try:
-                    avg_score = sum(float(s) for s in scores) / len(scores)
+                    await websocket.close(code=4005)
                 except Exception:
-                    avg_score = None
-            need_followup = False
-            if avg_score is not None and avg_score < 3:
-                need_followup = True
-            q_and_a_history = [
-                {"question": question_text, "answer": answer_text}]
-
-            while need_followup and followup_count < 2:
-                followup_result = llm_service.insufficient_judgment(
-                    data.get("persona", ""), q_and_a_history
-                )
-                if not (isinstance(followup_result, dict) and followup_result.get("followup")):
-                    break
-                followup_q = followup_result.get("question", "")
-                await stream_tts(followup_q)
-
-                # Follow-up STT 재시도 루프
-                max_retries_fu = 2
-                attempt_fu = 0
-                followup_answer = ""
-                while attempt_fu <= max_retries_fu and not followup_answer:
-                    recv_fu = await websocket.receive()
-                    fu_wav = None
-                    if recv_fu.get("type") == "websocket.disconnect":
-                        need_followup = False
-                        break
-                    if "bytes" in recv_fu and recv_fu["bytes"] is not None:
-                        fu_wav = recv_fu["bytes"]
-                    if not fu_wav:
-                        need_followup = False
-                        break
-
-                    followup_answer = transcribe_wav(fu_wav)
-                    if not followup_answer:
-                        attempt_fu += 1
-                        if attempt_fu <= max_retries_fu:
-                            retry_audio_path = os.path.abspath(os.path.join(
-                                os.path.dirname(__file__), "../../retry_inform.wav"))
-                            await stream_wav_file(retry_audio_path, sample_rate=SAMPLE_RATE, channels=CHANNELS)
-
-                followup_eval = llm_service.evaluate_answer(
-                    followup_q, followup_answer)
-                if not isinstance(followup_eval, dict):
-                    followup_eval = {}
-                followup_categories = followup_eval.get("categories", [])
-                followup_scores = [cat.get("score", 0)
-                                   for cat in followup_categories]
-                followup_evaluations = (
-                    [EvaluationSchema(categories=followup_categories)]
-                    if followup_categories
-                    else []
-                )
-                log = InteractionLogSchema(
-                    turn=turn + 1,
-                    question=followup_q,
-                    answer=followup_answer,
-                    evaluation=followup_evaluations,
-                )
-                firebase_crud.add_interaction(session_id, log)
-                followup_count += 1
-                q_and_a_history.append(
-                    {"question": followup_q, "answer": followup_answer})
-
-                need_followup = False
-                avg_score = None
-                if followup_scores and len(followup_scores) > 0:
-                    try:
-                        avg_score = sum(
-                            float(s) for s in followup_scores) / len(followup_scores)
-                    except Exception:
-                        avg_score = None
-                if avg_score is not None and avg_score < 3:
-                    need_followup = True
-
-            turn += 1
-
-        firebase_crud.save_chat_end(session_id)
-        # 종료 인사
-        await stream_tts("수고하셨습니다. 면접이 종료되었습니다. 좋은 결과 있길 바랍니다.")
-        await ws_safe_send_json({"event": "면접 종료", "message": "모든 질문이 소진되었습니다."})
-        try:
-            await websocket.close()
-        except Exception:
+                    pass
+                return
+            # 종료 인사
+            await stream_tts(INTERVIEW_CLOSING, prefetched)
+            await ws_safe_send_json({"event": "면접 종료", "message": "모든 질문이 소진되었습니다."})
+            try:
+                await websocket.close()
+            except Exception:
+                pass
+        except WebSocketDisconnect:
             pass
-    except WebSocketDisconnect:
-        pass
+        finally:
+            if prefetched is not None:
+                prefetched.cancel()
@@ -0,0 +1,118 @@
+import os
+import socket
+
+from dotenv import load_dotenv
+
+# .env 파일에서 환경변수 자동 로드
+load_dotenv()
+
+# LLM 호출 설정
+LLM_MODEL = os.getenv("LLM_MODEL", "gemini/gemini-2.5-flash")
+# 호출 1회당 타임아웃(초)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "30"))
+# 워커 하나에서 동시에 진행할 수 있는 LLM 호출 수
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+
+# 세션/인터랙션/채용 공고 저장소: firestore(운영) | memory | sqlite
+# memory/sqlite는 Firebase 자격 증명과 네트워크 없이 로컬 부하 테스트/CI 벤치마크를 돌릴 때 사용
+# (이때 LEASE_BACKEND는 memory여야 한다)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firestore")
+STORAGE_PATH = os.getenv("STORAGE_PATH", "data/storage.sqlite3")
+
+# 질문 은행(사전 생성 질문 캐시) 설정
+QUESTION_BANK_ENABLED = os.getenv("QUESTION_BANK_ENABLED", "true").lower() == "true"
+# (회사, 직무)별 질문 은행 문서를 메모리에 유지하는 시간(초)
+QUESTION_BANK_CACHE_TTL = float(os.getenv("QUESTION_BANK_CACHE_TTL", "300"))
+
+# 키워드 임베딩 인덱스 설정 (python -m app.services.keyword_index 로 생성)
+KEYWORD_EMBED_MODEL = os.getenv("KEYWORD_EMBED_MODEL", "jina_ai/jina-embeddings-v3")
+KEYWORD_INDEX_DIR = os.getenv("KEYWORD_INDEX_DIR", "data/keyword_index")
+
+# 키워드 선택 결과 캐시 (정규화된 사용자 텍스트 해시 기준)
+KEYWORD_CACHE_SIZE = int(os.getenv("KEYWORD_CACHE_SIZE", "1024"))
+KEYWORD_CACHE_TTL = float(os.getenv("KEYWORD_CACHE_TTL", "3600"))
+
+# 세션 캐시 설정
+# 세션 코드 -> session_id 매핑은 생성 후 바뀌지 않으므로 개수 제한만 둔다
+SESSION_CODE_CACHE_SIZE = int(os.getenv("SESSION_CODE_CACHE_SIZE", "10000"))
+# 세션 문서 read-through 캐시 (쓰기 시 무효화)
+SESSION_CACHE_SIZE = int(os.getenv("SESSION_CACHE_SIZE", "2048"))
+SESSION_CACHE_TTL = float(os.getenv("SESSION_CACHE_TTL", "5"))
+
+# 인터랙션 로그 write-behind 설정
+INTERACTION_FLUSH_INTERVAL = float(os.getenv("INTERACTION_FLUSH_INTERVAL", "2"))
+INTERACTION_BATCH_SIZE = int(os.getenv("INTERACTION_BATCH_SIZE", "20"))
+# 세션 종료 시 남은 로그 저장 재시도 횟수와 첫 대기 시간(초, 매번 2배)
+INTERACTION_CLOSE_RETRIES = int(os.getenv("INTERACTION_CLOSE_RETRIES", "3"))
+INTERACTION_CLOSE_BACKOFF = float(os.getenv("INTERACTION_CLOSE_BACKOFF", "0.5"))
+
+# TTS 스트리밍 시 한 번에 보내는 PCM 바이트 수 (24kHz s16le mono 기준 9600 = 0.2초)
+TTS_CHUNK_BYTES = int(os.getenv("TTS_CHUNK_BYTES", "9600"))
+
+# TTS PCM 캐시 (디스크 + 메모리 LRU)
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "data/tts_cache")
+TTS_CACHE_MEMORY_SIZE = int(os.getenv("TTS_CACHE_MEMORY_SIZE", "256"))
+# 백그라운드 사전 합성 동시 실행 수
+TTS_PRERENDER_CONCURRENCY = int(os.getenv("TTS_PRERENDER_CONCURRENCY", "2"))
+
+# STT 워커 풀 설정
+STT_BACKEND = os.getenv("STT_BACKEND", "google")  # google | offline
+STT_POOL_MODE = os.getenv("STT_POOL_MODE", "thread")  # thread | process
+STT_WORKERS = int(os.getenv("STT_WORKERS", str(os.cpu_count() or 4)))
+# 워커가 모두 바쁠 때 대기시킬 수 있는 최대 요청 수 (넘으면 즉시 거절)
+STT_MAX_QUEUE = int(os.getenv("STT_MAX_QUEUE", "32"))
+# offline 백엔드가 발화마다 돌려주는 전사 문장
+STT_OFFLINE_TEXT = os.getenv("STT_OFFLINE_TEXT", "네, 답변드리겠습니다.")
+
+# 스트리밍 STT(VAD) 설정
+STT_STREAM_SAMPLE_RATE = int(os.getenv("STT_STREAM_SAMPLE_RATE", "16000"))
+# 프레임 RMS가 이 값 이상이면 음성으로 판단 (s16le 기준)
+VAD_ENERGY_THRESHOLD = float(os.getenv("VAD_ENERGY_THRESHOLD", "500"))
+# 이 시간(ms) 이상 조용하면 발화가 끝난 것으로 판단
+VAD_END_SILENCE_MS = int(os.getenv("VAD_END_SILENCE_MS", "600"))
+
+# 최종 평가 방식: multi(카테고리별 요약 + 총평 개별 호출) | single(JSON 스키마 한 번 호출)
+FINAL_EVAL_MODE = os.getenv("FINAL_EVAL_MODE", "multi")
+
+# 백그라운드 작업 큐 (최종 평가 등)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_STORE = os.getenv("JOB_STORE", "memory")  # memory | sqlite
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "data/jobs.sqlite3")
+
+# 턴 파이프라인: 답변 평가/꼬리질문 판단을 기다리는 최대 시간(초). 넘으면 다음 질문으로 진행
+FOLLOWUP_DECISION_WAIT = float(os.getenv("FOLLOWUP_DECISION_WAIT", "2.0"))
+
+# LLM 응답 캐시 (같은 템플릿 + 정규화된 입력이면 호출 없이 재사용)
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")  # memory | sqlite | off
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "4096"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite3")
+
+# 최종 평가 프롬프트 크기 제한 (추정 토큰 수). 넘으면 오래된 턴부터 줄이거나 요약한다
+FINAL_EVAL_LOG_TOKEN_BUDGET = int(os.getenv("FINAL_EVAL_LOG_TOKEN_BUDGET", "6000"))
+CATEGORY_FEEDBACK_TOKEN_BUDGET = int(os.getenv("CATEGORY_FEEDBACK_TOKEN_BUDGET", "1500"))
+# 줄인 턴에서 남기는 답변 최대 글자 수
+PROMPT_ANSWER_MAX_CHARS = int(os.getenv("PROMPT_ANSWER_MAX_CHARS", "200"))
+
+# LLM 호출 복원력 정책
+# 한 번의 ask_llm 호출(재시도/대체 모델 포함) 전체 제한 시간(초). 시도별 제한은 LLM_TIMEOUT
+LLM_DEADLINE = float(os.getenv("LLM_DEADLINE", "40"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+# 재시도 대기: min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2^시도) 범위에서 무작위 (full jitter)
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "4"))
+# 연속 실패가 이 횟수에 도달하면 회로를 열고, LLM_BREAKER_RESET초 뒤 한 번 시험 호출
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET = float(os.getenv("LLM_BREAKER_RESET", "30"))
+# 기본 모델이 실패하거나 회로가 열렸을 때 사용할 대체 모델 (빈 값이면 사용 안 함)
+LLM_FALLBACK_MODEL = os.getenv("LLM_FALLBACK_MODEL", "")
+
+# 세션 소유권(lease): 면접 소켓과 최종 평가 작업을 한 워커만 처리하도록 한다
+# 여러 워커/노드로 실행할 때는 firestore로 설정 (memory는 단일 프로세스용 Redis 대체 구현)
+LEASE_BACKEND = os.getenv("LEASE_BACKEND", "memory")  # memory | firestore
+LEASE_TTL = float(os.getenv("LEASE_TTL", "30"))
+# 다른 워커가 소유한 세션에 연결되면 이전 소유자가 넘겨줄 때까지 기다리는 최대 시간(초)
+LEASE_HANDOFF_WAIT = float(os.getenv("LEASE_HANDOFF_WAIT", "5"))
+# 이 워커의 식별자와 소유자 조회 시 알려줄 접속 주소 (sticky 라우팅용)
+WORKER_ID = os.getenv("WORKER_ID", f"{socket.gethostname()}-{os.getpid()}")
+WORKER_URL = os.getenv("WORKER_URL", "")
@@ -2,7 +2,7 @@ import os
 
 import firebase_admin
 from dotenv import load_dotenv
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
 
 # .env 파일에서 환경변수 자동 로드
 load_dotenv()
@@ -33,3 +33,15 @@ def get_db():
     if _db is None:
         _db = init_firebase()
     return _db
+
+
+# 비동기 핸들러(WebSocket, 백그라운드 작업)에서 사용할 Firestore AsyncClient 반환
+_async_db = None
+
+
+def get_async_db():
+    global _async_db
+    if _async_db is None:
+        get_db()  # firebase 앱 초기화
+        _async_db = firestore_async.client()
+    return _async_db
@@ -0,0 +1,144 @@
+from typing import List, Optional, Tuple
+
+from google.cloud.firestore_v1 import Increment
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.core.firebase import get_async_db, get_db
+from app.db.repository import Repository
+
+QUESTION_BANK_COLLECTION = "question_bank"
+
+# Firestore batch는 최대 500개 쓰기까지 허용
+_BATCH_LIMIT = 500
+
+
+class FirestoreRepository(Repository):
+    """
+    Firestore 저장소 (운영 환경). 인터랙션은 sessions/{id}/interactions 하위 컬렉션에 저장한다.
+    """
+
+    name = "firestore"
+
+    def _sessions(self):
+        return get_db().collection("sessions")
+
+    def get_session(self, session_id: str) -> Optional[dict]:
+        doc = self._sessions().document(session_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def create_session(self, data: dict) -> str:
+        session_ref = self._sessions().document()
+        session_ref.set(data)
+        return session_ref.id
+
+    def update_session(self, session_id: str, update_data: dict) -> None:
+        self._sessions().document(session_id).update(update_data)
+
+    def increment_session(self, session_id: str, deltas: dict) -> None:
+        # 여러 워커가 동시에 더해도 값이 덮어써지지 않도록 서버 측 Increment 사용
+        self.update_session(
+            session_id, {key: Increment(value) for key, value in deltas.items()})
+
+    def find_session_by_code(self, code: str) -> Optional[str]:
+        query = self._sessions().where(filter=FieldFilter("code", "==", code)).limit(1)
+        for doc in query.stream():
+            return doc.id
+        return None
+
+    def list_session_ids(self) -> List[str]:
+        return [doc.id for doc in self._sessions().stream()]
+
+    def add_interactions(self, session_id: str, logs: List[dict]) -> List[str]:
+        db = get_db()
+        interactions_ref = self._sessions().document(session_id).collection("interactions")
+        ids = []
+        for i in range(0, len(logs), _BATCH_LIMIT):
+            batch = db.batch()
+            for log in logs[i: i + _BATCH_LIMIT]:
+                interaction_ref = interactions_ref.document()
+                batch.set(interaction_ref, log)
+                ids.append(interaction_ref.id)
+            batch.commit()
+        return ids
+
+    def get_interactions(self, session_id: str) -> List[dict]:
+        interactions_ref = self._sessions().document(session_id).collection("interactions")
+        return [x.to_dict() for x in interactions_ref.stream()]
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        doc = get_db().collection("jobs").document(job_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    def save_job(self, job_id: str, data: dict) -> None:
+        get_db().collection("jobs").document(job_id).set(data)
+
+    def list_jobs(self) -> List[Tuple[str, dict]]:
+        return [(doc.id, doc.to_dict()) for doc in get_db().collection("jobs").stream()]
+
+    def get_bank_entries(self, company: str, position: str) -> List[dict]:
+        query = (
+            get_db().collection(QUESTION_BANK_COLLECTION)
+            .where(filter=FieldFilter("company", "==", company))
+            .where(filter=FieldFilter("position", "==", position))
+        )
+        return [doc.to_dict() for doc in query.stream()]
+
+    def save_bank_entry(self, doc_id: str, data: dict) -> None:
+        get_db().collection(QUESTION_BANK_COLLECTION).document(doc_id).set(data)
+
+    def async_view(self):
+        return AsyncFirestoreRepository()
+
+
+class AsyncFirestoreRepository:
+    """
+    FirestoreRepository의 비동기 버전. Firestore AsyncClient를 사용해 이벤트 루프를 막지 않는다.
+    """
+
+    name = "firestore"
+
+    def _sessions(self):
+        return get_async_db().collection("sessions")
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        doc = await self._sessions().document(session_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    async def create_session(self, data: dict) -> str:
+        session_ref = self._sessions().document()
+        await session_ref.set(data)
+        return session_ref.id
+
+    async def update_session(self, session_id: str, update_data: dict) -> None:
+        await self._sessions().document(session_id).update(update_data)
+
+    async def increment_session(self, session_id: str, deltas: dict) -> None:
+        await self.update_session(
+            session_id, {key: Increment(value) for key, value in deltas.items()})
+
+    async def find_session_by_code(self, code: str) -> Optional[str]:
+        query = self._sessions().where(filter=FieldFilter("code", "==", code)).limit(1)
+        async for doc in query.stream():
+            return doc.id
+        return None
+
+    async def add_interactions(self, session_id: str, logs: List[dict]) -> List[str]:
+        db = get_async_db()
+        interactions_ref = self._sessions().document(session_id).collection("interactions")
+        ids = []
+        for i in range(0, len(logs), _BATCH_LIMIT):
+            batch = db.batch()
+            for log in logs[i: i + _BATCH_LIMIT]:
+                interaction_ref = interactions_ref.document()
+                batch.set(interaction_ref, log)
+                ids.append(interaction_ref.id)
+            await batch.commit()
+        return ids
+
+    async def get_interactions(self, session_id: str) -> List[dict]:
+        interactions_ref = self._sessions().document(session_id).collection("interactions")
+        return [x.to_dict() async for x in interactions_ref.stream()]
+
+    async def get_job(self, job_id: str) -> Optional[dict]:
+        doc = await get_async_db().collection("jobs").document(job_id).get()
+        return doc.to_dict() if doc.exists else None
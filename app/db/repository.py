@@ -0,0 +1,409 @@
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.config import STORAGE_BACKEND, STORAGE_PATH
+
+
+def job_doc_id(company: str, position: str) -> str:
+    # jobs 컬렉션(채용 공고 RAG 정보) 문서 id 형식
+    return f"({company}, {position})"
+
+
+def _new_id() -> str:
+    return uuid.uuid4().hex[:20]
+
+
+def _apply_update(doc: dict, update_data: dict, increment: bool = False) -> None:
+    """
+    Firestore update와 같이 'a.b.c' 형식의 키는 중첩 필드로 반영한다.
+    increment=True이면 값을 덮어쓰지 않고 기존 값(없으면 0)에 더한다.
+    """
+    for key, value in update_data.items():
+        *parents, field = key.split(".")
+        target = doc
+        for parent in parents:
+            child = target.get(parent)
+            if not isinstance(child, dict):
+                child = target[parent] = {}
+            target = child
+        if increment:
+            target[field] = (target.get(field) or 0) + value
+        else:
+            target[field] = copy.deepcopy(value)
+
+
+class Repository(ABC):
+    """
+    세션/인터랙션/채용 공고(jobs)/질문 은행 저장소 인터페이스.
+    세션 update는 Firestore와 같이 'a.b' 형식의 중첩 필드 키를 지원하고, 없는 세션이면 예외를 던진다.
+    """
+
+    name = "base"
+    # 호출이 네트워크/디스크 I/O를 기다리면 True (비동기 핸들러에서는 스레드에서 실행)
+    blocking = True
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def create_session(self, data: dict) -> str:
+        ...
+
+    @abstractmethod
+    def update_session(self, session_id: str, update_data: dict) -> None:
+        ...
+
+    @abstractmethod
+    def increment_session(self, session_id: str, deltas: dict) -> None:
+        ...
+
+    @abstractmethod
+    def find_session_by_code(self, code: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def list_session_ids(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def add_interactions(self, session_id: str, logs: List[dict]) -> List[str]:
+        ...
+
+    @abstractmethod
+    def get_interactions(self, session_id: str) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def get_job(self, job_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def save_job(self, job_id: str, data: dict) -> None:
+        ...
+
+    @abstractmethod
+    def list_jobs(self) -> List[Tuple[str, dict]]:
+        ...
+
+    @abstractmethod
+    def get_bank_entries(self, company: str, position: str) -> List[dict]:
+        ...
+
+    @abstractmethod
+    def save_bank_entry(self, doc_id: str, data: dict) -> None:
+        ...
+
+    def async_view(self):
+        """
+        같은 데이터를 보는 비동기 저장소 (WebSocket/백그라운드 작업용)
+        """
+        return AsyncRepositoryAdapter(self)
+
+
+class MemoryRepository(Repository):
+    """
+    프로세스 내 저장소. Firebase 자격 증명/네트워크 없이 로컬 부하 테스트와 CI 벤치마크에 사용한다.
+    """
+
+    name = "memory"
+    blocking = False
+
+    def __init__(self):
+        self._sessions: Dict[str, dict] = {}
+        self._interactions: Dict[str, Dict[str, dict]] = {}
+        self._jobs: Dict[str, dict] = {}
+        self._bank: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            data = self._sessions.get(session_id)
+            return copy.deepcopy(data) if data is not None else None
+
+    def create_session(self, data: dict) -> str:
+        session_id = _new_id()
+        with self._lock:
+            self._sessions[session_id] = copy.deepcopy(data)
+        return session_id
+
+    def update_session(self, session_id: str, update_data: dict) -> None:
+        with self._lock:
+            _apply_update(self._sessions[session_id], update_data)
+
+    def increment_session(self, session_id: str, deltas: dict) -> None:
+        with self._lock:
+            _apply_update(self._sessions[session_id], deltas, increment=True)
+
+    def find_session_by_code(self, code: str) -> Optional[str]:
+        with self._lock:
+            for session_id, data in self._sessions.items():
+                if data.get("code") == code:
+                    return session_id
+        return None
+
+    def list_session_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._sessions)
+
+    def add_interactions(self, session_id: str, logs: List[dict]) -> List[str]:
+        ids = [_new_id() for _ in logs]
+        with self._lock:
+            stored = self._interactions.setdefault(session_id, {})
+            for log_id, log in zip(ids, logs):
+                stored[log_id] = copy.deepcopy(log)
+        return ids
+
+    def get_interactions(self, session_id: str) -> List[dict]:
+        with self._lock:
+            return copy.deepcopy(list(self._interactions.get(session_id, {}).values()))
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            data = self._jobs.get(job_id)
+            return copy.deepcopy(data) if data is not None else None
+
+    def save_job(self, job_id: str, data: dict) -> None:
+        with self._lock:
+            self._jobs[job_id] = copy.deepcopy(data)
+
+    def list_jobs(self) -> List[Tuple[str, dict]]:
+        with self._lock:
+            return copy.deepcopy(list(self._jobs.items()))
+
+    def get_bank_entries(self, company: str, position: str) -> List[dict]:
+        with self._lock:
+            return copy.deepcopy([
+                e for e in self._bank.values()
+                if e.get("company") == company and e.get("position") == position
+            ])
+
+    def save_bank_entry(self, doc_id: str, data: dict) -> None:
+        with self._lock:
+            self._bank[doc_id] = copy.deepcopy(data)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    raise TypeError(f"JSON으로 저장할 수 없는 값: {type(value).__name__}")
+
+
+def _json_hook(value: dict):
+    if set(value) == {"__datetime__"}:
+        return datetime.fromisoformat(value["__datetime__"])
+    return value
+
+
+def _dumps(data: dict) -> str:
+    return json.dumps(data, ensure_ascii=False, default=_json_default)
+
+
+def _loads(payload: str) -> dict:
+    return json.loads(payload, object_hook=_json_hook)
+
+
+class SQLiteRepository(Repository):
+    """
+    로컬 SQLite 파일 저장소. 문서는 JSON으로 저장하며(datetime 보존), 재시작 후에도 데이터가 남는다.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str = STORAGE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, code TEXT, data TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS sessions_code ON sessions (code)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS interactions ("
+                "id TEXT PRIMARY KEY, session_id TEXT NOT NULL, data TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS interactions_session ON interactions (session_id)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS question_bank ("
+                "id TEXT PRIMARY KEY, company TEXT, position TEXT, data TEXT NOT NULL)"
+            )
+
+    def get_session(self, session_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return _loads(row[0]) if row else None
+
+    def create_session(self, data: dict) -> str:
+        session_id = _new_id()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (id, code, data) VALUES (?, ?, ?)",
+                (session_id, data.get("code"), _dumps(data)),
+            )
+        return session_id
+
+    def _modify_session(self, session_id: str, update_data: dict, increment: bool) -> None:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT data FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                raise KeyError(session_id)
+            data = _loads(row[0])
+            _apply_update(data, update_data, increment=increment)
+            self._conn.execute(
+                "UPDATE sessions SET code = ?, data = ? WHERE id = ?",
+                (data.get("code"), _dumps(data), session_id),
+            )
+
+    def update_session(self, session_id: str, update_data: dict) -> None:
+        self._modify_session(session_id, update_data, increment=False)
+
+    def increment_session(self, session_id: str, deltas: dict) -> None:
+        self._modify_session(session_id, deltas, increment=True)
+
+    def find_session_by_code(self, code: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM sessions WHERE code = ? LIMIT 1", (code,)).fetchone()
+        return row[0] if row else None
+
+    def list_session_ids(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM sessions").fetchall()
+        return [row[0] for row in rows]
+
+    def add_interactions(self, session_id: str, logs: List[dict]) -> List[str]:
+        ids = [_new_id() for _ in logs]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO interactions (id, session_id, data) VALUES (?, ?, ?)",
+                [(log_id, session_id, _dumps(log)) for log_id, log in zip(ids, logs)],
+            )
+        return ids
+
+    def get_interactions(self, session_id: str) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM interactions WHERE session_id = ? ORDER BY rowid",
+                (session_id,),
+            ).fetchall()
+        return [_loads(row[0]) for row in rows]
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _loads(row[0]) if row else None
+
+    def save_job(self, job_id: str, data: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, data) VALUES (?, ?)", (job_id, _dumps(data)))
+
+    def list_jobs(self) -> List[Tuple[str, dict]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id, data FROM jobs").fetchall()
+        return [(row[0], _loads(row[1])) for row in rows]
+
+    def get_bank_entries(self, company: str, position: str) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM question_bank WHERE company = ? AND position = ?",
+                (company, position),
+            ).fetchall()
+        return [_loads(row[0]) for row in rows]
+
+    def save_bank_entry(self, doc_id: str, data: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO question_bank (id, company, position, data) "
+                "VALUES (?, ?, ?, ?)",
+                (doc_id, data.get("company"), data.get("position"), _dumps(data)),
+            )
+
+
+class AsyncRepositoryAdapter:
+    """
+    동기 저장소의 메서드를 코루틴으로 감싼다. blocking 저장소(SQLite)는 스레드에서 실행해 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, repo: Repository):
+        self.repo = repo
+
+    def __getattr__(self, name: str):
+        method = getattr(self.repo, name)
+
+        async def call(*args, **kwargs):
+            if self.repo.blocking:
+                return await asyncio.to_thread(method, *args, **kwargs)
+            return method(*args, **kwargs)
+
+        return call
+
+
+def create_repository(backend: str = STORAGE_BACKEND) -> Repository:
+    if backend == "firestore":
+        from app.db.firestore import FirestoreRepository
+
+        return FirestoreRepository()
+    if backend == "sqlite":
+        return SQLiteRepository()
+    if backend == "memory":
+        return MemoryRepository()
+    raise ValueError(f"알 수 없는 저장소 백엔드: {backend}")
+
+
+_repository: Optional[Repository] = None
+_async_repository = None
+_repository_lock = threading.Lock()
+
+
+def get_repository() -> Repository:
+    """
+    STORAGE_BACKEND로 설정된 저장소를 반환한다.
+    """
+    global _repository
+    if _repository is None:
+        with _repository_lock:
+            if _repository is None:
+                _repository = create_repository()
+    return _repository
+
+
+def get_async_repository():
+    """
+    get_repository()와 같은 데이터를 보는 비동기 저장소를 반환한다.
+    """
+    global _async_repository
+    if _async_repository is None:
+        repo = get_repository()
+        with _repository_lock:
+            if _async_repository is None:
+                _async_repository = repo.async_view()
+    return _async_repository
+
+
+def set_repository(repo: Optional[Repository]) -> None:
+    """
+    테스트/벤치마크에서 다른 저장소로 교체할 때 사용. None이면 다음 호출 때 설정값으로 다시 만든다.
+    """
+    global _repository, _async_repository
+    with _repository_lock:
+        _repository = repo
+        _async_repository = None
@@ -1,11 +1,32 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import sessions
+from app.api import monitoring, sessions
+from app.config import STORAGE_BACKEND
 from app.core.firebase import init_firebase
+from app.services import audio_assets, stt
+from app.services.interaction_logger import interaction_logger
+from app.services.jobs import job_queue
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 재시도 안내 등 고정 음성을 미리 PCM으로 변환
+    await asyncio.to_thread(audio_assets.load_all)
+    # 최종 평가 등 백그라운드 작업 워커 시작 (저장소에 남은 미완료 작업 재실행)
+    job_queue.start()
+    yield
+    await job_queue.stop()
+    # 종료 시 버퍼에 남은 인터랙션 로그 저장
+    await interaction_logger.flush_all()
+    stt.set_pool(None)
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # CORS
 origins = [
@@ -22,8 +43,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Firebase 초기화 (앱 시작 시)
-init_firebase()
+# Firebase 초기화 (앱 시작 시). memory/sqlite 저장소로 실행하면 자격 증명 없이 동작
+if STORAGE_BACKEND == "firestore":
+    init_firebase()
 
 app.include_router(sessions.router)
+app.include_router(monitoring.router)
+app.include_router(monitoring.metrics_router)
 app.mount("/reports", StaticFiles(directory="reports"), name="reports")
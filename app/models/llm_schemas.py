@@ -0,0 +1,173 @@
+import json
+import re
+from typing import Any, List, Optional, Type
+
+from pydantic import BaseModel, ConfigDict, ValidationError
+
+
+class LLMSchema(BaseModel):
+    """
+    LLM 응답 스키마 공통 베이스. 모델이 덧붙인 여분 필드는 버린다.
+    """
+
+    model_config = ConfigDict(extra="ignore")
+
+
+class GeneratedQuestion(LLMSchema):
+    question: str
+
+
+class QuestionsResponse(LLMSchema):
+    questions: List[GeneratedQuestion]
+
+
+class CategoryEvaluation(LLMSchema):
+    name: str
+    score: float
+    feedback: str = ""
+
+
+class EvaluationResponse(LLMSchema):
+    categories: List[CategoryEvaluation]
+    total_score: Optional[float] = None
+
+
+class EvaluationWithFollowupResponse(EvaluationResponse):
+    followup: bool = False
+    question: str = ""
+
+
+class PersonaResponse(LLMSchema):
+    persona: str
+    department: str = ""
+    persona_name: str = ""
+
+
+class FollowupJudgmentResponse(LLMSchema):
+    followup: bool = False
+    question: str = ""
+
+
+class CategorySummaryResponse(LLMSchema):
+    summary: str
+
+
+class FinalFeedbackResponse(LLMSchema):
+    final_feedback: str
+
+
+def response_format(schema: Type[BaseModel]) -> dict:
+    """
+    litellm response_format에 넘길 JSON 스키마 제약. (Gemini는 response_schema로 변환된다)
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "schema": schema.model_json_schema(),
+        },
+    }
+
+
+def _strip_code_fence(text: str) -> str:
+    match = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    return match.group(1) if match else text
+
+
+def _json_candidates(text: str) -> List[str]:
+    # 앞 설명 문장을 뺀 JSON 부분. 응답이 잘린 경우를 위해 끝을 자르지 않은 후보를 먼저 보고,
+    # 실패하면 마지막 닫는 괄호 뒤의 설명 문장까지 잘라 본다
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return [text]
+    start = min(starts)
+    end = max(text.rfind("}"), text.rfind("]"))
+    if end > start:
+        return [text[start:], text[start: end + 1]]
+    return [text[start:]]
+
+
+def _strip_comments(text: str) -> str:
+    # 문자열 밖의 // 주석만 제거 (프롬프트 예시의 주석을 모델이 그대로 따라 쓰는 경우)
+    out = []
+    in_string = False
+    escaped = False
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if in_string:
+            out.append(ch)
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            out.append(ch)
+        elif text.startswith("//", i):
+            newline = text.find("\n", i)
+            if newline == -1:
+                break
+            i = newline
+            continue
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _balance(text: str) -> str:
+    # 응답이 잘려 닫는 괄호가 빠진 경우 열린 순서대로 닫아 준다
+    stack = []
+    in_string = False
+    escaped = False
+    for ch in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    if in_string:
+        text += '"'
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Optional[Any]:
+    """
+    거의 올바른 JSON을 다시 호출하지 않고 고쳐 본다.
+    코드 펜스/앞뒤 설명 문장, // 주석, 끝 쉼표, 파이썬 리터럴(True/False/None), 닫히지 않은 괄호를 처리한다.
+    고칠 수 없으면 None을 반환한다.
+    """
+    for candidate in _json_candidates(_strip_code_fence(text or "")):
+        candidate = _strip_comments(candidate)
+        candidate = re.sub(r",\s*([}\]])", r"\1", candidate)
+        candidate = re.sub(r"(?<![\w\"])True(?![\w\"])", "true", candidate)
+        candidate = re.sub(r"(?<![\w\"])False(?![\w\"])", "false", candidate)
+        candidate = re.sub(r"(?<![\w\"])None(?![\w\"])", "null", candidate)
+        candidate = _balance(candidate.strip())
+        candidate = re.sub(r",\s*([}\]])", r"\1", candidate)
+        try:
+            # 잘린 문자열 안의 줄바꿈 같은 제어 문자도 허용
+            return json.loads(candidate, strict=False)
+        except ValueError:
+            continue
+    return None
+
+
+def validate(schema: Type[BaseModel], data: Any) -> Optional[BaseModel]:
+    if isinstance(data, list) and data:
+        data = data[0]
+    try:
+        return schema.model_validate(data)
+    except ValidationError:
+        return None
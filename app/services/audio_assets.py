@@ -0,0 +1,70 @@
+import os
+import threading
+from typing import Dict, List, Optional
+
+from pydub import AudioSegment
+
+from app.services.tts import CHANNELS, SAMPLE_RATE
+
+# 프로젝트 루트 (상대 경로 기준)
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+
+# 이름 -> 오디오 파일 경로. 새 안내 음성은 여기에 추가하거나 register로 등록한다.
+_registry: Dict[str, str] = {
+    "retry_inform": "retry_inform.wav",
+}
+# 이름 -> 전송 가능한 PCM(SAMPLE_RATE, mono, s16le) 바이트
+_pcm: Dict[str, bytes] = {}
+_lock = threading.Lock()
+
+
+def _decode(path: str) -> bytes:
+    if not os.path.isabs(path):
+        path = os.path.join(BASE_DIR, path)
+    seg = AudioSegment.from_file(path)
+    seg = seg.set_channels(CHANNELS).set_frame_rate(
+        SAMPLE_RATE).set_sample_width(2)
+    return seg.raw_data
+
+
+def register(name: str, path: str) -> None:
+    with _lock:
+        _registry[name] = path
+        _pcm.pop(name, None)
+
+
+def names() -> List[str]:
+    return list(_registry.keys())
+
+
+def load_all() -> Dict[str, int]:
+    """
+    등록된 오디오를 모두 디코딩/리샘플링해 메모리에 올린다. 앱 시작 시 한 번 호출.
+    """
+    loaded = {}
+    for name, path in list(_registry.items()):
+        try:
+            pcm = _decode(path)
+        except Exception as e:
+            print("audio_assets load_error", name, e)
+            continue
+        with _lock:
+            _pcm[name] = pcm
+        loaded[name] = len(pcm)
+    return loaded
+
+
+def get_pcm(name: str) -> Optional[bytes]:
+    """
+    미리 변환된 PCM을 반환한다. 아직 로드되지 않았으면 그때 한 번 변환한다.
+    """
+    pcm = _pcm.get(name)
+    if pcm is not None:
+        return pcm
+    path = _registry.get(name)
+    if path is None:
+        return None
+    pcm = _decode(path)
+    with _lock:
+        _pcm[name] = pcm
+    return pcm
@@ -3,10 +3,15 @@ import secrets
 from datetime import datetime, timezone
 from typing import List, Optional, Tuple
 
-from google.cloud.firestore_v1.base_query import FieldFilter
 from passlib.context import CryptContext
 
-from app.core.firebase import get_db
+from app.config import (
+    SESSION_CACHE_SIZE,
+    SESSION_CACHE_TTL,
+    SESSION_CODE_CACHE_SIZE,
+)
+from app.core.cache import TTLCache
+from app.db.repository import get_repository, job_doc_id
 from app.models.schemas import (
     EvaluationSchema,
     InteractionLogSchema,
@@ -19,6 +24,11 @@ from app.models.schemas import (
 
 pwd_context = CryptContext(schemes=["bcrypt_sha256"], deprecated="auto")
 
+# 세션 코드 -> session_id (create_session에서 미리 채움)
+_code_cache = TTLCache(maxsize=SESSION_CODE_CACHE_SIZE)
+# session_id -> 세션 문서 (짧은 TTL, 쓰기 시 무효화)
+_session_cache = TTLCache(maxsize=SESSION_CACHE_SIZE, ttl=SESSION_CACHE_TTL)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -28,133 +38,189 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_session(session_id: str, use_cache: bool = True) -> Optional[dict]:
+    """
+    세션 문서를 반환한다. 짧은 TTL의 read-through 캐시를 거치며, 없으면 None.
+    다른 워커가 방금 쓴 값을 읽어야 하면 use_cache=False로 캐시를 건너뛴다.
+    """
+    data = _session_cache.get(session_id) if use_cache else None
+    if data is None:
+        data = get_repository().get_session(session_id)
+        if data is None:
+            return None
+        _session_cache.set(session_id, data)
+    return dict(data)
+
+
+def update_session(session_id: str, update_data: dict) -> None:
+    try:
+        get_repository().update_session(session_id, update_data)
+    finally:
+        _session_cache.pop(session_id)
+
+
+def _llm_usage_deltas(usage: dict) -> dict:
+    deltas = {
+        "llm_usage.cost": usage.get("cost", 0.0),
+        "llm_usage.requests": usage.get("requests", 0),
+        "llm_usage.tokens": usage.get("tokens", 0),
+    }
+    for function, cost in usage.get("by_function", {}).items():
+        deltas[f"llm_usage.by_function.{function}"] = cost
+    return deltas
+
+
+def add_session_llm_usage(session_id: str, usage: dict) -> None:
+    """
+    세션 문서의 llm_usage(비용/요청 수/토큰 수/함수별 비용)에 증가분을 더한다.
+    소켓과 최종 평가 작업이 동시에 반영해도 값이 덮어써지지 않도록 증가분으로 더한다.
+    """
+    try:
+        get_repository().increment_session(session_id, _llm_usage_deltas(usage))
+    finally:
+        _session_cache.pop(session_id)
+
+
 def get_session_status(session_id: str) -> Optional[str]:
-    db = get_db()
-    session_ref = db.collection("sessions").document(session_id)
-    session_data = session_ref.get().to_dict()
+    session_data = get_session(session_id)
+    if session_data is None:
+        return None
     return session_data.get("status")
 
 
-def create_session(req: SessionCreateSchema) -> Optional[Tuple[str, str]]:
-    db = get_db()
-    code = secrets.token_hex(3).upper()
-    session_ref = db.collection("sessions").document()
-    hashed_password = get_password_hash(req.password)
-    session_data = {
-        "code": code,
+def _new_session_data(req: SessionCreateSchema) -> dict:
+    return {
+        "code": secrets.token_hex(3).upper(),
         "status": "ready",
         "created_at": datetime.now(timezone.utc),
         "username": req.username,
-        "pw_hash": hashed_password,
+        "pw_hash": get_password_hash(req.password),
     }
-    session_ref.set(session_data)
-    return session_ref.id, code
+
+
+def create_session(req: SessionCreateSchema) -> Optional[Tuple[str, str]]:
+    session_data = _new_session_data(req)
+    code = session_data["code"]
+    session_id = get_repository().create_session(session_data)
+    _code_cache.set(code, session_id)
+    _session_cache.set(session_id, session_data)
+    return session_id, code
 
 
 def get_session_id_by_code(code: str) -> Optional[str]:
-    db = get_db()
-    sessions_ref = db.collection("sessions")
-    query = sessions_ref.where(filter=FieldFilter("code", "==", code)).limit(1)
-    results = query.stream()
-    for doc in results:
-        return doc.id
-    return None
+    session_id = _code_cache.get(code)
+    if session_id is not None:
+        return session_id
+    session_id = get_repository().find_session_by_code(code)
+    if session_id is not None:
+        _code_cache.set(code, session_id)
+    return session_id
 
 
-def save_session_profile(session_id: str, inputs: SessionProfilePayload) -> bool:
-    db = get_db()
-    session_ref = db.collection("sessions").document(session_id)
-    update_data = {
+def _cleaned(update_data: dict) -> dict:
+    return {k: v for k, v in update_data.items() if v is not None}
+
+
+def _profile_update(inputs: SessionProfilePayload) -> dict:
+    return _cleaned({
         "age": inputs.age,
         "gender": inputs.gender,
         "email": inputs.email,
         "status": "profile_saved",
         "updated_at": datetime.now(timezone.utc),
-    }
-    update_data_cleaned = {k: v for k,
-                           v in update_data.items() if v is not None}
-    try:
-        session_ref.update(update_data_cleaned)
-        return True
-    except Exception:
-        return False
+    })
 
 
-def save_session_interview_info(
-    session_id: str, inputs: SessionInterviewInfoPayload
-) -> bool:
-    db = get_db()
-    session_ref = db.collection("sessions").document(session_id)
-    update_data = {
+def _interview_info_update(inputs: SessionInterviewInfoPayload) -> dict:
+    return _cleaned({
         "company": inputs.company,
         "position": inputs.position,
         "self_intro": inputs.self_intro,
         "status": "interview_info_saved",
         "updated_at": datetime.now(timezone.utc),
-    }
-    update_data_cleaned = {k: v for k,
-                           v in update_data.items() if v is not None}
-    try:
-        session_ref.update(update_data_cleaned)
-        return True
-    except Exception:
-        return False
+    })
 
 
-def save_chat_end(session_id: str) -> bool:
-    db = get_db()
-    session_ref = db.collection("sessions").document(session_id)
-    update_data = {
+def _chat_end_update() -> dict:
+    return {
         "status": "chat_end",
         "updated_at": datetime.now(timezone.utc),
     }
-    update_data_cleaned = {k: v for k,
-                           v in update_data.items() if v is not None}
+
+
+def _log_data(interaction_data: InteractionLogSchema, created_at: Optional[datetime] = None) -> dict:
+    log_data = interaction_data.model_dump(exclude_unset=True, exclude={"id"})
+    log_data["created_at"] = created_at or datetime.now(timezone.utc)
+    return log_data
+
+
+def _update_status(session_id: str, update_data: dict) -> bool:
     try:
-        session_ref.update(update_data_cleaned)
+        get_repository().update_session(session_id, update_data)
         return True
     except Exception:
         return False
+    finally:
+        _session_cache.pop(session_id)
+
+
+def save_session_profile(session_id: str, inputs: SessionProfilePayload) -> bool:
+    return _update_status(session_id, _profile_update(inputs))
+
+
+def save_session_interview_info(
+    session_id: str, inputs: SessionInterviewInfoPayload
+) -> bool:
+    return _update_status(session_id, _interview_info_update(inputs))
+
+
+def save_chat_end(session_id: str) -> bool:
+    return _update_status(session_id, _chat_end_update())
 
 
 def add_interaction(
     session_id: str, interaction_data: InteractionLogSchema
 ) -> Optional[str]:
-    db = get_db()
     try:
-        interaction_ref = (
-            db.collection("sessions")
-            .document(session_id)
-            .collection("interactions")
-            .document()
-        )
-        log_data = interaction_data.model_dump(
-            exclude_unset=True, exclude={"id"})
-        log_data["created_at"] = datetime.now(timezone.utc)
-        interaction_ref.set(log_data)
-        return interaction_ref.id
+        return get_repository().add_interactions(session_id, [_log_data(interaction_data)])[0]
+    except Exception:
+        return None
+
+
+def add_interactions(
+    session_id: str, interactions: List[InteractionLogSchema]
+) -> Optional[List[str]]:
+    """
+    여러 인터랙션을 batched write로 한 번에 저장한다. 실패 시 None.
+    """
+    logs = [_log_data(x, x.created_at) for x in interactions]
+    try:
+        return get_repository().add_interactions(session_id, logs)
     except Exception:
         return None
 
 
+def get_interactions(session_id: str) -> List[dict]:
+    return get_repository().get_interactions(session_id)
+
+
+def get_job_info(company: str, position: str) -> Optional[dict]:
+    """
+    jobs 컬렉션에서 (회사, 직무)의 채용 공고 RAG 정보를 반환한다. 없으면 None.
+    """
+    return get_repository().get_job(job_doc_id(company, position))
+
+
 def get_all_questions_and_answers() -> Tuple[list, list]:
     """
     모든 세션의 모든 인터랙션(질문/응답)을 리스트로 반환합니다.
     반환 예시: [{ 'session_id': ..., 'turn': ..., 'question': ..., 'answer': ... }, ...]
     """
-    db = get_db()
+    repo = get_repository()
     result = []
     eval_result = []
-    sessions = db.collection("sessions").stream()
-    for session in sessions:
-        session_id = session.id
-        interactions_ref = (
-            db.collection("sessions").document(
-                session_id).collection("interactions")
-        )
-        interactions = interactions_ref.stream()
-        for interaction in interactions:
-            data = interaction.to_dict()
+    for session_id in repo.list_session_ids():
+        for data in repo.get_interactions(session_id):
             result.append(
                 {
                     "session_id": session_id,
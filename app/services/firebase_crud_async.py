@@ -0,0 +1,132 @@
+from typing import List, Optional, Tuple
+
+from app.db.repository import get_async_repository, job_doc_id
+from app.models.schemas import (
+    InteractionLogSchema,
+    SessionCreateSchema,
+    SessionInterviewInfoPayload,
+    SessionProfilePayload,
+)
+from app.services.firebase_crud import (
+    _chat_end_update,
+    _code_cache,
+    _interview_info_update,
+    _llm_usage_deltas,
+    _log_data,
+    _new_session_data,
+    _profile_update,
+    _session_cache,
+)
+
+# firebase_crud의 비동기 버전. 저장소의 비동기 구현(Firestore는 AsyncClient)을 사용해 이벤트 루프를 막지 않으며,
+# 세션/세션 코드 캐시는 firebase_crud와 공유한다. (동기 엔드포인트는 firebase_crud를 그대로 사용)
+
+
+async def get_session(session_id: str, use_cache: bool = True) -> Optional[dict]:
+    """
+    세션 문서를 반환한다. 짧은 TTL의 read-through 캐시를 거치며, 없으면 None.
+    다른 워커가 방금 쓴 값을 읽어야 하면 use_cache=False로 캐시를 건너뛴다.
+    """
+    data = _session_cache.get(session_id) if use_cache else None
+    if data is None:
+        data = await get_async_repository().get_session(session_id)
+        if data is None:
+            return None
+        _session_cache.set(session_id, data)
+    return dict(data)
+
+
+async def update_session(session_id: str, update_data: dict) -> None:
+    try:
+        await get_async_repository().update_session(session_id, update_data)
+    finally:
+        _session_cache.pop(session_id)
+
+
+async def add_session_llm_usage(session_id: str, usage: dict) -> None:
+    try:
+        await get_async_repository().increment_session(session_id, _llm_usage_deltas(usage))
+    finally:
+        _session_cache.pop(session_id)
+
+
+async def get_session_status(session_id: str) -> Optional[str]:
+    session_data = await get_session(session_id)
+    if session_data is None:
+        return None
+    return session_data.get("status")
+
+
+async def create_session(req: SessionCreateSchema) -> Optional[Tuple[str, str]]:
+    session_data = _new_session_data(req)
+    code = session_data["code"]
+    session_id = await get_async_repository().create_session(session_data)
+    _code_cache.set(code, session_id)
+    _session_cache.set(session_id, session_data)
+    return session_id, code
+
+
+async def get_session_id_by_code(code: str) -> Optional[str]:
+    session_id = _code_cache.get(code)
+    if session_id is not None:
+        return session_id
+    session_id = await get_async_repository().find_session_by_code(code)
+    if session_id is not None:
+        _code_cache.set(code, session_id)
+    return session_id
+
+
+async def _update_status(session_id: str, update_data: dict) -> bool:
+    try:
+        await get_async_repository().update_session(session_id, update_data)
+        return True
+    except Exception:
+        return False
+    finally:
+        _session_cache.pop(session_id)
+
+
+async def save_session_profile(session_id: str, inputs: SessionProfilePayload) -> bool:
+    return await _update_status(session_id, _profile_update(inputs))
+
+
+async def save_session_interview_info(
+    session_id: str, inputs: SessionInterviewInfoPayload
+) -> bool:
+    return await _update_status(session_id, _interview_info_update(inputs))
+
+
+async def save_chat_end(session_id: str) -> bool:
+    return await _update_status(session_id, _chat_end_update())
+
+
+async def add_interaction(
+    session_id: str, interaction_data: InteractionLogSchema
+) -> Optional[str]:
+    try:
+        ids = await get_async_repository().add_interactions(
+            session_id, [_log_data(interaction_data)])
+        return ids[0]
+    except Exception:
+        return None
+
+
+async def add_interactions(
+    session_id: str, interactions: List[InteractionLogSchema]
+) -> Optional[List[str]]:
+    """
+    여러 인터랙션을 batched write로 한 번에 저장한다. 실패 시 None.
+    """
+    logs = [_log_data(x, x.created_at) for x in interactions]
+    try:
+        return await get_async_repository().add_interactions(session_id, logs)
+    except Exception:
+        return None
+
+
+async def get_interactions(session_id: str) -> List[dict]:
+    return await get_async_repository().get_interactions(session_id)
+
+
+async def get_job_info(company: str, position: str) -> Optional[dict]:
+    return await get_async_repository().get_job(job_doc_id(company, position))
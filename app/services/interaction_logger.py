@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from app.config import (
+    INTERACTION_BATCH_SIZE,
+    INTERACTION_CLOSE_BACKOFF,
+    INTERACTION_CLOSE_RETRIES,
+    INTERACTION_FLUSH_INTERVAL,
+)
+from app.models.schemas import InteractionLogSchema
+from app.services import firebase_crud_async
+
+
+class InteractionLogger:
+    """
+    인터랙션 로그를 세션별로 모았다가 Firestore batched write로 저장하는 write-behind 로거.
+    flush_interval(초)마다 또는 batch_size개가 쌓이면 저장하고, 저장에 실패하면 flush_interval 뒤에 다시 시도한다.
+    close_session에서 남은 로그를 모두 저장한다.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = INTERACTION_FLUSH_INTERVAL,
+        batch_size: int = INTERACTION_BATCH_SIZE,
+        close_retries: int = INTERACTION_CLOSE_RETRIES,
+        close_backoff: float = INTERACTION_CLOSE_BACKOFF,
+    ):
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.close_retries = close_retries
+        self.close_backoff = close_backoff
+        self._buffers: Dict[str, List[InteractionLogSchema]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def add(self, session_id: str, log: InteractionLogSchema) -> None:
+        # 저장 순서와 무관하게 기록 시각을 유지하도록 큐에 넣을 때 created_at을 채움
+        if log.created_at is None:
+            log.created_at = datetime.now(timezone.utc)
+        buffer = self._buffers.setdefault(session_id, [])
+        buffer.append(log)
+        if len(buffer) >= self.batch_size:
+            self._cancel_timer(session_id)
+            asyncio.create_task(self.flush(session_id))
+        else:
+            self._schedule(session_id)
+
+    def pending(self, session_id: str) -> int:
+        return len(self._buffers.get(session_id, []))
+
+    def _schedule(self, session_id: str) -> None:
+        if session_id not in self._timers:
+            self._timers[session_id] = asyncio.create_task(
+                self._flush_later(session_id))
+
+    async def _flush_later(self, session_id: str) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._timers.pop(session_id, None)
+        await self.flush(session_id)
+
+    def _cancel_timer(self, session_id: str) -> None:
+        timer = self._timers.pop(session_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+    async def flush(self, session_id: str, retry_later: bool = True) -> bool:
+        """
+        버퍼의 로그를 저장한다. 실패하면 로그를 버퍼 앞에 되돌리고, retry_later면 재시도 타이머를 건다.
+        """
+        lock = self._locks.setdefault(session_id, asyncio.Lock())
+        async with lock:
+            logs = self._buffers.pop(session_id, [])
+            if not logs:
+                return True
+            ids = await firebase_crud_async.add_interactions(session_id, logs)
+            if ids is None:
+                # 실패한 로그는 다음 flush에서 다시 시도
+                self._buffers[session_id] = logs + \
+                    self._buffers.get(session_id, [])
+                print("interaction_logger flush_error", session_id, len(logs))
+                if retry_later:
+                    # 크기 기준 flush가 타이머를 취소했으므로 다음 add()를 기다리지 않도록 다시 예약
+                    self._schedule(session_id)
+                return False
+            return True
+
+    async def close_session(self, session_id: str) -> bool:
+        """
+        세션의 남은 로그를 모두 저장하고 버퍼를 정리한다. 실패하면 짧게 기다리며 close_retries번 더 시도한다.
+        그래도 실패하면 False를 반환하고, 로그는 버퍼에 남겨 백그라운드에서 계속 재시도한다.
+        """
+        self._cancel_timer(session_id)
+        delay = self.close_backoff
+        for attempt in range(self.close_retries + 1):
+            if attempt > 0:
+                await asyncio.sleep(delay)
+                delay *= 2
+            if await self.flush(session_id, retry_later=False):
+                self._locks.pop(session_id, None)
+                return True
+        print("interaction_logger close_failed", session_id, self.pending(session_id))
+        self._schedule(session_id)
+        return False
+
+    async def flush_all(self) -> None:
+        for session_id in list(self._buffers.keys()):
+            await self.close_session(session_id)
+
+
+interaction_logger = InteractionLogger()
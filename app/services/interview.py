@@ -0,0 +1,360 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from app.config import FOLLOWUP_DECISION_WAIT
+from app.models.schemas import EvaluationSchema, InteractionLogSchema
+from app.services import firebase_crud_async, llm_service
+from app.services.interaction_logger import interaction_logger
+from app.services.jobs import FINAL_EVAL, job_queue
+
+# 질문 하나당 꼬리질문 최대 횟수
+MAX_FOLLOWUPS = 2
+# 카테고리 평균 점수가 이 값보다 낮으면 꼬리질문 후보
+FOLLOWUP_SCORE_THRESHOLD = 3
+
+
+def evaluation_categories(evaluation) -> List[dict]:
+    # dict가 아니면 빈 평가로 처리
+    if not isinstance(evaluation, dict):
+        return []
+    categories = evaluation.get("categories", [])
+    return categories if isinstance(categories, list) else []
+
+
+def average_score(categories: List[dict]) -> Optional[float]:
+    scores = [cat.get("score", 0) for cat in categories]
+    if not scores:
+        return None
+    try:
+        return sum(float(s) for s in scores) / len(scores)
+    except Exception:
+        return None
+
+
+def needs_followup(categories: List[dict]) -> bool:
+    avg_score = average_score(categories)
+    return avg_score is not None and avg_score < FOLLOWUP_SCORE_THRESHOLD
+
+
+def build_log(turn: int, question: str, answer: str, categories: List[dict]) -> InteractionLogSchema:
+    return InteractionLogSchema(
+        turn=turn,
+        question=question,
+        answer=answer,
+        evaluation=[EvaluationSchema(categories=categories)] if categories else [],
+    )
+
+
+class SpeculativeTurn:
+    """
+    답변 하나에 대한 평가와 꼬리질문 판단을 한 번의 LLM 호출(evaluate_with_followup)로 시작한다.
+    소켓은 그동안 다음 질문 전달을 준비하고, followup()이 제한 시간 안에 꼬리질문을 돌려줄 때만 끼워 넣는다.
+    평가 결과는 판단과 관계없이 끝나는 대로 인터랙션 로그에 기록된다.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        turn: int,
+        question: str,
+        answer: str,
+        persona: str,
+        history: List[Dict[str, str]],
+        judge: bool = True,
+    ):
+        self.session_id = session_id
+        self.turn = turn
+        self.question = question
+        self.answer = answer
+        self.judge = judge
+        # 꼬리질문을 더 할 수 없으면 판단 없이 평가만 요청
+        if judge:
+            coro = llm_service.evaluate_with_followup_async(
+                question, answer, persona, list(history))
+        else:
+            coro = llm_service.evaluate_answer_async(question, answer)
+        self.evaluation_task = asyncio.create_task(coro)
+        self.log_task = asyncio.create_task(self._log())
+        # 재접속한 소켓이 진행 중인 평가를 다시 요청하지 않고 이어받을 수 있도록 등록
+        _inflight.setdefault(session_id, []).append(self)
+        self.log_task.add_done_callback(lambda _: _forget(self))
+
+    async def _log(self) -> List[dict]:
+        try:
+            categories = evaluation_categories(await self.evaluation_task)
+        except Exception as e:
+            print("evaluate_answer error", e)
+            categories = []
+        interaction_logger.add(
+            self.session_id, build_log(self.turn, self.question, self.answer, categories))
+        return categories
+
+    async def followup(self, wait: float = FOLLOWUP_DECISION_WAIT) -> Optional[str]:
+        """
+        평가 점수가 낮고 꼬리질문이 필요하다고 판단되면 꼬리질문을 반환한다.
+        제한 시간 안에 평가가 끝나지 않으면 시간이 끝나는 대로 None을 반환한다. (평가는 로그 기록을 위해 계속 진행)
+        """
+        if not self.judge:
+            return None
+        done, _ = await asyncio.wait({self.evaluation_task}, timeout=wait)
+        if not done or self.evaluation_task.cancelled() or self.evaluation_task.exception():
+            return None
+        evaluation = self.evaluation_task.result()
+        if not needs_followup(evaluation_categories(evaluation)):
+            return None
+        if not evaluation.get("followup"):
+            return None
+        return evaluation.get("question") or None
+
+
+async def wait_logged(turns: List[SpeculativeTurn]) -> None:
+    """
+    아직 평가 중인 턴의 로그 기록이 끝날 때까지 기다린다. 세션 로그를 마지막으로 flush하기 전에 호출.
+    """
+    await asyncio.gather(*(t.log_task for t in turns), return_exceptions=True)
+
+
+# 세션별로 평가/로그 기록이 진행 중인 턴 (이 프로세스 안에서만 유효)
+_inflight: Dict[str, List[SpeculativeTurn]] = {}
+
+
+def _forget(turn: SpeculativeTurn) -> None:
+    turns = _inflight.get(turn.session_id, [])
+    if turn in turns:
+        turns.remove(turn)
+    if not turns:
+        _inflight.pop(turn.session_id, None)
+
+
+def _find_inflight(session_id: str, entry: dict) -> Optional[SpeculativeTurn]:
+    for turn in _inflight.get(session_id, []):
+        if (turn.turn, turn.question, turn.answer) == (
+            entry.get("turn"), entry.get("question"), entry.get("answer")
+        ):
+            return turn
+    return None
+
+
+# 세션별로 현재 소켓이 진행 중인 엔진 (이 프로세스 안에서만 유효)
+_engines: Dict[str, "InterviewEngine"] = {}
+
+
+class InterviewEngine:
+    """
+    세션 하나의 면접 진행 상태(현재 질문 번호, 꼬리질문 깊이, 현재 질문의 Q&A 기록, 평가 중인 답변)를 관리한다.
+    상태가 바뀔 때마다 세션 문서의 interview_state 필드에 체크포인트를 남겨(쓰기는 병합되어 최대 하나씩 진행)
+    소켓이 다시 연결되면 같은 질문부터 이어서 진행한다. 이미 받은 꼬리질문은 상태에 남아 있으므로 다시 판단하지 않고,
+    평가 중이던 답변은 같은 프로세스에서 진행 중인 평가를 이어받는다. (프로세스가 바뀐 경우에만 평가를 다시 요청)
+
+    interview_state 예시:
+    {"turn": 2, "followups": 1, "question": "꼬리질문", "history": [{"question", "answer"}, ...],
+     "pending": [{"turn", "question", "answer"}, ...]}
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        questions: List[dict],
+        persona: str = "",
+        state: Optional[dict] = None,
+        ended: bool = False,
+    ):
+        self.session_id = session_id
+        self.questions = questions
+        self.persona = persona
+        state = state if isinstance(state, dict) else {}
+        self.resumed = bool(state)
+        self.turn = int(state.get("turn", 0))
+        self.followups = int(state.get("followups", 0))
+        # 꼬리질문을 보낸 뒤 답변을 기다리는 중이면 그 질문, 아니면 None
+        self.followup_question: Optional[str] = state.get("question") or None
+        self.history: List[Dict[str, str]] = list(state.get("history", []))
+        self.pending: List[dict] = list(state.get("pending", []))
+        self.turns: List[SpeculativeTurn] = []
+        self._current: Optional[SpeculativeTurn] = None
+        self._dirty = False
+        self._writer: Optional[asyncio.Task] = None
+        self._superseded = False
+        # 이미 종료(chat_end)된 면접이면 True. 종료 처리와 최종 평가 요청을 다시 하지 않는다
+        self.ended = ended
+        self._closed = False
+        self._logs_saved = False
+
+    @classmethod
+    def from_session(cls, session_id: str, data: dict) -> "InterviewEngine":
+        """
+        세션 문서로 엔진을 만들고 평가 중이던 답변을 이어받는다. (이벤트 루프 안에서 호출)
+        같은 프로세스에 이전 소켓의 엔진이 남아 있으면 아직 저장되지 않았을 수 있는 그 상태를 이어받고,
+        이전 엔진은 더 이상 체크포인트를 쓰지 않는다.
+        """
+        previous = _engines.get(session_id)
+        state = data.get("interview_state")
+        if previous is not None:
+            previous.detach()
+            state = previous.snapshot()
+        engine = cls(
+            session_id,
+            data.get("questions", []),
+            data.get("persona", ""),
+            state,
+            ended=data.get("status") == "chat_end",
+        )
+        _engines[session_id] = engine
+        engine.resume_pending()
+        return engine
+
+    @property
+    def detached(self) -> bool:
+        """
+        다른 연결/워커가 세션을 넘겨받았으면 True. 이 연결은 더 이상 턴을 진행하지 않는다.
+        """
+        return self._superseded
+
+    @property
+    def finished(self) -> bool:
+        return self.turn >= len(self.questions)
+
+    def current_question(self) -> Tuple[str, bool]:
+        """
+        지금 답변을 받아야 하는 질문과 꼬리질문 여부
+        """
+        if self.followup_question:
+            return self.followup_question, True
+        return self.questions[self.turn]["text"], False
+
+    def upcoming_question(self) -> Optional[str]:
+        """
+        꼬리질문이 없을 때 다음에 할 본 질문. 마지막 질문이면 None.
+        """
+        if self.turn + 1 < len(self.questions):
+            return self.questions[self.turn + 1]["text"]
+        return None
+
+    def resume_pending(self) -> None:
+        """
+        체크포인트에 평가 중으로 남은 답변을 이어받는다.
+        같은 프로세스에서 진행 중인 평가는 그대로 기다리고, 없으면(프로세스 재시작 등) 평가만 다시 요청한다.
+        """
+        for entry in list(self.pending):
+            spec = _find_inflight(self.session_id, entry)
+            if spec is None:
+                spec = SpeculativeTurn(
+                    self.session_id, entry["turn"], entry["question"], entry["answer"],
+                    self.persona, [], judge=False,
+                )
+            self._track(spec, entry)
+
+    def start_answer(self, answer: str, judge: bool = True) -> SpeculativeTurn:
+        """
+        현재 질문의 답변 평가(와 꼬리질문 판단)를 시작한다. 결과는 advance()에서 사용한다.
+        """
+        question, _ = self.current_question()
+        self.history.append({"question": question, "answer": answer})
+        spec = SpeculativeTurn(
+            self.session_id, self.turn + 1, question, answer, self.persona, self.history,
+            judge=judge and self.followups < MAX_FOLLOWUPS,
+        )
+        self._current = spec
+        self._track(spec, {"turn": self.turn + 1, "question": question, "answer": answer})
+        self._checkpoint()
+        return spec
+
+    async def advance(self) -> Optional[str]:
+        """
+        꼬리질문이 필요하면 꼬리질문을 현재 질문으로 두고 반환하고, 아니면 다음 본 질문으로 넘어가 None을 반환한다.
+        """
+        spec, self._current = self._current, None
+        followup_q = await spec.followup() if spec is not None else None
+        if followup_q:
+            self.followups += 1
+            self.followup_question = followup_q
+        else:
+            self.turn += 1
+            self.followups = 0
+            self.followup_question = None
+            self.history = []
+        self._checkpoint()
+        return followup_q
+
+    async def drain(self) -> None:
+        """
+        평가 중인 답변의 로그 기록과 마지막 체크포인트 저장이 끝날 때까지 기다린다.
+        """
+        await wait_logged(self.turns)
+        if self._writer is not None:
+            await asyncio.gather(self._writer, return_exceptions=True)
+        if _engines.get(self.session_id) is self:
+            del _engines[self.session_id]
+
+    async def close(self) -> bool:
+        """
+        평가 중인 답변과 버퍼에 남은 인터랙션 로그를 모두 저장한다. 여러 번 호출해도 한 번만 실행된다.
+        로그를 모두 저장했으면 True를 반환한다.
+        """
+        if self._closed:
+            return self._logs_saved
+        self._closed = True
+        await self.drain()
+        self._logs_saved = await interaction_logger.close_session(self.session_id)
+        return self._logs_saved
+
+    async def complete(self) -> bool:
+        """
+        모든 질문을 마쳤을 때 호출. 남은 로그를 저장한 뒤 세션을 종료 상태로 바꾸고 최종 평가를 요청한다.
+        로그를 모두 저장하지 못하면 일부 로그로 평가하지 않도록 종료 처리를 미루고 False를 반환한다.
+        (로그는 백그라운드에서 계속 저장을 시도하고, 다시 연결하면 종료 처리를 이어서 한다)
+        """
+        if not await self.close():
+            print("interview complete_deferred", self.session_id)
+            return False
+        # 이미 종료된 면접에 다시 연결된 경우 최종 평가를 다시 요청하지 않음
+        if self.ended:
+            return True
+        self.ended = True
+        await firebase_crud_async.save_chat_end(self.session_id)
+        job_queue.submit(FINAL_EVAL, self.session_id)
+        return True
+
+    def detach(self) -> None:
+        """
+        다른 연결(또는 워커)이 세션을 넘겨받았을 때 호출. 이후로는 체크포인트를 쓰지 않는다.
+        """
+        self._superseded = True
+
+    def snapshot(self) -> dict:
+        return {
+            "turn": self.turn,
+            "followups": self.followups,
+            "question": self.followup_question,
+            "history": list(self.history),
+            "pending": list(self.pending),
+        }
+
+    def _track(self, spec: SpeculativeTurn, entry: dict) -> None:
+        self.turns.append(spec)
+        if entry not in self.pending:
+            self.pending.append(entry)
+
+        def done(_):
+            if entry in self.pending:
+                self.pending.remove(entry)
+                self._checkpoint()
+
+        spec.log_task.add_done_callback(done)
+
+    def _checkpoint(self) -> None:
+        if self._superseded:
+            return
+        self._dirty = True
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_checkpoints())
+
+    async def _write_checkpoints(self) -> None:
+        # 쓰는 동안 바뀐 상태는 모아서 다음 한 번에 저장 (항상 최신 상태만 기록)
+        while self._dirty and not self._superseded:
+            self._dirty = False
+            try:
+                await firebase_crud_async.update_session(
+                    self.session_id, {"interview_state": self.snapshot()})
+            except Exception as e:
+                print("interview checkpoint error", self.session_id, e)
@@ -0,0 +1,282 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.config import JOB_STORE, JOB_STORE_PATH, JOB_WORKERS
+from app.core.cache import TTLCache
+from app.services import firebase_crud_async, llm_service, ownership, telemetry
+
+FINAL_EVAL = "final_eval"
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 끝난 작업의 결과(Future)를 wait()로 받아갈 수 있도록 남겨 두는 개수와 시간(초)
+_RECENT_RESULTS = 256
+_RECENT_RESULTS_TTL = 300
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class MemoryJobStore:
+    def __init__(self):
+        self._jobs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: dict) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def unfinished(self) -> List[dict]:
+        with self._lock:
+            return [dict(j) for j in self._jobs.values() if j["status"] in (QUEUED, RUNNING)]
+
+
+class SQLiteJobStore:
+    """
+    로컬 SQLite에 작업 상태를 저장해 재시작 시 끝나지 않은 작업을 다시 실행할 수 있게 한다.
+    """
+
+    def __init__(self, path: str = JOB_STORE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, payload TEXT NOT NULL)"
+            )
+
+    def save(self, job: dict) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, status, payload) VALUES (?, ?, ?)",
+                (job["id"], job["status"], json.dumps(job, ensure_ascii=False)),
+            )
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def unfinished(self) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+def create_store(kind: str = JOB_STORE):
+    if kind == "sqlite":
+        return SQLiteJobStore()
+    return MemoryJobStore()
+
+
+async def run_final_eval(session_id: str) -> dict:
+    # 다른 워커가 먼저 끝낸 결과가 있으면 다시 계산하지 않음
+    data = await firebase_crud_async.get_session(session_id, use_cache=False)
+    if data and data.get("final_eval"):
+        return data["final_eval"]
+    telemetry.bind_session(session_id)
+    try:
+        logs = await firebase_crud_async.get_interactions(session_id)
+        result = await llm_service.final_eval_async(logs)
+        await firebase_crud_async.update_session(session_id, {"final_eval": result})
+    finally:
+        telemetry.bind_session(None)
+        await telemetry.flush_session_async(session_id)
+    return result
+
+
+class JobQueue:
+    """
+    프로세스 내 asyncio 큐 기반 백그라운드 작업 실행기.
+    작업 상태는 작업 저장소와 세션 문서의 '{kind}_job' 필드에 기록된다.
+    같은 세션/종류의 작업이 대기 중이거나 실행 중이면 새로 만들지 않고 기존 작업을 반환한다.
+    """
+
+    def __init__(self, store=None, workers: int = JOB_WORKERS):
+        self.store = store or create_store()
+        self.workers = workers
+        self.handlers: Dict[str, Callable[[str], Awaitable[Any]]] = {
+            FINAL_EVAL: run_final_eval,
+        }
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._active: Dict[tuple, dict] = {}
+        # 대기 중/실행 중인 작업의 Future. 끝나면 _recent로 옮겨 잠시만 보관한다
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._recent = TTLCache(maxsize=_RECENT_RESULTS, ttl=_RECENT_RESULTS_TTL)
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        현재 이벤트 루프에서 워커를 시작하고, 저장소에 남은 미완료 작업을 다시 큐에 넣는다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._futures = {}
+        self._recent.clear()
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        with self._lock:
+            self._active = {}
+        for job in self.store.unfinished():
+            self._enqueue(job)
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def _running_on_current_loop(self) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return loop is self._loop and bool(self._tasks)
+
+    def submit(self, kind: str, session_id: str) -> dict:
+        """
+        작업을 등록하고 작업 정보를 반환한다. 이벤트 루프 밖(스레드풀)에서 호출해도 된다.
+        """
+        try:
+            asyncio.get_running_loop()
+            on_loop = True
+        except RuntimeError:
+            on_loop = False
+        if on_loop and not self._running_on_current_loop():
+            # lifespan 없이 실행된 경우(테스트 등) 현재 루프에서 워커를 시작
+            self.start()
+        with self._lock:
+            existing = self._active.get((kind, session_id))
+            if existing is not None:
+                return dict(existing)
+            job = {
+                "id": uuid.uuid4().hex,
+                "kind": kind,
+                "session_id": session_id,
+                "status": QUEUED,
+                "created_at": _now(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+            }
+            self._active[(kind, session_id)] = job
+        self.store.save(job)
+        if on_loop:
+            self._enqueue(job)
+        elif self._loop is not None and self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._enqueue, job)
+        else:
+            print("job_queue not running, job stays queued", job["id"])
+        return dict(job)
+
+    def _enqueue(self, job: dict) -> None:
+        with self._lock:
+            self._active[(job["kind"], job["session_id"])] = job
+        self._futures.setdefault(job["id"], self._loop.create_future())
+        self._queue.put_nowait(job)
+        asyncio.create_task(self._publish(job))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        return self.store.get(job_id)
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """
+        작업이 끝날 때까지 기다려 결과를 반환한다. 실패한 작업은 예외를 다시 발생시킨다.
+        """
+        future = self._futures.get(job_id) or self._recent.get(job_id)
+        if future is None:
+            raise KeyError(job_id)
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+
+    async def _publish(self, job: dict) -> None:
+        self.store.save(job)
+        try:
+            await firebase_crud_async.update_session(
+                job["session_id"],
+                {f"{job['kind']}_job": {k: job[k] for k in (
+                    "id", "status", "created_at", "started_at", "finished_at", "error")}},
+            )
+        except Exception as e:
+            print("job_queue publish_error", job["id"], e)
+
+    async def _run_leased(self, job: dict) -> Any:
+        """
+        여러 워커가 같은 세션의 같은 작업을 동시에 실행하지 않도록 작업 lease를 잡고 실행한다.
+        다른 워커가 실행 중이면 끝날(또는 lease가 만료될) 때까지 기다린다.
+        """
+        lease = ownership.SessionLease(job["session_id"], job["kind"])
+        await lease.acquire(wait=None)
+        try:
+            return await self.handlers[job["kind"]](job["session_id"])
+        finally:
+            await lease.release()
+
+    def _retire(self, job_id: str) -> None:
+        """
+        끝난 작업의 Future를 최근 결과 캐시로 옮긴다. 오래된 결과는 캐시에서 밀려나 메모리에 쌓이지 않는다.
+        """
+        future = self._futures.pop(job_id, None)
+        if future is None:
+            return
+        if future.done() and not future.cancelled():
+            # 아무도 기다리지 않은 실패 작업이 'exception was never retrieved' 경고를 남기지 않도록 확인 처리
+            future.exception()
+        self._recent.set(job_id, future)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            future = self._futures.get(job["id"])
+            try:
+                job["status"] = RUNNING
+                job["started_at"] = _now()
+                await self._publish(job)
+                result = await self._run_leased(job)
+                job["status"] = DONE
+                if future is not None and not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                job["status"] = FAILED
+                job["error"] = str(e)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            finally:
+                if job["status"] in (DONE, FAILED):
+                    self._retire(job["id"])
+                    job["finished_at"] = _now()
+                    with self._lock:
+                        self._active.pop((job["kind"], job["session_id"]), None)
+                    await self._publish(job)
+                self._queue.task_done()
+
+
+job_queue = JobQueue()
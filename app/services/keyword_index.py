@@ -0,0 +1,118 @@
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import litellm
+import numpy as np
+
+from app.config import KEYWORD_EMBED_MODEL, KEYWORD_INDEX_DIR
+
+MANIFEST_FILE = "manifest.json"
+
+
+def embed_texts(
+    texts: Sequence[str], model: str = KEYWORD_EMBED_MODEL, batch_size: int = 256
+) -> np.ndarray:
+    """
+    텍스트 목록을 임베딩해 L2 정규화된 float32 행렬로 반환한다.
+    """
+    vectors = []
+    for i in range(0, len(texts), batch_size):
+        response = litellm.embedding(model=model, input=list(texts[i: i + batch_size]))
+        for item in response.data:
+            vectors.append(item["embedding"] if isinstance(item, dict) else item.embedding)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def build_index(
+    json_path: str = "data/extracted_keywords.json",
+    index_dir: str = KEYWORD_INDEX_DIR,
+    model: str = KEYWORD_EMBED_MODEL,
+) -> Dict[str, int]:
+    """
+    카테고리별 키워드를 한 번만 임베딩해 {category}.npy / {category}.json 으로 저장한다.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    os.makedirs(index_dir, exist_ok=True)
+    counts = {}
+    for category, keywords in data.items():
+        keywords = list(keywords)
+        if keywords:
+            matrix = embed_texts(keywords, model=model)
+        else:
+            matrix = np.zeros((0, 0), dtype=np.float32)
+        np.save(os.path.join(index_dir, f"{category}.npy"), matrix)
+        with open(os.path.join(index_dir, f"{category}.json"), "w", encoding="utf-8") as f:
+            json.dump(keywords, f, ensure_ascii=False)
+        counts[category] = len(keywords)
+        print("keyword_index built", category, matrix.shape)
+    with open(os.path.join(index_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump({"model": model, "categories": list(data.keys())}, f, ensure_ascii=False)
+    return counts
+
+
+class KeywordIndex:
+    """
+    메모리 매핑된 카테고리별 임베딩 행렬에 대해 코사인 top-k 검색을 수행한다.
+    """
+
+    def __init__(self, index_dir: str = KEYWORD_INDEX_DIR):
+        with open(os.path.join(index_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.model = manifest["model"]
+        self.matrices: Dict[str, np.ndarray] = {}
+        self.keywords: Dict[str, List[str]] = {}
+        for category in manifest["categories"]:
+            self.matrices[category] = np.load(
+                os.path.join(index_dir, f"{category}.npy"), mmap_mode="r"
+            )
+            with open(os.path.join(index_dir, f"{category}.json"), "r", encoding="utf-8") as f:
+                self.keywords[category] = json.load(f)
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return embed_texts([text], model=self.model)[0]
+
+    def search_vector(self, query: np.ndarray, top_k: int = 10) -> Dict[str, List[str]]:
+        result = {}
+        for category, matrix in self.matrices.items():
+            keywords = self.keywords[category]
+            if not keywords:
+                result[category] = []
+                continue
+            scores = matrix @ query
+            k = min(top_k, len(keywords))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            result[category] = [keywords[i] for i in top]
+        return result
+
+    def search(self, text: str, top_k: int = 10) -> Dict[str, List[str]]:
+        return self.search_vector(self.embed_query(text), top_k=top_k)
+
+
+_index: Optional[KeywordIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index(index_dir: str = KEYWORD_INDEX_DIR) -> Optional[KeywordIndex]:
+    """
+    인덱스가 생성되어 있으면 한 번만 로드해 반환하고, 없으면 None을 반환한다.
+    """
+    global _index
+    if _index is not None:
+        return _index
+    if not os.path.exists(os.path.join(index_dir, MANIFEST_FILE)):
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = KeywordIndex(index_dir)
+    return _index
+
+
+if __name__ == "__main__":
+    build_index()
@@ -0,0 +1,224 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from app.config import (
+    LLM_CACHE_BACKEND,
+    LLM_CACHE_PATH,
+    LLM_CACHE_SIZE,
+    LLM_CACHE_TTL,
+)
+from app.core.cache import TTLCache
+
+
+def normalize_input(value: Any) -> Any:
+    """
+    공백/유니코드 표기/대소문자/끝 문장부호 차이만 있는 입력이 같은 키가 되도록 정규화한다.
+    """
+    if isinstance(value, str):
+        text = unicodedata.normalize("NFKC", value)
+        text = re.sub(r"\s+", " ", text).strip()
+        return text.rstrip("?.!。 ").lower()
+    if isinstance(value, dict):
+        return {str(k): normalize_input(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_input(v) for v in value]
+    return value
+
+
+def template_id(name: str, template: str) -> str:
+    """
+    프롬프트 템플릿이 바뀌면 기존 캐시를 쓰지 않도록 템플릿 본문 해시를 id에 포함한다.
+    """
+    return f"{name}:{hashlib.sha1(template.encode('utf-8')).hexdigest()[:8]}"
+
+
+def make_key(model: str, template: str, inputs: dict) -> str:
+    payload = json.dumps(
+        [model, template, normalize_input(inputs)], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCacheBackend(ABC):
+    """
+    LLM 응답(파싱된 JSON 문자열) 저장소 인터페이스. 조회/저장 횟수 통계는 공통으로 관리한다.
+    """
+
+    name = "base"
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self._set(key, value)
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def _set(self, key: str, value: str) -> None:
+        ...
+
+    @abstractmethod
+    def size(self) -> int:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            total = self.hits + self.misses
+            return {
+                "backend": self.name,
+                "size": self.size(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class MemoryLLMCache(LLMCacheBackend):
+    name = "memory"
+
+    def __init__(self, maxsize: int = LLM_CACHE_SIZE, ttl: float = LLM_CACHE_TTL):
+        super().__init__()
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def _get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def _set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+    def size(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class SQLiteLLMCache(LLMCacheBackend):
+    """
+    프로세스 재시작/여러 워커 사이에서 공유되는 SQLite 캐시. 크기를 넘으면 오래 안 쓴 항목부터 지운다.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        maxsize: int = LLM_CACHE_SIZE,
+        ttl: float = LLM_CACHE_TTL,
+    ):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def _set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now + self.ttl, now),
+            )
+            self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+
+def create_cache(backend: str = LLM_CACHE_BACKEND) -> Optional[LLMCacheBackend]:
+    if backend == "off":
+        return None
+    if backend == "sqlite":
+        return SQLiteLLMCache()
+    if backend == "memory":
+        return MemoryLLMCache()
+    raise ValueError(f"알 수 없는 LLM 캐시 백엔드: {backend}")
+
+
+_cache: Optional[LLMCacheBackend] = None
+_cache_loaded = False
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[LLMCacheBackend]:
+    """
+    설정된 백엔드의 캐시를 반환한다. LLM_CACHE_BACKEND=off이면 None.
+    """
+    global _cache, _cache_loaded
+    if not _cache_loaded:
+        with _cache_lock:
+            if not _cache_loaded:
+                _cache = create_cache()
+                _cache_loaded = True
+    return _cache
+
+
+def set_cache(cache: Optional[LLMCacheBackend]) -> None:
+    """
+    테스트 등에서 다른 백엔드로 교체하거나 None으로 캐시를 끌 때 사용.
+    """
+    global _cache, _cache_loaded
+    with _cache_lock:
+        _cache = cache
+        _cache_loaded = True
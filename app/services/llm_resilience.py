@@ -0,0 +1,180 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, List
+
+from app.config import (
+    LLM_BACKOFF_BASE,
+    LLM_BACKOFF_MAX,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET,
+    LLM_FALLBACK_MODEL,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    모델별 회로 차단기. 연속 실패가 failure_threshold에 도달하면 열려서 호출을 바로 거절하고,
+    reset_timeout초 뒤에는 시험 호출 하나만 허용해 성공하면 닫고 실패하면 다시 연다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = LLM_BREAKER_FAILURES,
+        reset_timeout: float = LLM_BREAKER_RESET,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.opened_count = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._state = HALF_OPEN
+                self._probing = False
+            if self._state == HALF_OPEN:
+                if self._probing:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def release(self) -> None:
+        """
+        성공/실패를 기록하지 못하고 끝난 시도(작업 취소 등)를 정리한다.
+        반열림 상태의 시험 호출 자리를 돌려줘 다음 호출이 다시 시험할 수 있게 한다.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self.opened_count += 1
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def stats(self) -> dict:
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened_count": self.opened_count,
+                "rejected": self.rejected,
+            }
+
+
+def failure_outcome(error: BaseException) -> str:
+    """
+    LLM 호출 예외를 timeout | error로 분류한다. (asyncio 타임아웃과 litellm.Timeout 모두 timeout)
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError)) or "Timeout" in type(error).__name__:
+        return "timeout"
+    return "error"
+
+
+def backoff_delay(
+    attempt: int, base: float = LLM_BACKOFF_BASE, cap: float = LLM_BACKOFF_MAX
+) -> float:
+    """
+    지수 백오프 + full jitter: 0 ~ min(cap, base * 2^attempt) 사이의 무작위 대기 시간
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def candidate_models(model: str) -> List[str]:
+    """
+    호출을 시도할 모델 순서. 대체 모델이 설정되어 있으면 기본 모델 다음에 시도한다.
+    """
+    if LLM_FALLBACK_MODEL and LLM_FALLBACK_MODEL != model:
+        return [model, LLM_FALLBACK_MODEL]
+    return [model]
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+_counters_lock = threading.Lock()
+_counters = {
+    "calls": 0,
+    "attempts": 0,
+    "retries": 0,
+    "errors": 0,
+    "timeouts": 0,
+    "parse_failures": 0,
+    # 파싱/스키마 검증 실패를 로컬 복구로 해결한 횟수, 복구하지 못해 다시 호출한 횟수
+    "repairs": 0,
+    "recalls": 0,
+    "short_circuits": 0,
+    "fallbacks": 0,
+    "deadline_exceeded": 0,
+}
+
+
+def get_breaker(model: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if model not in _breakers:
+            _breakers[model] = CircuitBreaker(model)
+        return _breakers[model]
+
+
+def count(name: str, amount: int = 1) -> None:
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def reset() -> None:
+    """
+    테스트 등에서 차단기와 카운터를 초기화할 때 사용.
+    """
+    with _breakers_lock:
+        _breakers.clear()
+    with _counters_lock:
+        for key in _counters:
+            _counters[key] = 0
+
+
+def stats() -> dict:
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    with _counters_lock:
+        counters = dict(_counters)
+    return {
+        "fallback_model": LLM_FALLBACK_MODEL or None,
+        "counters": counters,
+        "breakers": {name: breaker.stats() for name, breaker in breakers.items()},
+    }
@@ -1,49 +1,353 @@
+import asyncio
 import json
 import os
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional, Tuple, Type
 
 import litellm
 from dotenv import load_dotenv
 from litellm import completion_cost
+from pydantic import BaseModel
+
+from app.config import (
+    FINAL_EVAL_MODE,
+    LLM_DEADLINE,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_MODEL,
+    LLM_TIMEOUT,
+)
+from app.models import llm_schemas
+from app.services import llm_cache, llm_resilience, prompt_builder, telemetry
 
 # .env 파일에서 환경변수 자동 로드
 load_dotenv()
 
+# 이벤트 루프별 동시 호출 제한 세마포어
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+_llm_semaphore_loop = None
 
-def ask_llm(prompt: str, model: str = "gemini/gemini-2.5-flash") -> str:
-    max_retries = 2
-    last_content = ""
-    for _ in range(max_retries + 1):
-        response = litellm.completion(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            stream=False,
-            response_format={"type": "json_object"},
-            reasoning_effort="disable",
-        )
-        cost = completion_cost(response)
-        content = str(
-            response.choices[0].message.content) if response.choices else ""
-        try:
-            test = json.loads(content)
-            if isinstance(test, dict):
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    global _llm_semaphore, _llm_semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _llm_semaphore is None or _llm_semaphore_loop is not loop:
+        _llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+        _llm_semaphore_loop = loop
+    return _llm_semaphore
+
+
+def _accept_json(data, schema: Optional[Type[BaseModel]]) -> Optional[str]:
+    if schema is not None:
+        validated = llm_schemas.validate(schema, data)
+        if validated is None:
+            return None
+        return json.dumps(validated.model_dump(exclude_unset=True), ensure_ascii=False)
+    if isinstance(data, dict):
+        return json.dumps(data, ensure_ascii=False)
+    if isinstance(data, list) and len(data) > 0:
+        # 리스트의 첫 번째 요소를 다시 json string으로 변환
+        return json.dumps(data[0])
+    return None
+
+
+def _parse_llm_content(content: str, schema: Optional[Type[BaseModel]] = None) -> Optional[str]:
+    """
+    JSON 응답이면 dict 문자열을 반환하고, 파싱에 실패하면 None을 반환한다.
+    schema를 주면 스키마 검증을 통과한 응답만 정규화된 JSON 문자열로 반환한다.
+    그대로 파싱/검증되지 않으면 다시 호출하기 전에 로컬 복구(repair_json)를 한 번 시도한다.
+    """
+    try:
+        parsed = _accept_json(json.loads(content), schema)
+        if parsed is not None:
+            return parsed
+    except Exception:
+        pass
+    repaired = llm_schemas.repair_json(content)
+    if repaired is None:
+        return None
+    parsed = _accept_json(repaired, schema)
+    if parsed is not None:
+        llm_resilience.count("repairs")
+    return parsed
+
+
+def _response_cache(
+    model: str,
+    cache_template: Optional[str],
+    cache_inputs: Optional[dict],
+    use_cache: bool,
+) -> Tuple[Optional[llm_cache.LLMCacheBackend], Optional[str]]:
+    """
+    응답 캐시를 쓰는 호출이면 (캐시, 키)를, 아니면 (None, None)을 반환한다.
+    cache_template(템플릿 id)을 넘긴 호출만 캐시 대상이며, use_cache=False로 호출마다 끌 수 있다.
+    """
+    if not use_cache or cache_template is None:
+        return None, None
+    cache = llm_cache.get_cache()
+    if cache is None:
+        return None, None
+    return cache, llm_cache.make_key(model, cache_template, cache_inputs or {})
+
+
+def _response_format(schema: Optional[Type[BaseModel]]) -> dict:
+    if schema is None:
+        return {"type": "json_object"}
+    return llm_schemas.response_format(schema)
+
+
+def _response_content(response) -> str:
+    return str(response.choices[0].message.content) if response.choices else ""
+
+
+def _response_cost(response) -> float:
+    # 가격 정보가 없는 대체 모델 등으로 비용 계산이 실패해도 응답은 사용한다
+    try:
+        return completion_cost(response)
+    except Exception:
+        return 0.0
+
+
+def _retry_follows(attempt: int, breaker: llm_resilience.CircuitBreaker) -> bool:
+    # 같은 모델로 다시 시도할 때만 백오프한다 (마지막 시도이거나 회로가 열렸으면 바로 대체 모델/호출부로)
+    return attempt < LLM_MAX_RETRIES and breaker.state != llm_resilience.OPEN
+
+
+def _backoff_delay(attempt: int, remaining: float) -> float:
+    # 백오프 대기도 남은 deadline을 넘지 않게 자름
+    return min(llm_resilience.backoff_delay(attempt), max(0.0, remaining))
+
+
+def _cache_lookup(
+    cache: Optional[llm_cache.LLMCacheBackend], cache_key: Optional[str]
+) -> Optional[str]:
+    if cache is None:
+        return None
+    cached = cache.get(cache_key)
+    if cached is not None:
+        telemetry.record_cache_hit()
+    return cached
+
+
+def _completion_request(candidate: str, prompt: str, response_format: dict) -> dict:
+    return {
+        "model": candidate,
+        "messages": [{"role": "user", "content": prompt}],
+        "stream": False,
+        "response_format": response_format,
+        "reasoning_effort": "disable",
+    }
+
+
+def _begin_attempt(breaker: llm_resilience.CircuitBreaker, attempt: int) -> bool:
+    """
+    회로가 호출을 허용하면 시도 횟수를 세고 True, 열려 있으면 short_circuits를 세고 False를 반환한다.
+    """
+    if not breaker.allow():
+        llm_resilience.count("short_circuits")
+        return False
+    if attempt > 0:
+        llm_resilience.count("retries")
+    llm_resilience.count("attempts")
+    return True
+
+
+def _attempt_failed(
+    caller: str,
+    candidate: str,
+    breaker: llm_resilience.CircuitBreaker,
+    error: Exception,
+    latency: float,
+    attempt: int,
+) -> None:
+    breaker.record_failure()
+    outcome = llm_resilience.failure_outcome(error)
+    llm_resilience.count(f"{outcome}s")
+    telemetry.record_attempt(candidate, latency, outcome, retry=attempt > 0)
+    print(caller, outcome, candidate, type(error).__name__)
+
+
+def _attempt_succeeded(
+    candidate: str,
+    breaker: llm_resilience.CircuitBreaker,
+    response,
+    latency: float,
+    attempt: int,
+    schema: Optional[Type[BaseModel]],
+) -> Tuple[Optional[str], str, float]:
+    """
+    응답을 받은 시도의 비용 계산/파싱/기록. (검증된 JSON 문자열 또는 None, 응답 원문, 이번 시도 비용)을 반환한다.
+    """
+    breaker.record_success()
+    attempt_cost = _response_cost(response)
+    content = _response_content(response)
+    parsed = _parse_llm_content(content, schema)
+    telemetry.record_attempt(
+        candidate, latency, "ok" if parsed is not None else "parse_failure",
+        response=response, cost=attempt_cost, retry=attempt > 0)
+    if parsed is None:
+        llm_resilience.count("parse_failures")
+        if attempt < LLM_MAX_RETRIES:
+            llm_resilience.count("recalls")
+    return parsed, content, attempt_cost
+
+
+def ask_llm(
+    prompt: str,
+    model: str = LLM_MODEL,
+    timeout: float = LLM_TIMEOUT,
+    response_format: Optional[dict] = None,
+    cache_template: Optional[str] = None,
+    cache_inputs: Optional[dict] = None,
+    use_cache: bool = True,
+    deadline: float = LLM_DEADLINE,
+    schema: Optional[Type[BaseModel]] = None,
+) -> Tuple[str, float]:
+    """
+    LLM을 호출해 JSON 응답 문자열과 누적 비용을 반환한다.
+    오류/타임아웃/JSON 파싱 실패 시 지수 백오프(jitter)로 재시도하고, 모델별 회로가 열려 있거나
+    재시도가 소진되면 대체 모델(LLM_FALLBACK_MODEL)로 넘어간다. 시도마다 timeout(초)을 적용하고,
+    전체 소요 시간은 deadline(초)을 넘지 않는다. 모두 실패하면 빈 응답(또는 마지막 응답)을 반환해
+    호출부의 파싱 실패 처리로 넘긴다.
+    response_format을 주면 json_object 대신 해당 형식(JSON 스키마 등)을 요청하고,
+    schema(Pydantic 모델)를 주면 그 스키마로 응답 형식을 제한하고 검증을 통과한 응답만 반환한다.
+    cache_template/cache_inputs를 주면 파싱에 성공한 응답을 캐시하고, 캐시 적중 시 비용 0으로 바로 반환한다.
+    """
+    cache, cache_key = _response_cache(
+        model, cache_template, cache_inputs, use_cache)
+    cached = _cache_lookup(cache, cache_key)
+    if cached is not None:
+        return cached, 0.0
+    llm_resilience.count("calls")
+    response_format = response_format or _response_format(schema)
+    deadline_at = time.monotonic() + deadline
+    content = ""
+    cost = 0.0
+    for index, candidate in enumerate(llm_resilience.candidate_models(model)):
+        breaker = llm_resilience.get_breaker(candidate)
+        if index > 0:
+            llm_resilience.count("fallbacks")
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                llm_resilience.count("deadline_exceeded")
                 return content, cost
-            if isinstance(test, list) and len(test) > 0:
-                # 리스트의 첫 번째 요소를 다시 json string으로 변환
-                return json.dumps(test[0]), cost
-        except Exception:
-            continue
+            if not _begin_attempt(breaker, attempt):
+                break
+            started = time.monotonic()
+            try:
+                response = litellm.completion(
+                    **_completion_request(candidate, prompt, response_format),
+                    timeout=min(timeout, remaining),
+                )
+            except Exception as e:
+                response = None
+                _attempt_failed(
+                    "ask_llm", candidate, breaker, e, time.monotonic() - started, attempt)
+            latency = time.monotonic() - started
+            if response is not None:
+                parsed, content, attempt_cost = _attempt_succeeded(
+                    candidate, breaker, response, latency, attempt, schema)
+                # 재시도 비용까지 포함한 누적 비용
+                cost += attempt_cost
+                if parsed is not None:
+                    if cache is not None:
+                        cache.set(cache_key, parsed)
+                    return parsed, cost
+            if _retry_follows(attempt, breaker):
+                time.sleep(_backoff_delay(attempt, deadline_at - time.monotonic()))
     return content, cost
 
 
-def generate_questions(
+async def ask_llm_async(
+    prompt: str,
+    model: str = LLM_MODEL,
+    timeout: float = LLM_TIMEOUT,
+    response_format: Optional[dict] = None,
+    cache_template: Optional[str] = None,
+    cache_inputs: Optional[dict] = None,
+    use_cache: bool = True,
+    deadline: float = LLM_DEADLINE,
+    schema: Optional[Type[BaseModel]] = None,
+) -> Tuple[str, float]:
+    """
+    ask_llm의 비동기 버전. 이벤트 루프를 막지 않도록 litellm.acompletion을 사용하고,
+    세마포어로 동시 호출 수를 제한한다. 빈 자리를 기다리는 시간도 deadline에 포함된다.
+    """
+    cache, cache_key = _response_cache(
+        model, cache_template, cache_inputs, use_cache)
+    cached = await asyncio.to_thread(_cache_lookup, cache, cache_key)
+    if cached is not None:
+        return cached, 0.0
+    llm_resilience.count("calls")
+    response_format = response_format or _response_format(schema)
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline
+    content = ""
+    cost = 0.0
+    for index, candidate in enumerate(llm_resilience.candidate_models(model)):
+        breaker = llm_resilience.get_breaker(candidate)
+        if index > 0:
+            llm_resilience.count("fallbacks")
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            remaining = deadline_at - loop.time()
+            if remaining <= 0:
+                llm_resilience.count("deadline_exceeded")
+                return content, cost
+            semaphore = _get_llm_semaphore()
+            try:
+                await asyncio.wait_for(semaphore.acquire(), remaining)
+            except asyncio.TimeoutError:
+                llm_resilience.count("deadline_exceeded")
+                return content, cost
+            try:
+                remaining = deadline_at - loop.time()
+                if remaining <= 0:
+                    llm_resilience.count("deadline_exceeded")
+                    return content, cost
+                # 자리를 얻은 뒤에 회로를 확인해 반열림 시험 호출이 대기열에 묶이지 않게 함
+                if not _begin_attempt(breaker, attempt):
+                    break
+                started = loop.time()
+                try:
+                    response = await asyncio.wait_for(
+                        litellm.acompletion(
+                            **_completion_request(candidate, prompt, response_format)),
+                        timeout=min(timeout, remaining),
+                    )
+                except asyncio.CancelledError:
+                    # 결과 없이 취소된 시험 호출이 회로를 반열림 상태로 묶어 두지 않도록 자리를 돌려줌
+                    breaker.release()
+                    raise
+                except Exception as e:
+                    response = None
+                    _attempt_failed(
+                        "ask_llm_async", candidate, breaker, e, loop.time() - started, attempt)
+                latency = loop.time() - started
+            finally:
+                semaphore.release()
+            if response is not None:
+                parsed, content, attempt_cost = _attempt_succeeded(
+                    candidate, breaker, response, latency, attempt, schema)
+                # 재시도 비용까지 포함한 누적 비용
+                cost += attempt_cost
+                if parsed is not None:
+                    if cache is not None:
+                        await asyncio.to_thread(cache.set, cache_key, parsed)
+                    return parsed, cost
+            if _retry_follows(attempt, breaker):
+                await asyncio.sleep(_backoff_delay(attempt, deadline_at - loop.time()))
+    return content, cost
+
+
+def _questions_prompt(
     persona: str,
     keywords: dict,
     user_info: dict,
     rag_info: dict,
-    num_questions: int = 10,
-) -> List[Dict]:
-    prompt = f"""
+    num_questions: int,
+) -> str:
+    return f"""
     아래 페르소나를 가진 면접관이 신입 개발자에게 할 만한 면접 질문 {num_questions}개를 JSON 배열로 생성해줘.
     페르소나: {persona}
     키워드: {json.dumps(keywords, ensure_ascii=False)}
@@ -62,8 +366,9 @@ def generate_questions(
         ]
     }}
     """.strip()
-    result, cost = ask_llm(prompt)
-    print("generate_questions cost", cost)
+
+
+def _parse_questions(result: str) -> List[Dict]:
     try:
         data = json.loads(result)
         print(data)
@@ -72,8 +377,36 @@ def generate_questions(
         return []
 
 
-def evaluate_answer(question: str, answer: str) -> Dict:
-    prompt = f"""
+@telemetry.instrumented("generate_questions")
+def generate_questions(
+    persona: str,
+    keywords: dict,
+    user_info: dict,
+    rag_info: dict,
+    num_questions: int = 10,
+) -> List[Dict]:
+    prompt = _questions_prompt(
+        persona, keywords, user_info, rag_info, num_questions)
+    result, _ = ask_llm(prompt, schema=llm_schemas.QuestionsResponse)
+    return _parse_questions(result)
+
+
+@telemetry.instrumented("generate_questions")
+async def generate_questions_async(
+    persona: str,
+    keywords: dict,
+    user_info: dict,
+    rag_info: dict,
+    num_questions: int = 10,
+) -> List[Dict]:
+    prompt = _questions_prompt(
+        persona, keywords, user_info, rag_info, num_questions)
+    result, _ = await ask_llm_async(prompt, schema=llm_schemas.QuestionsResponse)
+    return _parse_questions(result)
+
+
+# 답변 평가 기준 (evaluate_answer, evaluate_with_followup 공용)
+_EVALUATION_RUBRIC = """
 아래는 신입 개발자 면접 질문과 지원자의 답변입니다.
 FAANG 및 Microsoft 인터뷰 원칙을 참고하여, 아래 5개 항목에 대해 평가해 주세요.
 
@@ -112,23 +445,31 @@ FAANG 및 Microsoft 인터뷰 원칙을 참고하여, 아래 5개 항목에 대
 - 챗봇 질문 예시: "이 문제를 해결하지 못했다면, 다음에 어떻게 접근해보실 건가요?"
 - 예시 피드백: 5/5 – 모르는 부분은 솔직히 인정했고, 학습 계획까지 언급함.
 
-질문: {question}
+"""
+
+# 평가 결과 JSON 예시 (categories)
+_EVALUATION_EXAMPLE = """  "categories": [
+    {"name": "기술 이해도", "score": 4, "feedback": "해시 구조 개념은 잘 설명했으나, 충돌 해결 방식까지는 연결하지 못함."},
+    {"name": "문제 해결력", "score": 3, "feedback": "정답에는 도달했지만 시간 복잡도 최적화에 대한 고려는 부족함."},
+    {"name": "기초 지식 응용력", "score": 3, "feedback": "Stack 자체는 이해했으나 재귀 흐름으로의 확장이 부족함."},
+    {"name": "의사소통 능력", "score": 3, "feedback": "개념 전달은 되었으나 예시 부족하고 길게 설명함."},
+    {"name": "태도 및 자기 인식", "score": 5, "feedback": "모르는 부분은 솔직히 인정했고, 학습 계획까지 언급함."},
+  ],"""
+
+
+def _evaluate_prompt(question: str, answer: str) -> str:
+    return f"""{_EVALUATION_RUBRIC}질문: {question}
 답변: {answer}
 
 아래와 같은 JSON 형식으로 모든 카테고리에 대한 평가를 답변해 주세요.
 {{
-  "categories": [
-    {{"name": "기술 이해도", "score": 4, "feedback": "해시 구조 개념은 잘 설명했으나, 충돌 해결 방식까지는 연결하지 못함."}},
-    {{"name": "문제 해결력", "score": 3, "feedback": "정답에는 도달했지만 시간 복잡도 최적화에 대한 고려는 부족함."}},
-    {{"name": "기초 지식 응용력", "score": 3, "feedback": "Stack 자체는 이해했으나 재귀 흐름으로의 확장이 부족함."}},
-    {{"name": "의사소통 능력", "score": 3, "feedback": "개념 전달은 되었으나 예시 부족하고 길게 설명함."}},
-    {{"name": "태도 및 자기 인식", "score": 5, "feedback": "모르는 부분은 솔직히 인정했고, 학습 계획까지 언급함."}},
-  ],
+{_EVALUATION_EXAMPLE}
   "total_score": 78  // 100점 만점 환산 총점
 }}
 """
-    result, cost = ask_llm(prompt)
-    # print("evaluate_answer cost", cost)
+
+
+def _parse_evaluation(result: str) -> Dict:
     try:
         data = json.loads(result)
         if isinstance(data, dict) and "categories" in data:
@@ -138,12 +479,37 @@ FAANG 및 Microsoft 인터뷰 원칙을 참고하여, 아래 5개 항목에 대
         return {}
 
 
-def generate_persona(
-    rag_info: dict,
-    company: str,
-    position: str,
-) -> dict:
-    prompt = f"""
+# 응답 캐시 키에 쓰는 템플릿 id (프롬프트가 바뀌면 id도 바뀜)
+_EVALUATE_TEMPLATE_ID = llm_cache.template_id(
+    "evaluate_answer", _evaluate_prompt("{question}", "{answer}"))
+
+
+@telemetry.instrumented("evaluate_answer")
+def evaluate_answer(question: str, answer: str, use_cache: bool = True) -> Dict:
+    result, _ = ask_llm(
+        _evaluate_prompt(question, answer),
+        cache_template=_EVALUATE_TEMPLATE_ID,
+        cache_inputs={"question": question, "answer": answer},
+        use_cache=use_cache,
+        schema=llm_schemas.EvaluationResponse,
+    )
+    return _parse_evaluation(result)
+
+
+@telemetry.instrumented("evaluate_answer")
+async def evaluate_answer_async(question: str, answer: str, use_cache: bool = True) -> Dict:
+    result, _ = await ask_llm_async(
+        _evaluate_prompt(question, answer),
+        cache_template=_EVALUATE_TEMPLATE_ID,
+        cache_inputs={"question": question, "answer": answer},
+        use_cache=use_cache,
+        schema=llm_schemas.EvaluationResponse,
+    )
+    return _parse_evaluation(result)
+
+
+def _persona_prompt(rag_info: dict, company: str, position: str) -> str:
+    return f"""
     아래 회사 정보와 채용 공고, 기술스택, 가치관을 참고해서
     신입 개발자 면접관의 성향을 페르소나(성격, 질문 스타일, 중시하는 가치 등)로 요약해줘.
     - 성격은 일단 디폴트로 무뚝뚝한 면접관으로 함
@@ -167,8 +533,8 @@ def generate_persona(
     }}
     """.strip()
 
-    persona, cost = ask_llm(prompt)
-    print("generate_persona cost", cost)
+
+def _parse_persona(persona: str) -> dict:
     try:
         persona_dict = json.loads(persona)
         if isinstance(persona_dict, list) and len(persona_dict) > 0:
@@ -180,22 +546,48 @@ def generate_persona(
         return {}
 
 
-def insufficient_judgment(persona: str, q_and_a_history: list) -> Dict:
-    prompt = f"""
-    아래 페르소나를 가진 면접관이 면접자에게 질문한 질문과 답변이야.
-    페르소나: {persona}
+@telemetry.instrumented("generate_persona")
+def generate_persona(
+    rag_info: dict,
+    company: str,
+    position: str,
+) -> dict:
+    persona, _ = ask_llm(
+        _persona_prompt(rag_info, company, position), schema=llm_schemas.PersonaResponse)
+    return _parse_persona(persona)
 
-    아래 답변을 평가해줘. 추가적인 질문이 필요하다 하면 True, 필요하지 않다 하면 False를 반환해.
-    만약 True라면 질문과 연결되는 추가적인 질문을 생성해줘.
 
-    꼬리질문의 판단 기준 : 
+@telemetry.instrumented("generate_persona")
+async def generate_persona_async(
+    rag_info: dict,
+    company: str,
+    position: str,
+) -> dict:
+    persona, _ = await ask_llm_async(
+        _persona_prompt(rag_info, company, position), schema=llm_schemas.PersonaResponse)
+    return _parse_persona(persona)
+
+
+# 꼬리질문 판단 기준 (insufficient_judgment, evaluate_with_followup 공용)
+_FOLLOWUP_CRITERIA = """꼬리질문의 판단 기준 :
     - 질문에 답변이 최악인 경우는 그냥 넘어간다.
     - 질문에 답변이 모호한 경우 면접자가 확실히 알고있는지 판단해서 필요하면 추가적인 꼬리 질문을 생성한다.
     - 너무 쉬운 질문은 그냥 넘어간다.
     - 너무 어려운 질문은 그냥 넘어간다.
     - 질문 자체가 모호할 경우 넘어간다.
     - 면접자가 확실히 알고있는 질문은 그냥 넘어간다.
-    - 그외로도 너무 잦은 꼬리 질문을 남발하지 않도록 보수적으로 판단한다.
+    - 그외로도 너무 잦은 꼬리 질문을 남발하지 않도록 보수적으로 판단한다."""
+
+
+def _judgment_prompt(persona: str, q_and_a_history: list) -> str:
+    return f"""
+    아래 페르소나를 가진 면접관이 면접자에게 질문한 질문과 답변이야.
+    페르소나: {persona}
+
+    아래 답변을 평가해줘. 추가적인 질문이 필요하다 하면 True, 필요하지 않다 하면 False를 반환해.
+    만약 True라면 질문과 연결되는 추가적인 질문을 생성해줘.
+
+    {_FOLLOWUP_CRITERIA}
 
     질문과 답변 기록: {q_and_a_history}
     출력 json 형식:
@@ -204,8 +596,9 @@ def insufficient_judgment(persona: str, q_and_a_history: list) -> Dict:
         "question": 추가적인 질문 or 빈 문자열
     }}
     """
-    result, cost = ask_llm(prompt)
-    print("insufficient_judgment cost", cost)
+
+
+def _parse_judgment(result: str) -> Dict:
     try:
         data = json.loads(result)
         if isinstance(data, dict):
@@ -215,18 +608,132 @@ def insufficient_judgment(persona: str, q_and_a_history: list) -> Dict:
         return {}
 
 
-def summarize_category_feedback(category, feedbacks):
-    if not feedbacks:
-        return ""
-    prompt = f"""
+@telemetry.instrumented("insufficient_judgment")
+def insufficient_judgment(persona: str, q_and_a_history: list) -> Dict:
+    result, _ = ask_llm(
+        _judgment_prompt(persona, q_and_a_history),
+        schema=llm_schemas.FollowupJudgmentResponse,
+    )
+    return _parse_judgment(result)
+
+
+@telemetry.instrumented("insufficient_judgment")
+async def insufficient_judgment_async(persona: str, q_and_a_history: list) -> Dict:
+    result, _ = await ask_llm_async(
+        _judgment_prompt(persona, q_and_a_history),
+        schema=llm_schemas.FollowupJudgmentResponse,
+    )
+    return _parse_judgment(result)
+
+
+def _evaluate_with_followup_prompt(
+    question: str, answer: str, persona: str, q_and_a_history: list
+) -> str:
+    return f"""{_EVALUATION_RUBRIC}질문: {question}
+답변: {answer}
+
+### 꼬리질문 판단
+아래 페르소나를 가진 면접관이 위 질문을 했고, 지금까지의 질문과 답변 기록은 아래와 같습니다.
+페르소나: {persona}
+질문과 답변 기록: {q_and_a_history}
+
+5개 항목 점수의 평균이 3점 미만인 경우에만 꼬리질문이 필요한지 판단하고, 3점 이상이면 followup은 false로 답변해 주세요.
+꼬리질문이 필요하면 followup을 true로 하고 질문과 연결되는 추가 질문을 question에 작성해 주세요.
+    {_FOLLOWUP_CRITERIA}
+
+아래와 같은 JSON 형식으로 모든 카테고리에 대한 평가와 꼬리질문 판단을 함께 답변해 주세요.
+{{
+{_EVALUATION_EXAMPLE}
+  "total_score": 78,  // 100점 만점 환산 총점
+  "followup": false,  // 꼬리질문 필요 여부
+  "question": ""  // 꼬리질문 or 빈 문자열
+}}
+"""
+
+
+def _parse_evaluation_with_followup(result: str) -> Dict:
+    evaluation = _parse_evaluation(result)
+    if not evaluation:
+        return {}
+    question = evaluation.get("question")
+    question = question.strip() if isinstance(question, str) else ""
+    evaluation["followup"] = evaluation.get("followup") is True and bool(question)
+    evaluation["question"] = question if evaluation["followup"] else ""
+    return evaluation
+
+
+_EVALUATE_WITH_FOLLOWUP_TEMPLATE_ID = llm_cache.template_id(
+    "evaluate_with_followup",
+    _evaluate_with_followup_prompt(
+        "{question}", "{answer}", "{persona}", "{q_and_a_history}"),
+)
+
+
+def _evaluate_with_followup_cache_inputs(
+    question: str, answer: str, persona: str, q_and_a_history: list
+) -> dict:
+    return {
+        "question": question,
+        "answer": answer,
+        "persona": persona,
+        "history": q_and_a_history,
+    }
+
+
+@telemetry.instrumented("evaluate_with_followup")
+def evaluate_with_followup(
+    question: str,
+    answer: str,
+    persona: str,
+    q_and_a_history: list,
+    use_cache: bool = True,
+) -> Dict:
+    """
+    답변 평가(categories, total_score)와 꼬리질문 판단(followup, question)을 한 번의 호출로 받는다.
+    """
+    result, _ = ask_llm(
+        _evaluate_with_followup_prompt(
+            question, answer, persona, q_and_a_history),
+        cache_template=_EVALUATE_WITH_FOLLOWUP_TEMPLATE_ID,
+        cache_inputs=_evaluate_with_followup_cache_inputs(
+            question, answer, persona, q_and_a_history),
+        use_cache=use_cache,
+        schema=llm_schemas.EvaluationWithFollowupResponse,
+    )
+    return _parse_evaluation_with_followup(result)
+
+
+@telemetry.instrumented("evaluate_with_followup")
+async def evaluate_with_followup_async(
+    question: str,
+    answer: str,
+    persona: str,
+    q_and_a_history: list,
+    use_cache: bool = True,
+) -> Dict:
+    result, _ = await ask_llm_async(
+        _evaluate_with_followup_prompt(
+            question, answer, persona, q_and_a_history),
+        cache_template=_EVALUATE_WITH_FOLLOWUP_TEMPLATE_ID,
+        cache_inputs=_evaluate_with_followup_cache_inputs(
+            question, answer, persona, q_and_a_history),
+        use_cache=use_cache,
+        schema=llm_schemas.EvaluationWithFollowupResponse,
+    )
+    return _parse_evaluation_with_followup(result)
+
+
+def _category_summary_prompt(category, feedbacks) -> str:
+    return f"""
     아래는 '{category}'에 대한 면접 평가 피드백 모음입니다.
     이 피드백들을 참고해서 '{category}'에 대한 종합 피드백을 한 줄로 요약해줘.
-    {feedbacks}
+{prompt_builder.render_feedbacks(feedbacks)}
     해당 카테고리에 대한 질문이 없어 평가가 불가능한 경우 "평가가 불가능합니다" 라고 작성해줘
     답변 json 형식: {{"summary": "..."}}
     """
-    result, cost = ask_llm(prompt)
-    print("summarize_category_feedback cost", cost)
+
+
+def _parse_category_summary(result: str) -> str:
     try:
         data = json.loads(result)
         if isinstance(data, dict) and "summary" in data:
@@ -238,34 +745,48 @@ def summarize_category_feedback(category, feedbacks):
         return result.strip()
 
 
-def final_eval(logs: list) -> dict:
+@telemetry.instrumented("summarize_category_feedback")
+def summarize_category_feedback(category, feedbacks):
+    if not feedbacks:
+        return ""
+    result, _ = ask_llm(
+        _category_summary_prompt(category, feedbacks),
+        schema=llm_schemas.CategorySummaryResponse,
+    )
+    return _parse_category_summary(result)
+
+
+@telemetry.instrumented("summarize_category_feedback")
+async def _summarize_category_feedback_with_cost(category, feedbacks) -> Tuple[str, float]:
+    if not feedbacks:
+        return "", 0.0
+    result, cost = await ask_llm_async(
+        _category_summary_prompt(category, feedbacks),
+        schema=llm_schemas.CategorySummaryResponse,
+    )
+    return _parse_category_summary(result), cost
+
+
+async def summarize_category_feedback_async(category, feedbacks):
+    summary, _ = await _summarize_category_feedback_with_cost(category, feedbacks)
+    return summary
+
+
+FINAL_EVAL_CATEGORIES = [
+    "기술 이해도",
+    "문제 해결력",
+    "기초 지식 응용력",
+    "의사소통 능력",
+    "태도 및 자기 인식",
+]
+
+
+def _aggregate_logs(logs: list) -> Tuple[float, dict, dict, list]:
     """
-    logs: [{question, answer, evaluation: [{categories: [{name, score, feedback}, ...]}]}]
-    아래와 같은 구조로 반환:
-    {
-        'total_score': float,  # 전체 평균
-        'question_count': int,
-        'category_scores': {카테고리: 평균점수, ...},
-        'category_feedbacks': {카테고리: 종합 피드백(한 줄), ...},
-        'questions': [
-            {
-                'question': str,
-                'answer': str,
-                'scores': [...],
-                'feedbacks': [...],
-            },
-            ...
-        ],
-        'final_feedback': str  # LLM 요약
-    }
+    LLM 호출 없이 로그에서 점수/피드백을 집계한다.
+    (전체 평균, 카테고리별 평균, 카테고리별 피드백 목록, 질문별 상세) 반환
     """
-    categories = [
-        "기술 이해도",
-        "문제 해결력",
-        "기초 지식 응용력",
-        "의사소통 능력",
-        "태도 및 자기 인식",
-    ]
+    categories = FINAL_EVAL_CATEGORIES
     category_scores = {cat: [] for cat in categories}
     category_feedbacks = {cat: [] for cat in categories}
     questions = []
@@ -323,14 +844,11 @@ def final_eval(logs: list) -> dict:
         cat: round(sum(vals) / len(vals), 2) if vals else 0.0
         for cat, vals in category_scores.items()
     }
-    # 카테고리별 종합 피드백 생성
-    category_feedbacks_summary = {}
-    for cat in categories:
-        category_feedbacks_summary[cat] = summarize_category_feedback(
-            cat, category_feedbacks[cat]
-        )
-    # LLM 최종 피드백
-    summary_prompt = f"""
+    return avg_total, avg_category, category_feedbacks, questions
+
+
+def _final_summary_prompt(logs: list) -> str:
+    return f"""
 당신은 최고의 면접 평가 전문가입니다. 면접 평가 전문가로서 면접 평가 기준과 예시를 참고해서 면접 평가를 작성해줘.
 너무 평가 기준과 이전의 평가 기록에 너무 얽매이지 말고 면접자의 답변을 전체적으로 참고해서 평가를 작성해줘.
 
@@ -368,23 +886,29 @@ FAANG 및 Microsoft 인터뷰 원칙을 참고하여, 아래 5개 항목에 대
 - 예시 피드백: 5/5 – 모르는 부분은 솔직히 인정했고, 학습 계획까지 언급함.
 
 면접 세션 기록:
-{logs}
+{prompt_builder.render_session_logs(logs, FINAL_EVAL_CATEGORIES)}
 
 아래와 같은 JSON 형식으로 답변해 주세요.
 {{
     "final_feedback": "최종 총평"
 }}
 """.strip()
-    final_feedback, cost = ask_llm(summary_prompt)
-    print("final_eval cost", cost)
+
+
+def _parse_final_feedback(final_feedback: str) -> str:
     try:
         final_feedback_dict = json.loads(final_feedback)
         if isinstance(final_feedback_dict, dict):
-            final_feedback = final_feedback_dict.get("final_feedback", "")
-        else:
-            final_feedback = ""
+            return final_feedback_dict.get("final_feedback", "")
+        return ""
     except Exception:
-        final_feedback = ""
+        return ""
+
+
+def _final_eval_result(
+    aggregated: Tuple[float, dict, dict, list], category_feedbacks_summary: dict, final_feedback: str
+) -> dict:
+    avg_total, avg_category, _, questions = aggregated
     return {
         "total_score": avg_total,
         "question_count": len(questions),
@@ -395,6 +919,149 @@ FAANG 및 Microsoft 인터뷰 원칙을 참고하여, 아래 5개 항목에 대
     }
 
 
+async def _final_eval_multi_async(logs: list) -> Tuple[dict, float]:
+    """
+    카테고리별 요약 5개와 최종 총평을 동시에 요청한다. (결과, 총 비용) 반환
+    """
+    aggregated = _aggregate_logs(logs)
+    category_feedbacks = aggregated[2]
+
+    async def final_summary() -> Tuple[str, float]:
+        final_feedback, cost = await ask_llm_async(
+            _final_summary_prompt(logs), schema=llm_schemas.FinalFeedbackResponse)
+        return _parse_final_feedback(final_feedback), cost
+
+    *category_summaries, (final_feedback, final_cost) = await asyncio.gather(
+        *[
+            _summarize_category_feedback_with_cost(cat, category_feedbacks[cat])
+            for cat in FINAL_EVAL_CATEGORIES
+        ],
+        final_summary(),
+    )
+    summaries = {
+        cat: summary
+        for cat, (summary, _) in zip(FINAL_EVAL_CATEGORIES, category_summaries)
+    }
+    cost = final_cost + sum(c for _, c in category_summaries)
+    return _final_eval_result(aggregated, summaries, final_feedback), cost
+
+
+FINAL_EVAL_SCHEMA = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "final_eval",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "category_feedbacks": {
+                    "type": "object",
+                    "properties": {
+                        cat: {"type": "string"} for cat in FINAL_EVAL_CATEGORIES
+                    },
+                    "required": FINAL_EVAL_CATEGORIES,
+                    "additionalProperties": False,
+                },
+                "final_feedback": {"type": "string"},
+            },
+            "required": ["category_feedbacks", "final_feedback"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _final_eval_single_prompt(logs: list, category_feedbacks: dict) -> str:
+    summary_prompt = _final_summary_prompt(logs)
+    # 총평 프롬프트의 응답 형식 부분을 카테고리 요약까지 포함한 형식으로 교체
+    body = summary_prompt[: summary_prompt.rindex("아래와 같은 JSON 형식으로")]
+    example = ", ".join(f'"{cat}": "..."' for cat in FINAL_EVAL_CATEGORIES)
+    feedback_sections = "\n".join(
+        f"[{cat}]\n{prompt_builder.render_feedbacks(category_feedbacks.get(cat, []), name='final_eval_feedbacks')}"
+        for cat in FINAL_EVAL_CATEGORIES
+    )
+    return f"""{body.rstrip()}
+
+카테고리별 면접 평가 피드백 모음:
+{feedback_sections}
+
+category_feedbacks에는 각 카테고리의 피드백 모음을 참고해서 카테고리별 종합 피드백을 한 줄로 요약해줘.
+해당 카테고리에 대한 피드백이 없어 평가가 불가능한 경우 "평가가 불가능합니다" 라고 작성해줘.
+final_feedback에는 위 기준에 따른 최종 총평을 작성해줘.
+
+아래와 같은 JSON 형식으로 답변해 주세요.
+{{
+    "category_feedbacks": {{{example}}},
+    "final_feedback": "최종 총평"
+}}
+""".strip()
+
+
+def _parse_single_final_eval(result: str) -> Tuple[dict, str]:
+    try:
+        data = json.loads(result)
+    except Exception:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    feedbacks = data.get("category_feedbacks")
+    if not isinstance(feedbacks, dict):
+        feedbacks = {}
+    summaries = {cat: str(feedbacks.get(cat, "") or "")
+                 for cat in FINAL_EVAL_CATEGORIES}
+    final_feedback = data.get("final_feedback", "")
+    return summaries, final_feedback if isinstance(final_feedback, str) else ""
+
+
+async def _final_eval_single_async(logs: list) -> Tuple[dict, float]:
+    """
+    카테고리 요약과 최종 총평을 JSON 스키마로 제한된 한 번의 호출로 받는다.
+    점수 집계는 multi 모드와 같이 파이썬에서 결정적으로 계산한다.
+    """
+    aggregated = _aggregate_logs(logs)
+    category_feedbacks = aggregated[2]
+    result, cost = await ask_llm_async(
+        _final_eval_single_prompt(logs, category_feedbacks),
+        response_format=FINAL_EVAL_SCHEMA,
+    )
+    summaries, final_feedback = _parse_single_final_eval(result)
+    # 피드백이 없는 카테고리는 multi 모드와 같게 빈 문자열로 둔다
+    for cat in FINAL_EVAL_CATEGORIES:
+        if not category_feedbacks[cat]:
+            summaries[cat] = ""
+    return _final_eval_result(aggregated, summaries, final_feedback), cost
+
+
+_FINAL_EVAL_MODES = {
+    "multi": _final_eval_multi_async,
+    "single": _final_eval_single_async,
+}
+
+
+@telemetry.instrumented("final_eval")
+async def final_eval_async(logs: list, mode: Optional[str] = None) -> dict:
+    """
+    logs: [{question, answer, evaluation: [{categories: [{name, score, feedback}, ...]}]}]
+    아래와 같은 구조로 반환:
+    {
+        'total_score': float,  # 전체 평균
+        'question_count': int,
+        'category_scores': {카테고리: 평균점수, ...},
+        'category_feedbacks': {카테고리: 종합 피드백(한 줄), ...},
+        'questions': [{'question': str, 'answer': str, 'scores': [...], 'feedbacks': [...]}, ...],
+        'final_feedback': str  # LLM 요약
+    }
+    - multi: 카테고리별 요약 5개와 최종 총평을 동시에 요청 (전체 지연은 LLM 왕복 한 번 수준)
+    - single: JSON 스키마로 제한된 프롬프트 한 번으로 요약과 총평을 함께 생성
+    mode를 주지 않으면 FINAL_EVAL_MODE 설정을 따른다.
+    """
+    mode = mode or FINAL_EVAL_MODE
+    if mode not in _FINAL_EVAL_MODES:
+        raise ValueError(f"알 수 없는 final_eval 모드: {mode}")
+    result, _ = await _FINAL_EVAL_MODES[mode](logs)
+    return result
+
+
 def answer_question_with_llm(question: str) -> str:
     """
     질문 dict 리스트를 받아 각 질문에 대해 실제 LLM(ask_llm)로 답변 리스트를 반환한다.
@@ -405,7 +1072,7 @@ def answer_question_with_llm(question: str) -> str:
     )
 
     response = litellm.completion(
-        model="gemini/gemini-2.5-flash",
+        model=LLM_MODEL,
         messages=[{"role": "user", "content": prompt}],
         stream=False,
         reasoning_effort="disable",
@@ -0,0 +1,255 @@
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from google.cloud import firestore
+
+from app.config import (
+    LEASE_BACKEND,
+    LEASE_HANDOFF_WAIT,
+    LEASE_TTL,
+    WORKER_ID,
+    WORKER_URL,
+)
+from app.core.firebase import get_db
+
+# 면접 소켓(/ws/chat, /ws/stt 공용) lease 이름. 백그라운드 작업은 작업 종류(kind)를 이름으로 사용한다
+INTERVIEW = "interview"
+
+# 다른 워커가 넘겨줄 때까지 소유권을 다시 확인하는 간격(초)
+_POLL_INTERVAL = 0.25
+
+
+def _new_lease(previous: Optional[dict], owner: str, url: str, ttl: float) -> dict:
+    # 소유자가 바뀔 때마다 generation을 올려 이전 소유자의 늦은 쓰기와 구분할 수 있게 한다
+    same_owner = previous is not None and previous.get("owner") == owner
+    generation = (previous or {}).get("generation", 0) + (0 if same_owner else 1)
+    return {
+        "owner": owner,
+        "url": url,
+        "expires_at": time.time() + ttl,
+        "generation": generation,
+    }
+
+
+def _alive(lease: Optional[dict]) -> bool:
+    return bool(lease) and lease.get("expires_at", 0) > time.time()
+
+
+class MemoryLeaseStore:
+    """
+    프로세스 내 lease 저장소. Redis의 SET NX PX / 소유자 비교 후 갱신·삭제와 같은 의미로 동작하며,
+    테스트와 단일 프로세스 실행에서 Redis 대신 사용한다.
+    """
+
+    def __init__(self):
+        self._leases: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, session_id: str, name: str, owner: str, url: str, ttl: float) -> Tuple[bool, dict]:
+        key = f"{name}:{session_id}"
+        with self._lock:
+            lease = self._leases.get(key)
+            if _alive(lease) and lease["owner"] != owner:
+                return False, dict(lease)
+            self._leases[key] = _new_lease(lease, owner, url, ttl)
+            return True, dict(self._leases[key])
+
+    def renew(self, session_id: str, name: str, owner: str, ttl: float) -> bool:
+        key = f"{name}:{session_id}"
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is None or lease["owner"] != owner:
+                return False
+            lease["expires_at"] = time.time() + ttl
+            return True
+
+    def release(self, session_id: str, name: str, owner: str) -> None:
+        key = f"{name}:{session_id}"
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease["owner"] == owner:
+                del self._leases[key]
+
+    def get(self, session_id: str, name: str) -> Optional[dict]:
+        with self._lock:
+            lease = self._leases.get(f"{name}:{session_id}")
+            return dict(lease) if _alive(lease) else None
+
+
+class FirestoreLeaseStore:
+    """
+    sessions 문서의 '{name}_lease' 필드에 lease를 두고 트랜잭션으로 획득/갱신/해제한다.
+    여러 워커/노드가 같은 Firestore를 보므로 워커 간 소유권 조정에 사용한다.
+    """
+
+    def _ref(self, session_id: str):
+        return get_db().collection("sessions").document(session_id)
+
+    def _transact(self, session_id: str, name: str, apply):
+        db = get_db()
+        ref = self._ref(session_id)
+        field = f"{name}_lease"
+
+        @firestore.transactional
+        def run(transaction):
+            snapshot = ref.get(transaction=transaction)
+            lease = (snapshot.to_dict() or {}).get(field) if snapshot.exists else None
+            result, update = apply(lease)
+            if update is not None:
+                transaction.update(ref, {field: update})
+            return result
+
+        return run(db.transaction())
+
+    def acquire(self, session_id: str, name: str, owner: str, url: str, ttl: float) -> Tuple[bool, dict]:
+        def apply(lease):
+            if _alive(lease) and lease.get("owner") != owner:
+                return (False, lease), None
+            new = _new_lease(lease, owner, url, ttl)
+            return (True, new), new
+
+        return self._transact(session_id, name, apply)
+
+    def renew(self, session_id: str, name: str, owner: str, ttl: float) -> bool:
+        def apply(lease):
+            if not lease or lease.get("owner") != owner:
+                return False, None
+            return True, {**lease, "expires_at": time.time() + ttl}
+
+        return self._transact(session_id, name, apply)
+
+    def release(self, session_id: str, name: str, owner: str) -> None:
+        def apply(lease):
+            if not lease or lease.get("owner") != owner:
+                return None, None
+            return None, firestore.DELETE_FIELD
+
+        self._transact(session_id, name, apply)
+
+    def get(self, session_id: str, name: str) -> Optional[dict]:
+        doc = self._ref(session_id).get()
+        lease = (doc.to_dict() or {}).get(f"{name}_lease") if doc.exists else None
+        return lease if _alive(lease) else None
+
+
+def create_store(kind: str = LEASE_BACKEND):
+    if kind == "firestore":
+        return FirestoreLeaseStore()
+    if kind == "memory":
+        return MemoryLeaseStore()
+    raise ValueError(f"알 수 없는 lease 저장소: {kind}")
+
+
+lease_store = create_store()
+
+# 이 워커 안에서 lease를 들고 있는 연결/작업 (같은 워커 안의 재접속은 기다리지 않고 바로 넘겨받음)
+_holders: Dict[Tuple[str, str], "SessionLease"] = {}
+
+
+class SessionLease:
+    """
+    세션 하나에 대한 이 워커의 소유권. 획득하면 LEASE_TTL/3 간격으로 갱신하고,
+    다른 연결에 넘겨주거나 갱신에 실패하면(다른 워커가 만료된 lease를 가져감) on_lost를 호출한다.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        name: str = INTERVIEW,
+        on_lost: Optional[Callable[[], None]] = None,
+        store=None,
+        ttl: float = LEASE_TTL,
+    ):
+        self.session_id = session_id
+        self.name = name
+        self.on_lost = on_lost
+        self.store = store or lease_store
+        self.ttl = ttl
+        # 획득에 성공하면 내 lease, 실패하면 현재 소유자의 lease
+        self.lease: Optional[dict] = None
+        self.held = False
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    async def acquire(self, wait: Optional[float] = LEASE_HANDOFF_WAIT) -> bool:
+        """
+        소유권을 얻으면 True. 다른 워커가 소유 중이면 wait초 동안 넘겨주기(해제/만료)를 기다린다.
+        wait=None이면 얻을 때까지 기다린다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if wait is None else loop.time() + wait
+        while True:
+            acquired, lease = await asyncio.to_thread(
+                self.store.acquire, self.session_id, self.name, WORKER_ID, WORKER_URL, self.ttl)
+            self.lease = lease
+            if acquired:
+                break
+            if deadline is not None and loop.time() >= deadline:
+                return False
+            await asyncio.sleep(_POLL_INTERVAL)
+        key = (self.session_id, self.name)
+        previous = _holders.get(key)
+        _holders[key] = self
+        if previous is not None and previous is not self:
+            previous._lose()
+        self.held = True
+        self._heartbeat = asyncio.create_task(self._renew())
+        return True
+
+    async def release(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+        if _holders.get((self.session_id, self.name)) is self:
+            del _holders[(self.session_id, self.name)]
+            try:
+                await asyncio.to_thread(self.store.release, self.session_id, self.name, WORKER_ID)
+            except Exception as e:
+                print("lease release error", self.session_id, self.name, e)
+
+    def _lose(self) -> None:
+        if not self.held:
+            return
+        self.held = False
+        if self._heartbeat is not None and self._heartbeat is not asyncio.current_task():
+            self._heartbeat.cancel()
+        if _holders.get((self.session_id, self.name)) is self:
+            del _holders[(self.session_id, self.name)]
+        if self.on_lost is not None:
+            self.on_lost()
+
+    async def _renew(self) -> None:
+        while self.held:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                renewed = await asyncio.to_thread(
+                    self.store.renew, self.session_id, self.name, WORKER_ID, self.ttl)
+            except Exception as e:
+                # 일시적인 저장소 오류는 다음 주기에 다시 시도 (그 사이 만료되면 갱신 실패로 처리됨)
+                print("lease renew error", self.session_id, self.name, e)
+                continue
+            if not renewed:
+                self._lose()
+                return
+
+
+def owner(session_id: str, name: str = INTERVIEW) -> Optional[dict]:
+    """
+    세션의 현재 소유자 lease (만료되었거나 없으면 None)
+    """
+    return lease_store.get(session_id, name)
+
+
+def public(lease: Optional[dict]) -> dict:
+    """
+    클라이언트/로드밸런서에 알려줄 소유자 정보
+    """
+    lease = lease or {}
+    return {
+        "owner": lease.get("owner"),
+        "url": lease.get("url") or None,
+        "expires_at": lease.get("expires_at"),
+    }
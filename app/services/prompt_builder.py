@@ -0,0 +1,160 @@
+import math
+from typing import List, Optional, Tuple
+
+from app.config import (
+    CATEGORY_FEEDBACK_TOKEN_BUDGET,
+    FINAL_EVAL_LOG_TOKEN_BUDGET,
+    PROMPT_ANSWER_MAX_CHARS,
+)
+from app.services import telemetry
+
+# 턴 압축 단계: 0 전체 / 1 피드백 제외 / 2 답변 축약 / 3 한 줄 요약 / 4 생략
+FULL, NO_FEEDBACK, SHORT_ANSWER, ONE_LINE, DROPPED = range(5)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 쓰는 대략적인 토큰 수 추정치.
+    영문/숫자/기호는 4자당 1토큰, 한글 등 비ASCII 문자는 1.5자당 1토큰으로 계산한다. (실제보다 약간 크게 잡힘)
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return math.ceil(ascii_chars / 4 + other_chars / 1.5)
+
+
+def _truncate(text: str, max_chars: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= max_chars else text[:max_chars].rstrip() + "…"
+
+
+def _turn_sort_key(log: dict):
+    # Firestore 조회 순서는 보장되지 않으므로 턴 번호, 생성 시각 순으로 정렬
+    turn = log.get("turn")
+    return (turn if isinstance(turn, int) else 0, str(log.get("created_at") or ""))
+
+
+def _log_categories(log: dict) -> List[dict]:
+    evals = log.get("evaluation")
+    if not isinstance(evals, list) or not evals or not isinstance(evals[0], dict):
+        return []
+    cats = evals[0].get("categories", [])
+    return cats if isinstance(cats, list) else []
+
+
+def _scores_line(cats: List[dict], categories: List[str]) -> Tuple[str, Optional[float]]:
+    by_name = {c.get("name"): c for c in cats if isinstance(c, dict)}
+    scores = []
+    for cat in categories:
+        try:
+            scores.append(float(by_name[cat].get("score", 0)))
+        except (KeyError, TypeError, ValueError):
+            scores.append(None)
+    known = [s for s in scores if s is not None]
+    line = "/".join("-" if s is None else f"{s:g}" for s in scores)
+    return line, (sum(known) / len(known) if known else None)
+
+
+def render_turn(index: int, log: dict, categories: List[str], level: int = FULL) -> str:
+    """
+    인터랙션 로그 하나를 필요한 필드(질문, 답변, 점수, 피드백)만 담은 짧은 텍스트로 만든다.
+    level이 높을수록 더 짧게 줄인다.
+    """
+    question = " ".join(str(log.get("question") or "").split())
+    answer = str(log.get("answer") or "")
+    cats = _log_categories(log)
+    scores, avg = _scores_line(cats, categories)
+    if level >= DROPPED:
+        return ""
+    if level == ONE_LINE:
+        avg_text = f"{avg:.1f}" if avg is not None else "-"
+        return f"[{index}] Q: {_truncate(question, 80)} (평균 {avg_text})"
+    if level == SHORT_ANSWER:
+        answer = _truncate(answer, PROMPT_ANSWER_MAX_CHARS)
+    else:
+        answer = " ".join(answer.split())
+    lines = [f"[{index}] Q: {question}", f"A: {answer}"]
+    if cats:
+        lines.append(f"점수: {scores}")
+        if level == FULL:
+            feedbacks = [
+                " ".join(str(c.get("feedback") or "").split())
+                for c in cats if isinstance(c, dict) and c.get("feedback")
+            ]
+            if feedbacks:
+                lines.append("피드백: " + " | ".join(dict.fromkeys(feedbacks)))
+    return "\n".join(lines)
+
+
+def _render(entries: List[str], levels: List[int], header: str) -> str:
+    dropped = sum(1 for level in levels if level >= DROPPED)
+    body = [entry for entry in entries if entry]
+    if dropped:
+        body.insert(0, f"(앞선 {dropped}개 질문은 분량 제한으로 생략)")
+    return "\n\n".join([header] + body)
+
+
+def render_session_logs(
+    logs: list,
+    categories: List[str],
+    budget: int = FINAL_EVAL_LOG_TOKEN_BUDGET,
+    name: str = "final_eval",
+) -> str:
+    """
+    세션 로그를 최종 평가 프롬프트에 넣을 텍스트로 만든다.
+    추정 토큰 수가 budget을 넘으면 오래된 턴부터 피드백 제외 → 답변 축약 → 한 줄 요약 → 생략 순으로 줄인다.
+    """
+    ordered = sorted((log for log in logs if isinstance(log, dict)), key=_turn_sort_key)
+    header = f"(점수 순서: {'/'.join(categories)}, 5점 만점)"
+    levels = [FULL] * len(ordered)
+    entries = [render_turn(i + 1, log, categories) for i, log in enumerate(ordered)]
+    text = _render(entries, levels, header)
+    full_tokens = tokens = estimate_tokens(text)
+    for level in (NO_FEEDBACK, SHORT_ANSWER, ONE_LINE, DROPPED):
+        if tokens <= budget:
+            break
+        for i, log in enumerate(ordered):
+            levels[i] = level
+            entries[i] = render_turn(i + 1, log, categories, level)
+            text = _render(entries, levels, header)
+            tokens = estimate_tokens(text)
+            if tokens <= budget:
+                break
+    record(name, levels, tokens, full_tokens)
+    return text
+
+
+def render_feedbacks(
+    feedbacks: list,
+    budget: int = CATEGORY_FEEDBACK_TOKEN_BUDGET,
+    name: str = "category_summary",
+) -> str:
+    """
+    카테고리 피드백 목록을 중복 없이 한 줄씩 나열한다. budget을 넘으면 오래된 피드백부터 뺀다.
+    """
+    items = list(dict.fromkeys(
+        " ".join(str(f).split()) for f in feedbacks if f and str(f).strip()))
+    dropped = 0
+    text = "\n".join(f"- {item}" for item in items)
+    full_tokens = tokens = estimate_tokens(text)
+    while items and tokens > budget:
+        items.pop(0)
+        dropped += 1
+        text = "\n".join(f"- {item}" for item in items)
+        tokens = estimate_tokens(text)
+    levels = [DROPPED] * dropped + [FULL] * len(items)
+    record(name, levels, tokens, full_tokens)
+    return text
+
+
+def record(name: str, levels: List[int], tokens: int, full_tokens: int) -> None:
+    """
+    프롬프트 한 번의 크기를 telemetry(/metrics)에 기록한다. levels는 항목(턴/피드백)별 압축 단계,
+    full_tokens는 압축 전 전체 렌더링의 추정 토큰 수.
+    """
+    telemetry.record_prompt(
+        name,
+        tokens=tokens,
+        full_tokens=full_tokens,
+        compacted=sum(1 for level in levels if FULL < level < DROPPED),
+        dropped=sum(1 for level in levels if level >= DROPPED),
+    )
@@ -0,0 +1,153 @@
+import hashlib
+import random
+import re
+import unicodedata
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.config import QUESTION_BANK_CACHE_TTL, QUESTION_BANK_ENABLED
+from app.core.cache import TTLCache
+from app.db.repository import get_repository, job_doc_id
+
+# (company, position) -> 질문 은행 문서 목록
+_bank_cache = TTLCache(maxsize=256, ttl=QUESTION_BANK_CACHE_TTL)
+
+
+def normalize_text(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "")
+    text = re.sub(r"\s+", " ", text).strip()
+    return text.rstrip("?.!。 ").lower()
+
+
+def persona_key(persona: str) -> str:
+    return hashlib.sha1(normalize_text(persona).encode("utf-8")).hexdigest()[:12]
+
+
+def bank_doc_id(company: str, position: str, persona: str) -> str:
+    # jobs 컬렉션 문서 id와 같은 (회사, 직무) 형식 뒤에 페르소나 키를 붙인다
+    return f"{job_doc_id(company, position)}#{persona_key(persona)}"
+
+
+def dedupe_questions(questions: List[Dict]) -> List[Dict]:
+    seen = set()
+    result = []
+    for q in questions:
+        text = q.get("question", "") if isinstance(q, dict) else ""
+        key = normalize_text(text)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        result.append({"question": text})
+    return result
+
+
+def get_bank_entries(company: str, position: str) -> List[Dict]:
+    """
+    (회사, 직무)에 대해 사전 생성된 질문 은행 문서들을 반환한다. 메모리 캐시 우선.
+    """
+    cache_key = (company, position)
+    entries = _bank_cache.get(cache_key)
+    if entries is not None:
+        return entries
+    entries = get_repository().get_bank_entries(company, position)
+    _bank_cache.set(cache_key, entries)
+    return entries
+
+
+def sample_persona(company: str, position: str) -> Optional[Dict]:
+    """
+    질문 은행에 등록된 페르소나 템플릿 중 하나를 무작위로 반환한다. 없으면 None.
+    """
+    if not QUESTION_BANK_ENABLED:
+        return None
+    entries = [e for e in get_bank_entries(company, position) if e.get("persona")]
+    if not entries:
+        return None
+    entry = random.choice(entries)
+    return {
+        "persona": entry.get("persona", ""),
+        "persona_name": entry.get("persona_name", ""),
+        "department": entry.get("department", ""),
+    }
+
+
+def sample_questions(
+    company: str, position: str, persona: str, num_questions: int
+) -> Optional[List[Dict]]:
+    """
+    (회사, 직무, 페르소나)에 해당하는 질문 은행에서 중복 없이 num_questions개를 무작위 추출한다.
+    은행이 없거나 질문 수가 모자라면 None을 반환하고, 호출부는 LLM 생성으로 대체한다.
+    """
+    if not QUESTION_BANK_ENABLED:
+        return None
+    key = persona_key(persona)
+    for entry in get_bank_entries(company, position):
+        if entry.get("persona_key") != key:
+            continue
+        pool = dedupe_questions(entry.get("questions", []))
+        if len(pool) < num_questions:
+            return None
+        return random.sample(pool, num_questions)
+    return None
+
+
+def save_bank_entry(
+    company: str, position: str, persona_dict: Dict, questions: List[Dict]
+) -> str:
+    persona = persona_dict.get("persona", "")
+    doc_id = bank_doc_id(company, position, persona)
+    get_repository().save_bank_entry(
+        doc_id,
+        {
+            "company": company,
+            "position": position,
+            "persona": persona,
+            "persona_key": persona_key(persona),
+            "persona_name": persona_dict.get("persona_name", ""),
+            "department": persona_dict.get("department", ""),
+            "questions": dedupe_questions(questions),
+            "updated_at": datetime.now(timezone.utc),
+        }
+    )
+    _bank_cache.pop((company, position))
+    return doc_id
+
+
+def prefill(num_personas: int = 2, num_questions: int = 30) -> List[str]:
+    """
+    jobs 컬렉션의 모든 (회사, 직무) 문서에 대해 페르소나 템플릿과 질문 풀을 미리 생성한다.
+    오프라인 배치용: python -m app.services.question_bank
+    """
+    from app.services import llm_service, rag
+
+    saved = []
+    for job_id, rag_info in get_repository().list_jobs():
+        match = re.match(r"^\((.*), (.*)\)$", job_id)
+        if not match:
+            continue
+        company, position = match.group(1), match.group(2)
+        user_info = {"company": company, "position": position}
+        keywords = rag.get_top_keywords_by_category(user_info)
+        for _ in range(num_personas):
+            persona_dict = llm_service.generate_persona(rag_info, company, position)
+            if not persona_dict.get("persona"):
+                continue
+            questions = llm_service.generate_questions(
+                persona_dict["persona"], keywords, user_info, rag_info, num_questions
+            )
+            if not questions:
+                continue
+            doc_id = save_bank_entry(company, position, persona_dict, questions)
+            print("question_bank saved", doc_id, len(questions))
+            saved.append(doc_id)
+    return saved
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--personas", type=int, default=2)
+    parser.add_argument("--questions", type=int, default=30)
+    args = parser.parse_args()
+    prefill(num_personas=args.personas, num_questions=args.questions)
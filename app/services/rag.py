@@ -1,18 +1,30 @@
 import asyncio
+import hashlib
 import json
 import os
 import random
+import re
+import unicodedata
+from functools import lru_cache
 from typing import Dict, List, Sequence
 
 from dotenv import load_dotenv
-from litellm import rerank
+from litellm import arerank
+
+from app.config import KEYWORD_CACHE_SIZE, KEYWORD_CACHE_TTL
+from app.core.cache import TTLCache
+from app.services import keyword_index
 
 load_dotenv()
 
 JINA_MODEL = "jina_ai/jina-reranker-v2-base-multilingual"
 JINA_API_KEY = os.getenv("JINA_AI_API_KEY")
 
+# 정규화된 user_text 해시 -> 카테고리별 후보 키워드
+_candidates_cache = TTLCache(maxsize=KEYWORD_CACHE_SIZE, ttl=KEYWORD_CACHE_TTL)
+
 
+@lru_cache(maxsize=4)
 def load_keywords(
     json_path: str = "data/extracted_keywords.json",
 ) -> Dict[str, Sequence[str]]:
@@ -20,54 +32,115 @@ def load_keywords(
         return json.load(f)
 
 
-def get_top_keywords_by_category(
-    user_info: dict, top_n: int = 3
-) -> Dict[str, List[str]]:
+def _normalize_query(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = re.sub(r"[^\w]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _cache_key(user_text: str) -> str:
+    return hashlib.sha256(_normalize_query(user_text).encode("utf-8")).hexdigest()
+
+
+def _parse_rerank_response(response) -> List[str]:
+    results = None
+    if hasattr(response, "results"):
+        results = response.results
+    elif isinstance(response, dict) and "results" in response:
+        results = response["results"]
+    else:
+        results = []
+    if results is None:
+        results = []
+    top_keywords = []
+    for item in results:
+        if isinstance(item, dict):
+            if (
+                "document" in item
+                and isinstance(item["document"], dict)
+                and "text" in item["document"]
+            ):
+                top_keywords.append(item["document"]["text"])
+        elif hasattr(item, "document") and hasattr(item.document, "text"):
+            top_keywords.append(item.document.text)
+    return top_keywords
+
+
+async def _rerank_candidates_async(user_text: str) -> Dict[str, List[str]]:
+    """
+    Jina rerank API로 카테고리별 상위 10개 키워드 후보를 동시에 구한다.
+    """
     if not JINA_API_KEY:
         raise RuntimeError("JINA_AI_API_KEY 환경변수가 설정되어 있지 않습니다.")
     os.environ["JINA_AI_API_KEY"] = JINA_API_KEY
     data = load_keywords()
-    # dict의 value들을 모두 문자열로 변환 후 공백으로 이어붙임
-    user_text = " ".join(str(v) for v in user_info.values() if v)
-    result = {}
-    for category, keywords in data.items():
+
+    async def rerank_category(keywords: Sequence[str]) -> List[str]:
         if not keywords:
-            result[category] = []
-            continue
-        response = rerank(
+            return []
+        response = await arerank(
             model=JINA_MODEL,
             query=user_text,
             documents=list(keywords),
             top_n=10,  # 상위 10개까지 자름
         )
-        if asyncio.iscoroutine(response):
-            response = asyncio.run(response)
-        results = None
-        if hasattr(response, "results"):
-            results = response.results
-        elif isinstance(response, dict) and "results" in response:
-            results = response["results"]
-        else:
-            results = []
-        if results is None:
-            results = []
-        top_keywords = []
-        for item in results:
-            if isinstance(item, dict):
-                if (
-                    "document" in item
-                    and isinstance(item["document"], dict)
-                    and "text" in item["document"]
-                ):
-                    top_keywords.append(item["document"]["text"])
-            elif hasattr(item, "document") and hasattr(item.document, "text"):
-                top_keywords.append(item.document.text)
-        if len(top_keywords) > 3:
-            top_keywords = random.sample(top_keywords, 3)
+        return _parse_rerank_response(response)
+
+    categories = list(data.keys())
+    ranked = await asyncio.gather(
+        *[rerank_category(data[category]) for category in categories]
+    )
+    return dict(zip(categories, ranked))
+
+
+async def get_keyword_candidates_async(user_text: str) -> Dict[str, List[str]]:
+    """
+    카테고리별 상위 10개 후보. 같은(정규화 기준) 텍스트는 캐시에서 반환한다.
+    """
+    key = _cache_key(user_text)
+    candidates = _candidates_cache.get(key)
+    if candidates is not None:
+        return candidates
+    # 사전 생성된 로컬 임베딩 인덱스가 있으면 rerank API 대신 사용
+    index = keyword_index.get_index()
+    if index is not None:
+        candidates = await asyncio.to_thread(index.search, user_text, 10)
+    else:
+        candidates = await _rerank_candidates_async(user_text)
+    _candidates_cache.set(key, candidates)
+    return candidates
+
+
+def _sample_keywords(
+    candidates: Dict[str, List[str]], top_n: int
+) -> Dict[str, List[str]]:
+    result = {}
+    for category, top_keywords in candidates.items():
+        if len(top_keywords) > top_n:
+            top_keywords = random.sample(top_keywords, top_n)
         result[category] = top_keywords
     return result
 
 
+async def get_top_keywords_by_category_async(
+    user_info: dict, top_n: int = 3
+) -> Dict[str, List[str]]:
+    # dict의 value들을 모두 문자열로 변환 후 공백으로 이어붙임
+    user_text = " ".join(str(v) for v in user_info.values() if v)
+    candidates = await get_keyword_candidates_async(user_text)
+    return _sample_keywords(candidates, top_n)
+
+
+def get_top_keywords_by_category(
+    user_info: dict, top_n: int = 3
+) -> Dict[str, List[str]]:
+    """
+    오프라인 배치(question_bank.prefill)/CLI 전용 동기 진입점. 호출할 때마다 이벤트 루프를 새로 만들므로
+    API 핸들러에서는 get_top_keywords_by_category_async를 await한다.
+    """
+    return asyncio.run(get_top_keywords_by_category_async(user_info, top_n))
+
+
 if __name__ == "__main__":
     # 테스트용 사용자 정보 dict 예시
     user_info = {
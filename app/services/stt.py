@@ -0,0 +1,276 @@
+import asyncio
+import io
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import speech_recognition as sr
+
+from app.config import (
+    STT_BACKEND,
+    STT_MAX_QUEUE,
+    STT_OFFLINE_TEXT,
+    STT_POOL_MODE,
+    STT_STREAM_SAMPLE_RATE,
+    STT_WORKERS,
+)
+from app.services.vad import EnergyVAD
+
+
+class STTBusyError(Exception):
+    """워커와 대기열이 모두 찬 경우 발생 (backpressure)"""
+
+
+class STTBackend(ABC):
+    """
+    WAV 바이트를 받아 전사 텍스트를 반환하는 STT 엔진 인터페이스.
+    워커 스레드/프로세스에서 호출되므로 블로킹 호출이어도 되고, 실패 시 빈 문자열을 반환한다.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def transcribe(self, wav_bytes: bytes) -> str:
+        ...
+
+    def _record(self, wav_bytes: bytes):
+        recognizer = sr.Recognizer()
+        with sr.AudioFile(io.BytesIO(wav_bytes)) as source:
+            audio_data = recognizer.record(source)
+        return recognizer, audio_data
+
+
+class GoogleWebSpeechBackend(STTBackend):
+    """
+    클라이언트가 보낸 WAV(PCM s16le, mono, 16kHz 권장)를 그대로 Google Web Speech API(ko-KR)로 전사.
+    """
+
+    name = "google"
+
+    def __init__(self, language: str = "ko-KR"):
+        self.language = language
+
+    def transcribe(self, wav_bytes: bytes) -> str:
+        try:
+            recognizer, audio_data = self._record(wav_bytes)
+            text = recognizer.recognize_google(
+                audio_data, language=self.language)
+            print("stt_text", text)
+            return text.strip()
+        except sr.UnknownValueError:
+            print("stt_unknown_error")
+            return ""
+        except Exception as e:
+            print("stt_error", e)
+            return ""
+
+
+class OfflineBackend(STTBackend):
+    """
+    네트워크/모델 없이 동작하는 결정적 엔진. 로컬 개발/테스트/부하 테스트용.
+    VAD로 찾은 발화마다 고정 문장(STT_OFFLINE_TEXT)을 반환하고, 발화가 없으면 빈 문자열을 반환한다.
+    """
+
+    name = "offline"
+
+    def __init__(self, text: str = STT_OFFLINE_TEXT):
+        self.text = text
+
+    def transcribe(self, wav_bytes: bytes) -> str:
+        try:
+            with wave.open(io.BytesIO(wav_bytes), "rb") as wav:
+                vad = EnergyVAD(sample_rate=wav.getframerate())
+                pcm = wav.readframes(wav.getnframes())
+        except (wave.Error, EOFError, ValueError) as e:
+            print("stt_error", e)
+            return ""
+        segments = vad.feed(pcm)
+        tail = vad.flush()
+        if tail:
+            segments.append(tail)
+        return " ".join(self.text for _ in segments)
+
+
+_backends: Dict[str, Callable[[], STTBackend]] = {
+    GoogleWebSpeechBackend.name: GoogleWebSpeechBackend,
+    OfflineBackend.name: OfflineBackend,
+}
+
+
+def register_backend(name: str, factory: Callable[[], STTBackend]) -> None:
+    _backends[name] = factory
+
+
+def create_backend(name: str = STT_BACKEND) -> STTBackend:
+    if name not in _backends:
+        raise ValueError(f"알 수 없는 STT 백엔드: {name}")
+    return _backends[name]()
+
+
+def _run_backend(backend: STTBackend, wav_bytes: bytes) -> str:
+    # 프로세스 풀에서도 pickle 가능하도록 모듈 최상위 함수로 둔다
+    return backend.transcribe(wav_bytes)
+
+
+class STTWorkerPool:
+    """
+    STT를 이벤트 루프 밖의 스레드/프로세스 풀에서 실행한다.
+    실행 중 + 대기 요청이 workers + max_queue를 넘으면 STTBusyError로 즉시 거절한다.
+    """
+
+    def __init__(
+        self,
+        backend: STTBackend,
+        workers: int = STT_WORKERS,
+        max_queue: int = STT_MAX_QUEUE,
+        mode: str = STT_POOL_MODE,
+    ):
+        self.backend = backend
+        self.workers = workers
+        self.max_queue = max_queue
+        self.mode = mode
+        if mode == "process":
+            self._executor: Executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="stt")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._latency_total = 0.0
+
+    async def transcribe(self, wav_bytes: bytes) -> str:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise STTBusyError()
+            self._pending += 1
+        start = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(
+                self._executor, _run_backend, self.backend, wav_bytes)
+            with self._lock:
+                self.completed += 1
+            return text
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._latency_total += time.monotonic() - start
+
+    def stats(self) -> dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "backend": self.backend.name,
+                "mode": self.mode,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": min(self._pending, self.workers),
+                "queue_depth": max(0, self._pending - self.workers),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_latency": round(self._latency_total / finished, 4) if finished else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[STTWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> STTWorkerPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = STTWorkerPool(create_backend())
+    return _pool
+
+
+def set_pool(pool: Optional[STTWorkerPool]) -> None:
+    """
+    테스트 등에서 다른 백엔드의 풀로 교체할 때 사용.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool is not pool:
+            _pool.shutdown()
+        _pool = pool
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = STT_STREAM_SAMPLE_RATE) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buf.getvalue()
+
+
+class StreamingTranscriber:
+    """
+    스트리밍 PCM 프레임을 VAD로 발화 단위로 나누고, 발화가 끝날 때마다 바로 전사를 시작한다.
+    on_partial(text)은 각 발화 전사가 끝나는 대로 호출되며, finish()는 전체 답변 텍스트를 반환한다.
+    """
+
+    def __init__(
+        self,
+        pool: STTWorkerPool,
+        sample_rate: int = STT_STREAM_SAMPLE_RATE,
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None,
+        vad: Optional[EnergyVAD] = None,
+    ):
+        self.pool = pool
+        self.sample_rate = sample_rate
+        self.on_partial = on_partial
+        self.vad = vad or EnergyVAD(sample_rate=sample_rate)
+        self._tasks: List[asyncio.Task] = []
+        self._results: Dict[int, str] = {}
+
+    def feed(self, pcm: bytes) -> None:
+        for segment in self.vad.feed(pcm):
+            self._submit(segment)
+
+    def _submit(self, segment: bytes) -> None:
+        index = len(self._tasks)
+        self._tasks.append(asyncio.create_task(
+            self._transcribe(index, segment)))
+
+    async def _transcribe(self, index: int, segment: bytes) -> None:
+        try:
+            text = await self.pool.transcribe(pcm_to_wav(segment, self.sample_rate))
+        except STTBusyError:
+            text = ""
+        self._results[index] = text
+        if text and self.on_partial is not None:
+            await self.on_partial(text)
+
+    def text(self) -> str:
+        return " ".join(
+            self._results[i] for i in sorted(self._results) if self._results[i]
+        )
+
+    async def finish(self) -> str:
+        tail = self.vad.flush()
+        if tail:
+            self._submit(tail)
+        await asyncio.gather(*self._tasks)
+        return self.text()
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
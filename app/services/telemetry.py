@@ -0,0 +1,269 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Tuple
+
+# 초 단위 지연 시간 히스토그램 구간
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 40.0)
+# 프롬프트 추정 토큰 수 히스토그램 구간
+PROMPT_TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+
+_function: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "llm_function", default="ask_llm")
+_session: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "llm_session", default=None)
+
+
+def instrumented(name: str):
+    """
+    LLM을 호출하는 함수에 붙여, 그 안에서 일어난 ask_llm 호출을 name 함수의 지표로 기록한다.
+    동기/비동기 함수 모두 지원한다.
+    """
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                token = _function.set(name)
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    _function.reset(token)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _function.set(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _function.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def bind_session(session_id: Optional[str]) -> None:
+    """
+    현재 컨텍스트(요청/소켓 태스크와 거기서 만든 태스크)의 LLM 비용을 session_id에 합산한다.
+    """
+    _session.set(session_id)
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+_lock = threading.Lock()
+_latency: Dict[Tuple[str, str], Histogram] = {}
+_requests: Dict[Tuple[str, str, str], int] = defaultdict(int)
+_tokens: Dict[Tuple[str, str, str], int] = defaultdict(int)
+_cost: Dict[Tuple[str, str], float] = defaultdict(float)
+_retries: Dict[Tuple[str, str], int] = defaultdict(int)
+_cache_hits: Dict[str, int] = defaultdict(int)
+_prompt_tokens: Dict[str, Histogram] = {}
+_prompt_saved_tokens: Dict[str, int] = defaultdict(int)
+_prompt_items: Dict[Tuple[str, str], int] = defaultdict(int)
+# 아직 세션 문서에 반영하지 않은 세션별 사용량
+_session_usage: Dict[str, dict] = {}
+
+
+def _usage_tokens(response) -> Tuple[int, int]:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return 0, 0
+    prompt = getattr(usage, "prompt_tokens", None)
+    completion = getattr(usage, "completion_tokens", None)
+    if isinstance(usage, dict):
+        prompt, completion = usage.get("prompt_tokens"), usage.get("completion_tokens")
+    return int(prompt or 0), int(completion or 0)
+
+
+def record_attempt(
+    model: str,
+    latency: float,
+    outcome: str,
+    response=None,
+    cost: float = 0.0,
+    retry: bool = False,
+) -> None:
+    """
+    LLM 요청 한 번(재시도 포함 각 시도)을 기록한다.
+    outcome: ok | parse_failure | timeout | error
+    """
+    function = _function.get()
+    session_id = _session.get()
+    prompt_tokens, completion_tokens = _usage_tokens(response)
+    with _lock:
+        _latency.setdefault((function, model), Histogram()).observe(latency)
+        _requests[(function, model, outcome)] += 1
+        _tokens[(function, model, "prompt")] += prompt_tokens
+        _tokens[(function, model, "completion")] += completion_tokens
+        _cost[(function, model)] += cost
+        if retry:
+            _retries[(function, model)] += 1
+        if session_id:
+            usage = _session_usage.setdefault(
+                session_id, {"cost": 0.0, "requests": 0, "tokens": 0, "by_function": defaultdict(float)})
+            usage["cost"] += cost
+            usage["requests"] += 1
+            usage["tokens"] += prompt_tokens + completion_tokens
+            usage["by_function"][function] += cost
+
+
+def record_cache_hit() -> None:
+    with _lock:
+        _cache_hits[_function.get()] += 1
+
+
+def record_prompt(name: str, tokens: int, full_tokens: int, compacted: int, dropped: int) -> None:
+    """
+    예산에 맞춰 만든 프롬프트 한 번의 크기를 기록한다.
+    full_tokens는 압축 전 추정 토큰 수, compacted/dropped는 줄이거나 뺀 항목(턴/피드백) 수.
+    """
+    with _lock:
+        _prompt_tokens.setdefault(name, Histogram(PROMPT_TOKEN_BUCKETS)).observe(tokens)
+        _prompt_saved_tokens[name] += max(0, full_tokens - tokens)
+        _prompt_items[(name, "compacted")] += compacted
+        _prompt_items[(name, "dropped")] += dropped
+
+
+def pop_session_usage(session_id: str) -> Optional[dict]:
+    """
+    세션 문서에 아직 반영하지 않은 사용량(증가분)을 꺼낸다. 없으면 None.
+    """
+    with _lock:
+        usage = _session_usage.pop(session_id, None)
+    if usage is None:
+        return None
+    return {**usage, "by_function": dict(usage["by_function"])}
+
+
+def flush_session(session_id: str) -> None:
+    """
+    세션별 LLM 비용 증가분을 세션 문서의 llm_usage 필드에 더한다. (블로킹, 스레드에서 호출)
+    """
+    from app.services import firebase_crud
+
+    usage = pop_session_usage(session_id)
+    if usage is None:
+        return
+    try:
+        firebase_crud.add_session_llm_usage(session_id, usage)
+    except Exception as e:
+        print("telemetry flush_session error", session_id, e)
+
+
+async def flush_session_async(session_id: str) -> None:
+    """
+    flush_session의 비동기 버전 (소켓/백그라운드 작업용)
+    """
+    from app.services import firebase_crud_async
+
+    usage = pop_session_usage(session_id)
+    if usage is None:
+        return
+    try:
+        await firebase_crud_async.add_session_llm_usage(session_id, usage)
+    except Exception as e:
+        print("telemetry flush_session error", session_id, e)
+
+
+def reset() -> None:
+    with _lock:
+        _latency.clear()
+        _requests.clear()
+        _tokens.clear()
+        _cost.clear()
+        _retries.clear()
+        _cache_hits.clear()
+        _prompt_tokens.clear()
+        _prompt_saved_tokens.clear()
+        _prompt_items.clear()
+        _session_usage.clear()
+
+
+def _labels(**labels) -> str:
+    escaped = []
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        escaped.append(f'{key}="{value}"')
+    return "{" + ",".join(escaped) + "}"
+
+
+def _histogram_lines(metric: str, hist: Histogram, **labels) -> list:
+    lines = [
+        f"{metric}_bucket{_labels(**labels, le=bound)} {bucket_count}"
+        for bound, bucket_count in zip(hist.buckets, hist.counts)
+    ]
+    lines.append(f"{metric}_bucket{_labels(**labels, le='+Inf')} {hist.count}")
+    lines.append(f"{metric}_sum{_labels(**labels)} {hist.sum}")
+    lines.append(f"{metric}_count{_labels(**labels)} {hist.count}")
+    return lines
+
+
+def render_prometheus() -> str:
+    """
+    Prometheus 텍스트 노출 형식(0.0.4)으로 지표를 만든다.
+    """
+    lines = []
+    with _lock:
+        lines += [
+            "# HELP llm_request_duration_seconds LLM request latency per attempt",
+            "# TYPE llm_request_duration_seconds histogram",
+        ]
+        for (function, model), hist in sorted(_latency.items()):
+            lines += _histogram_lines(
+                "llm_request_duration_seconds", hist, function=function, model=model)
+        lines += ["# HELP llm_requests_total LLM requests by outcome",
+                  "# TYPE llm_requests_total counter"]
+        for (function, model, outcome), value in sorted(_requests.items()):
+            lines.append(
+                f"llm_requests_total{_labels(function=function, model=model, outcome=outcome)} {value}")
+        lines += ["# HELP llm_tokens_total LLM tokens used",
+                  "# TYPE llm_tokens_total counter"]
+        for (function, model, kind), value in sorted(_tokens.items()):
+            lines.append(
+                f"llm_tokens_total{_labels(function=function, model=model, type=kind)} {value}")
+        lines += ["# HELP llm_cost_usd_total LLM cost in USD (litellm completion_cost)",
+                  "# TYPE llm_cost_usd_total counter"]
+        for (function, model), value in sorted(_cost.items()):
+            lines.append(
+                f"llm_cost_usd_total{_labels(function=function, model=model)} {value}")
+        lines += ["# HELP llm_retries_total LLM retry attempts",
+                  "# TYPE llm_retries_total counter"]
+        for (function, model), value in sorted(_retries.items()):
+            lines.append(
+                f"llm_retries_total{_labels(function=function, model=model)} {value}")
+        lines += ["# HELP llm_cache_hits_total LLM responses served from cache",
+                  "# TYPE llm_cache_hits_total counter"]
+        for function, value in sorted(_cache_hits.items()):
+            lines.append(f"llm_cache_hits_total{_labels(function=function)} {value}")
+        lines += ["# HELP llm_prompt_tokens Estimated prompt tokens after budget compaction",
+                  "# TYPE llm_prompt_tokens histogram"]
+        for name, hist in sorted(_prompt_tokens.items()):
+            lines += _histogram_lines("llm_prompt_tokens", hist, prompt=name)
+        lines += ["# HELP llm_prompt_saved_tokens_total Estimated prompt tokens removed by compaction",
+                  "# TYPE llm_prompt_saved_tokens_total counter"]
+        for name, value in sorted(_prompt_saved_tokens.items()):
+            lines.append(f"llm_prompt_saved_tokens_total{_labels(prompt=name)} {value}")
+        lines += ["# HELP llm_prompt_items_total Prompt items (turns/feedbacks) shortened or dropped",
+                  "# TYPE llm_prompt_items_total counter"]
+        for (name, state), value in sorted(_prompt_items.items()):
+            lines.append(f"llm_prompt_items_total{_labels(prompt=name, state=state)} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,278 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import shutil
+from typing import AsyncIterator, Iterable, Optional
+
+import edge_tts
+from pydub import AudioSegment
+from pydub.effects import speedup
+
+from app.config import (
+    TTS_CACHE_DIR,
+    TTS_CACHE_MEMORY_SIZE,
+    TTS_CHUNK_BYTES,
+    TTS_PRERENDER_CONCURRENCY,
+)
+from app.core.cache import TTLCache
+
+TTS_VOICE = "ko-KR-HyunsuMultilingualNeural"
+SPEED_UP_RATE = 1.2
+SAMPLE_RATE = 24000
+CHANNELS = 1
+
+# 합성 결과 PCM 캐시 (메모리 LRU, 디스크가 원본)
+_pcm_cache = TTLCache(maxsize=TTS_CACHE_MEMORY_SIZE)
+
+
+def _decoder() -> str:
+    # ffmpeg가 있으면 스트리밍 디코딩(atempo), 없으면 pydub 일괄 디코딩(speedup)
+    return "ffmpeg" if shutil.which("ffmpeg") else "pydub"
+
+
+def cache_key(text: str, decoder: str) -> str:
+    # 합성 결과에 영향을 주는 값을 모두 키에 포함 (디코딩 경로마다 배속 방식이 달라 결과도 다름)
+    payload = json.dumps(
+        [text, TTS_VOICE, SPEED_UP_RATE, SAMPLE_RATE, decoder], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(TTS_CACHE_DIR, key[:2], f"{key}.pcm")
+
+
+def _read_pcm_file(path: str) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _write_pcm_file(path: str, pcm: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pcm)
+    os.replace(tmp_path, path)
+
+
+async def load_cached_pcm(text: str, decoder: Optional[str] = None) -> Optional[bytes]:
+    key = cache_key(text, decoder or _decoder())
+    pcm = _pcm_cache.get(key)
+    if pcm is not None:
+        return pcm
+    pcm = await asyncio.to_thread(_read_pcm_file, _cache_path(key))
+    if pcm:
+        _pcm_cache.set(key, pcm)
+        return pcm
+    return None
+
+
+async def store_pcm(text: str, pcm: bytes, decoder: Optional[str] = None) -> None:
+    key = cache_key(text, decoder or _decoder())
+    _pcm_cache.set(key, pcm)
+    try:
+        await asyncio.to_thread(_write_pcm_file, _cache_path(key), pcm)
+    except OSError as e:
+        print("tts_cache write_error", e)
+
+
+async def _edge_tts_mp3(text: str) -> AsyncIterator[bytes]:
+    # edge-tts를 통해 MP3 바이트를 생성되는 대로 반환
+    communicate = edge_tts.Communicate(text, TTS_VOICE)
+    async for chunk in communicate.stream():
+        if chunk.get("type") == "audio" and chunk.get("data"):
+            yield chunk["data"]
+
+
+def _decode_mp3(mp3_bytes: bytes) -> bytes:
+    """
+    MP3 -> PCM(SAMPLE_RATE, mono, s16le) 변환 및 배속 처리.
+    """
+    seg = AudioSegment.from_file(io.BytesIO(mp3_bytes), format="mp3")
+
+    try:
+        seg = speedup(seg, playback_speed=SPEED_UP_RATE)
+    except Exception:
+        # speedup 실패 시 프레임레이트 트릭으로 대체 가속
+        seg = seg._spawn(seg.raw_data, overrides={
+            "frame_rate": int(seg.frame_rate * SPEED_UP_RATE)})
+
+    seg = seg.set_channels(CHANNELS).set_frame_rate(
+        SAMPLE_RATE).set_sample_width(2)
+    return seg.raw_data
+
+
+async def synthesize_pcm(text: str) -> bytes:
+    """
+    MP3 전체를 받은 뒤 한 번에 PCM으로 변환한다. 디코딩은 이벤트 루프 밖에서 수행.
+    """
+    mp3_buf = io.BytesIO()
+    async for data in _edge_tts_mp3(text):
+        mp3_buf.write(data)
+    return await asyncio.to_thread(_decode_mp3, mp3_buf.getvalue())
+
+
+async def _ffmpeg_pcm(text: str) -> AsyncIterator[bytes]:
+    """
+    edge-tts MP3 청크를 도착하는 즉시 ffmpeg에 넘겨 디코딩/배속/리샘플링된 PCM을 읽어온다.
+    ffmpeg가 비정상 종료하면 RuntimeError를 던져 잘린 결과가 캐시되지 않게 한다.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-f", "mp3", "-i", "pipe:0",
+        "-filter:a", f"atempo={SPEED_UP_RATE}",
+        "-f", "s16le", "-acodec", "pcm_s16le",
+        "-ac", str(CHANNELS), "-ar", str(SAMPLE_RATE),
+        "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    async def feed():
+        try:
+            async for data in _edge_tts_mp3(text):
+                proc.stdin.write(data)
+                await proc.stdin.drain()
+        finally:
+            proc.stdin.close()
+
+    feeder = asyncio.create_task(feed())
+    try:
+        while True:
+            data = await proc.stdout.read(TTS_CHUNK_BYTES)
+            if not data:
+                break
+            yield data
+        # edge-tts 오류를 호출부로 전달
+        await feeder
+        if await proc.wait() != 0:
+            stderr = (await proc.stderr.read()).decode("utf-8", "replace").strip()
+            raise RuntimeError(f"ffmpeg exited with {proc.returncode}: {stderr}")
+    finally:
+        if not feeder.done():
+            feeder.cancel()
+        if proc.returncode is None:
+            proc.kill()
+        await proc.wait()
+
+
+async def rechunk(
+    source: AsyncIterator[bytes], chunk_bytes: int = TTS_CHUNK_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    임의 크기의 PCM 조각을 고정 크기 청크로 다시 나눈다. 마지막 청크만 짧을 수 있다.
+    """
+    buf = bytearray()
+    async for data in source:
+        buf.extend(data)
+        while len(buf) >= chunk_bytes:
+            yield bytes(buf[:chunk_bytes])
+            del buf[:chunk_bytes]
+    if buf:
+        yield bytes(buf)
+
+
+async def _buffered_pcm(text: str) -> AsyncIterator[bytes]:
+    pcm_bytes = await synthesize_pcm(text)
+    if pcm_bytes:
+        yield pcm_bytes
+
+
+def _synthesis_source(text: str, decoder: str) -> AsyncIterator[bytes]:
+    # ffmpeg가 없으면 전체 합성 후 나눠 보내는 방식으로 대체
+    if decoder == "pydub":
+        return _buffered_pcm(text)
+    return _ffmpeg_pcm(text)
+
+
+async def stream_pcm(text: str) -> AsyncIterator[bytes]:
+    """
+    텍스트를 합성하면서 고정 크기 PCM 청크를 순서대로 반환한다.
+    캐시에 있으면 합성 없이 바로 반환하고, 끝까지 합성한 결과는 캐시에 저장한다.
+    """
+    decoder = _decoder()
+    pcm = await load_cached_pcm(text, decoder)
+    if pcm is not None:
+        for i in range(0, len(pcm), TTS_CHUNK_BYTES):
+            yield pcm[i: i + TTS_CHUNK_BYTES]
+        return
+    collected = bytearray()
+    async for chunk in rechunk(_synthesis_source(text, decoder)):
+        collected.extend(chunk)
+        yield chunk
+    if collected:
+        await store_pcm(text, bytes(collected), decoder)
+
+
+async def prerender(texts: Iterable[str]) -> int:
+    """
+    캐시에 없는 문장을 백그라운드에서 미리 합성해 둔다. 새로 합성한 개수를 반환.
+    """
+    semaphore = asyncio.Semaphore(TTS_PRERENDER_CONCURRENCY)
+
+    async def render(text: str) -> bool:
+        async with semaphore:
+            if await load_cached_pcm(text) is not None:
+                return False
+            try:
+                async for _ in stream_pcm(text):
+                    pass
+                return True
+            except Exception as e:
+                print("tts_prerender error", e)
+                return False
+
+    unique_texts = [t for t in dict.fromkeys(texts) if t]
+    rendered = await asyncio.gather(*[render(t) for t in unique_texts])
+    return sum(rendered)
+
+
+class SpeechPrefetch:
+    """
+    stream_pcm을 미리 시작해 청크를 버퍼링한다.
+    stream()은 이미 받아 둔 청크부터 바로 보내고, 이후 청크는 합성되는 대로 이어서 보낸다.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._chunks = []
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._cond = asyncio.Condition()
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        try:
+            async for chunk in stream_pcm(self.text):
+                async with self._cond:
+                    self._chunks.append(chunk)
+                    self._cond.notify_all()
+        except Exception as e:
+            self._error = e
+        finally:
+            async with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        index = 0
+        while True:
+            async with self._cond:
+                await self._cond.wait_for(
+                    lambda: index < len(self._chunks) or self._done)
+                if index < len(self._chunks):
+                    chunk = self._chunks[index]
+                elif self._error is not None:
+                    raise self._error
+                else:
+                    return
+            index += 1
+            yield chunk
+
+    def cancel(self) -> None:
+        self._task.cancel()
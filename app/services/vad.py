@@ -0,0 +1,131 @@
+from collections import deque
+from typing import Any, List, Optional
+
+import numpy as np
+
+from app.config import (
+    STT_STREAM_SAMPLE_RATE,
+    VAD_END_SILENCE_MS,
+    VAD_ENERGY_THRESHOLD,
+)
+
+# 스트리밍 입력으로 허용하는 샘플레이트(Hz)
+SUPPORTED_SAMPLE_RATES = (8000, 16000, 24000, 48000)
+
+
+def parse_sample_rate(value: Any) -> Optional[int]:
+    """
+    클라이언트가 보낸 sample_rate를 정수로 변환한다. 지원하지 않는 값이면 None.
+    """
+    if isinstance(value, bool):
+        return None
+    try:
+        sample_rate = int(value)
+    except (TypeError, ValueError):
+        return None
+    if sample_rate != value and not isinstance(value, str):
+        # 16000.5 같은 소수는 거부
+        return None
+    return sample_rate if sample_rate in SUPPORTED_SAMPLE_RATES else None
+
+
+class EnergyVAD:
+    """
+    RMS 에너지 기반 음성 구간 검출기.
+    PCM s16le mono 바이트를 임의 크기로 받아 발화(utterance) 단위 PCM으로 잘라 반환한다.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = STT_STREAM_SAMPLE_RATE,
+        frame_ms: int = 30,
+        threshold: float = VAD_ENERGY_THRESHOLD,
+        end_silence_ms: int = VAD_END_SILENCE_MS,
+        min_speech_ms: int = 200,
+        pre_roll_ms: int = 150,
+        max_segment_ms: int = 15000,
+    ):
+        self.frame_bytes = int(sample_rate * frame_ms / 1000) * 2
+        if self.frame_bytes <= 0:
+            # 프레임 크기가 0이면 feed가 끝나지 않으므로 생성 단계에서 거부
+            raise ValueError(f"잘못된 VAD 설정: sample_rate={sample_rate}, frame_ms={frame_ms}")
+        self.frame_ms = frame_ms
+        self.threshold = threshold
+        self.end_silence_frames = max(1, end_silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_segment_frames = max(1, max_segment_ms // frame_ms)
+        self._pending = bytearray()
+        self._pre_roll = deque(maxlen=max(0, pre_roll_ms // frame_ms))
+        self._segment = bytearray()
+        self._in_speech = False
+        self._speech_frames = 0
+        self._segment_frames = 0
+        self._silence_frames = 0
+
+    def is_speech(self, frame: bytes) -> bool:
+        samples = np.frombuffer(frame, dtype="<i2").astype(np.float32)
+        if samples.size == 0:
+            return False
+        return float(np.sqrt(np.mean(samples * samples))) >= self.threshold
+
+    def feed(self, pcm: bytes) -> List[bytes]:
+        """
+        PCM을 추가하고, 이번 입력으로 끝난 발화들을 반환한다.
+        """
+        self._pending.extend(pcm)
+        segments = []
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[: self.frame_bytes])
+            del self._pending[: self.frame_bytes]
+            segment = self._process_frame(frame)
+            if segment:
+                segments.append(segment)
+        return segments
+
+    def _process_frame(self, frame: bytes) -> Optional[bytes]:
+        speech = self.is_speech(frame)
+        if not self._in_speech:
+            if not speech:
+                self._pre_roll.append(frame)
+                return None
+            # 발화 시작: 앞부분이 잘리지 않도록 직전 프레임을 함께 붙임
+            self._in_speech = True
+            for prev in self._pre_roll:
+                self._segment.extend(prev)
+            self._segment_frames = len(self._pre_roll)
+            self._pre_roll.clear()
+        self._segment.extend(frame)
+        self._segment_frames += 1
+        if speech:
+            self._speech_frames += 1
+            self._silence_frames = 0
+        else:
+            self._silence_frames += 1
+        if (
+            self._silence_frames >= self.end_silence_frames
+            or self._segment_frames >= self.max_segment_frames
+        ):
+            return self._finish_segment()
+        return None
+
+    def _finish_segment(self) -> Optional[bytes]:
+        segment = bytes(self._segment)
+        enough_speech = self._speech_frames >= self.min_speech_frames
+        self._segment = bytearray()
+        self._in_speech = False
+        self._speech_frames = 0
+        self._segment_frames = 0
+        self._silence_frames = 0
+        return segment if enough_speech else None
+
+    def flush(self) -> Optional[bytes]:
+        """
+        입력이 끝났을 때 진행 중이던 발화를 반환한다.
+        """
+        if self._pending and self._in_speech:
+            self._segment.extend(self._pending)
+        self._pending = bytearray()
+        self._pre_roll.clear()
+        if not self._in_speech:
+            return None
+        return self._finish_segment()
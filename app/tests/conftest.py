@@ -0,0 +1,76 @@
+import inspect
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import patch
+
+import pytest
+
+from app.services import llm_resilience, llm_service
+
+
+def fake_response(
+    content: str,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+):
+    """
+    litellm 응답 객체 대용. 토큰 수를 주면 usage도 채운다.
+    """
+    response = SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
+    if prompt_tokens is not None or completion_tokens is not None:
+        response.usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens or 0, completion_tokens=completion_tokens or 0)
+    return response
+
+
+class FakeLLM:
+    """
+    litellm.completion/acompletion 대신 handler(**kwargs)의 결과를 돌려주는 테스트용 LLM.
+    handler는 동기/비동기 함수 모두 가능하고, 호출 인자는 calls에 쌓인다.
+    """
+
+    response = staticmethod(fake_response)
+
+    def __init__(self):
+        self.calls = []
+        self.cost = 0.0
+        self.handler = lambda **kwargs: fake_response("{}")
+        self.backoff = None
+
+    def reply(self, *contents: str) -> None:
+        """
+        호출 순서대로 contents를 응답 본문으로 돌려준다.
+        """
+        responses = list(contents)
+        self.handler = lambda **kwargs: fake_response(responses.pop(0))
+
+    def completion(self, **kwargs):
+        self.calls.append(kwargs)
+        return self.handler(**kwargs)
+
+    async def acompletion(self, **kwargs):
+        self.calls.append(kwargs)
+        result = self.handler(**kwargs)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+@pytest.fixture
+def fake_llm():
+    """
+    LLM 호출을 FakeLLM으로 바꾸고, 비용은 fake_llm.cost로 고정, 재시도 대기는 0초로 만든다.
+    회로 차단기/카운터는 테스트 전후로 초기화한다.
+    """
+    fake = FakeLLM()
+    llm_resilience.reset()
+    with patch("litellm.completion", new=fake.completion), patch(
+        "litellm.acompletion", new=fake.acompletion
+    ), patch.object(
+        llm_service, "completion_cost", new=lambda *args, **kwargs: fake.cost
+    ), patch.object(llm_resilience, "backoff_delay", return_value=0.0) as backoff:
+        fake.backoff = backoff
+        yield fake
+    llm_resilience.reset()
@@ -0,0 +1,11 @@
+from app.services import audio_assets
+
+
+def test_load_all_decodes_registered_assets_once():
+    loaded = audio_assets.load_all()
+    assert loaded["retry_inform"] > 0
+    pcm = audio_assets.get_pcm("retry_inform")
+    # 24kHz mono s16le: 짝수 바이트, 재호출 시 같은 객체 반환
+    assert len(pcm) % 2 == 0
+    assert audio_assets.get_pcm("retry_inform") is pcm
+    assert audio_assets.get_pcm("unknown") is None
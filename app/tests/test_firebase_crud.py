@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from unittest.mock import MagicMock, patch
+
+from app.db import firestore as firestore_repo
+from app.services import firebase_crud
+
+
+def _fake_db(doc_data: dict):
+    db = MagicMock()
+    doc = MagicMock()
+    doc.exists = True
+    doc.to_dict.return_value = doc_data
+    db.collection.return_value.document.return_value.get.return_value = doc
+    return db
+
+
+@contextmanager
+def _use_firestore(db):
+    with patch.object(
+        firebase_crud, "get_repository", return_value=firestore_repo.FirestoreRepository()
+    ), patch.object(firestore_repo, "get_db", return_value=db):
+        yield
+
+
+def test_session_cache_read_through_and_invalidate():
+    """
+    세션 문서는 두 번째 조회부터 캐시에서 읽고, 쓰기 후에는 다시 Firestore에서 읽어야 한다.
+    """
+    firebase_crud._session_cache.clear()
+    db = _fake_db({"status": "ready"})
+    session_ref = db.collection.return_value.document.return_value
+    with _use_firestore(db):
+        assert firebase_crud.get_session_status("sid") == "ready"
+        assert firebase_crud.get_session("sid") == {"status": "ready"}
+        assert session_ref.get.call_count == 1
+
+        firebase_crud.update_session("sid", {"status": "chat_end"})
+        firebase_crud.get_session("sid")
+        assert session_ref.get.call_count == 2
+
+
+def test_create_session_warms_code_cache():
+    firebase_crud._code_cache.clear()
+    db = MagicMock()
+    db.collection.return_value.document.return_value.id = "new-sid"
+    req = firebase_crud.SessionCreateSchema(username="u", password="pw")
+    with _use_firestore(db), patch.object(
+        firebase_crud, "get_password_hash", return_value="hash"
+    ):
+        session_id, code = firebase_crud.create_session(req)
+        assert firebase_crud.get_session_id_by_code(code) == "new-sid"
+    # 코드 조회 쿼리는 실행되지 않아야 한다
+    db.collection.return_value.where.assert_not_called()
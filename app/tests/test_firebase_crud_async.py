@@ -0,0 +1,143 @@
+import asyncio
+import itertools
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from app.db import firestore as firestore_repo
+from app.models.schemas import InteractionLogSchema
+from app.services import firebase_crud, firebase_crud_async
+
+_ids = itertools.count(1)
+
+
+class _Snapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class _Document:
+    def __init__(self, store, path, doc_id):
+        self._store = store
+        self._path = path
+        self.id = doc_id
+
+    def collection(self, name):
+        return _Collection(self._store, f"{self._path}/{self.id}/{name}")
+
+    async def get(self):
+        self._store.reads += 1
+        return _Snapshot(self.id, self._store.docs.get(self._path, {}).get(self.id))
+
+    async def set(self, data):
+        self._store.docs.setdefault(self._path, {})[self.id] = dict(data)
+
+    async def update(self, data):
+        self._store.docs[self._path][self.id].update(data)
+
+
+class _Collection:
+    def __init__(self, store, path, filters=()):
+        self._store = store
+        self._path = path
+        self._filters = filters
+
+    def document(self, doc_id=None):
+        return _Document(self._store, self._path, doc_id or f"doc{next(_ids)}")
+
+    def where(self, filter):
+        condition = (filter.field_path, filter.value)
+        return _Collection(self._store, self._path, self._filters + (condition,))
+
+    def limit(self, _):
+        return self
+
+    async def stream(self):
+        for doc_id, data in list(self._store.docs.get(self._path, {}).items()):
+            if all(data.get(field) == value for field, value in self._filters):
+                yield _Snapshot(doc_id, data)
+
+
+class _Batch:
+    def __init__(self):
+        self._writes = []
+
+    def set(self, ref, data):
+        self._writes.append((ref, data))
+
+    async def commit(self):
+        for ref, data in self._writes:
+            await ref.set(data)
+
+
+class FakeAsyncFirestore:
+    """
+    테스트용 in-memory Firestore AsyncClient (firebase_crud_async가 쓰는 기능만 구현)
+    """
+
+    def __init__(self):
+        self.docs = {}
+        self.reads = 0
+
+    def collection(self, name):
+        return _Collection(self, name)
+
+    def batch(self):
+        return _Batch()
+
+
+@contextmanager
+def _use_firestore(db):
+    with patch.object(
+        firebase_crud_async, "get_async_repository",
+        return_value=firestore_repo.AsyncFirestoreRepository(),
+    ), patch.object(firestore_repo, "get_async_db", return_value=db):
+        yield
+
+
+def test_async_crud_shares_session_cache_with_sync_module():
+    """
+    비동기 조회로 채운 세션 캐시를 동기 모듈도 그대로 사용하고, 비동기 쓰기는 캐시를 무효화해야 한다.
+    """
+    firebase_crud._session_cache.clear()
+    firebase_crud._code_cache.clear()
+    db = FakeAsyncFirestore()
+    db.docs["sessions"] = {"sid": {"code": "ABC123", "status": "ready"}}
+
+    async def run():
+        session_id = await firebase_crud_async.get_session_id_by_code("ABC123")
+        first = await firebase_crud_async.get_session(session_id)
+        cached_sync = firebase_crud.get_session(session_id)
+        await firebase_crud_async.save_chat_end(session_id)
+        status = await firebase_crud_async.get_session_status(session_id)
+        return session_id, first, cached_sync, status
+
+    with _use_firestore(db), patch.object(
+        firestore_repo, "get_db", side_effect=AssertionError("sync client must not be used")
+    ):
+        session_id, first, cached_sync, status = asyncio.run(run())
+    assert session_id == "sid"
+    assert first == cached_sync == {"code": "ABC123", "status": "ready"}
+    assert status == "chat_end"
+    assert db.reads == 2
+    firebase_crud._session_cache.clear()
+    firebase_crud._code_cache.clear()
+
+
+def test_async_interactions_round_trip():
+    db = FakeAsyncFirestore()
+    logs = [InteractionLogSchema(turn=turn, question="q", answer="a") for turn in (1, 2)]
+
+    async def run():
+        ids = await firebase_crud_async.add_interactions("sid", logs)
+        return ids, await firebase_crud_async.get_interactions("sid")
+
+    with _use_firestore(db):
+        ids, stored = asyncio.run(run())
+    assert len(ids) == 2
+    assert sorted(log["turn"] for log in stored) == [1, 2]
+    assert all(log["created_at"] is not None for log in stored)
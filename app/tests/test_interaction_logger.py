@@ -0,0 +1,85 @@
+import asyncio
+from unittest.mock import patch
+
+from app.models.schemas import InteractionLogSchema
+from app.services import interaction_logger as logger_module
+from app.services.interaction_logger import InteractionLogger
+
+
+def test_logger_batches_by_size_and_flushes_on_close():
+    """
+    batch_size마다 한 번의 batched write로 저장하고, close_session에서 나머지를 모두 저장해야 한다.
+    """
+    calls = []
+
+    def fake_add_interactions(session_id, logs):
+        calls.append((session_id, [log.turn for log in logs]))
+        return [str(i) for i in range(len(logs))]
+
+    async def run():
+        logger = InteractionLogger(flush_interval=60, batch_size=2)
+        for turn in range(1, 3):
+            logger.add("sid", InteractionLogSchema(turn=turn, question="q", answer="a"))
+        await asyncio.sleep(0)
+        logger.add("sid", InteractionLogSchema(turn=3, question="q", answer="a"))
+        await logger.close_session("sid")
+        return logger
+
+    with patch.object(
+        logger_module.firebase_crud_async, "add_interactions", side_effect=fake_add_interactions
+    ):
+        logger = asyncio.run(run())
+    assert calls == [("sid", [1, 2]), ("sid", [3])]
+    assert logger.pending("sid") == 0
+
+
+def test_logger_requeues_failed_flush():
+    async def run():
+        logger = InteractionLogger(flush_interval=60, batch_size=10)
+        logger.add("sid", InteractionLogSchema(turn=1, question="q"))
+        ok = await logger.flush("sid")
+        return ok, logger.pending("sid")
+
+    with patch.object(logger_module.firebase_crud_async, "add_interactions", return_value=None):
+        ok, pending = asyncio.run(run())
+    assert ok is False
+    assert pending == 1
+
+
+def test_failed_size_flush_is_retried_by_timer():
+    """
+    크기 기준 flush가 실패해도 다음 add()를 기다리지 않고 타이머로 다시 저장해야 한다.
+    """
+    results = [None, ["1", "2"]]
+
+    async def run():
+        logger = InteractionLogger(flush_interval=0.01, batch_size=2)
+        for turn in range(1, 3):
+            logger.add("sid", InteractionLogSchema(turn=turn, question="q"))
+        await asyncio.sleep(0.1)
+        return logger.pending("sid")
+
+    with patch.object(
+        logger_module.firebase_crud_async, "add_interactions", side_effect=lambda *a: results.pop(0)
+    ) as add_interactions:
+        pending = asyncio.run(run())
+    assert pending == 0
+    assert add_interactions.call_count == 2
+
+
+def test_close_session_retries_then_reports_failure():
+    """
+    close_session은 짧게 기다리며 다시 시도하고, 끝내 실패하면 False를 반환하되 로그를 버리지 않아야 한다.
+    """
+    async def run(results):
+        logger = InteractionLogger(flush_interval=60, batch_size=10, close_retries=2, close_backoff=0.01)
+        logger.add("sid", InteractionLogSchema(turn=1, question="q"))
+        with patch.object(
+            logger_module.firebase_crud_async, "add_interactions", side_effect=results
+        ) as add_interactions:
+            ok = await logger.close_session("sid")
+        logger._cancel_timer("sid")
+        return ok, logger.pending("sid"), add_interactions.call_count
+
+    assert asyncio.run(run([None, None, ["1"]])) == (True, 0, 3)
+    assert asyncio.run(run([None, None, None])) == (False, 1, 3)
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from app.services import interview
+from app.services.interview import SpeculativeTurn, wait_logged
+
+LOW = [{"name": "기술 이해도", "score": 2, "feedback": "부족"}]
+HIGH = [{"name": "기술 이해도", "score": 5, "feedback": "좋음"}]
+
+
+def _run_turn(categories, followup, delay=0.0, wait=0.2):
+    calls = []
+    logged = []
+
+    async def fake_evaluate_with_followup(question, answer, persona, history):
+        calls.append(question)
+        await asyncio.sleep(delay)
+        return {"categories": categories, "followup": followup, "question": "꼬리질문" if followup else ""}
+
+    async def run():
+        spec = SpeculativeTurn("sid", 1, "질문", "답변", "persona", [])
+        start = time.monotonic()
+        result = await spec.followup(wait=wait)
+        elapsed = time.monotonic() - start
+        await wait_logged([spec])
+        return result, elapsed
+
+    with patch.object(
+        interview.llm_service, "evaluate_with_followup_async", side_effect=fake_evaluate_with_followup
+    ), patch.object(
+        interview.interaction_logger, "add", side_effect=lambda sid, log: logged.append(log)
+    ):
+        result, elapsed = asyncio.run(run())
+    return result, elapsed, calls, logged
+
+
+def test_followup_inserted_from_single_call():
+    """
+    평가와 꼬리질문 판단은 한 번의 호출로 받고, 점수가 낮으면 꼬리질문을 돌려줘야 한다.
+    """
+    result, _, calls, logged = _run_turn(LOW, True, delay=0.01)
+    assert result == "꼬리질문"
+    assert calls == ["질문"]
+    assert [log.evaluation[0].categories[0].score for log in logged] == [2]
+
+
+def test_followup_ignored_for_good_answer():
+    result, _, _, _ = _run_turn(HIGH, True)
+    assert result is None
+
+
+def test_late_evaluation_is_dropped_but_logged():
+    """
+    제한 시간 안에 결론이 나지 않으면 꼬리질문 없이 진행하고, 늦게 끝난 평가도 로그에 남아야 한다.
+    """
+    result, elapsed, _, logged = _run_turn(LOW, True, delay=0.3, wait=0.05)
+    assert result is None
+    assert elapsed < 0.25
+    assert len(logged) == 1
+    assert logged[0].evaluation[0].categories[0].score == 2
+
+
+def test_engine_checkpoints_and_resumes_followup():
+    """
+    꼬리질문을 보낸 뒤 연결이 끊겨도 체크포인트로 같은 꼬리질문부터 이어서 진행하고, 평가를 다시 요청하지 않아야 한다.
+    """
+    calls = []
+    saved = {}
+
+    async def fake_evaluate_with_followup(question, answer, persona, history):
+        calls.append((question, len(history)))
+        return {"categories": LOW, "followup": True, "question": "꼬리질문"}
+
+    def fake_update_session(session_id, data):
+        saved.update(data)
+
+    questions = [{"text": "질문1"}, {"text": "질문2"}]
+
+    async def run():
+        engine = interview.InterviewEngine.from_session(
+            "sid", {"questions": questions, "persona": "p"})
+        engine.start_answer("답변1")
+        followup = await engine.advance()
+        await engine.drain()
+        # 새 연결: 같은 프로세스의 엔진이 정리된 뒤 저장된 체크포인트로 재개
+        resumed = interview.InterviewEngine.from_session(
+            "sid", {"questions": questions, "interview_state": saved["interview_state"]})
+        current = resumed.current_question()
+        resumed.start_answer("꼬리답변")
+        await resumed.advance()
+        await resumed.drain()
+        return followup, resumed, current
+
+    with patch.object(
+        interview.llm_service, "evaluate_with_followup_async", side_effect=fake_evaluate_with_followup
+    ), patch.object(
+        interview.interaction_logger, "add"
+    ), patch.object(
+        interview.firebase_crud_async, "update_session", side_effect=fake_update_session
+    ):
+        followup, resumed, current = asyncio.run(run())
+    assert followup == "꼬리질문"
+    assert resumed.resumed
+    assert current == ("꼬리질문", True)
+    # 재개 후에는 이전 답변을 다시 평가하지 않고, 꼬리답변은 이전 Q&A 기록과 함께 판단
+    assert calls == [("질문1", 1), ("꼬리질문", 2)]
+    assert saved["interview_state"]["turn"] == 0
+    assert saved["interview_state"]["followups"] == 2
+    assert saved["interview_state"]["pending"] == []
+
+
+def test_engine_completes_once_and_skips_ended_session():
+    """
+    complete()/close()를 여러 번 불러도 로그 정리와 종료 처리는 한 번만 하고,
+    이미 종료된 세션에 다시 연결한 경우에는 최종 평가를 다시 요청하지 않아야 한다.
+    """
+    questions = [{"text": "질문1"}]
+
+    async def run():
+        engine = interview.InterviewEngine.from_session("sid", {"questions": questions})
+        await engine.complete()
+        await engine.complete()
+        await engine.close()
+        ended = interview.InterviewEngine.from_session(
+            "sid2", {"questions": questions, "status": "chat_end"})
+        await ended.complete()
+
+    with patch.object(
+        interview.interaction_logger, "close_session"
+    ) as close_session, patch.object(
+        interview.firebase_crud_async, "save_chat_end"
+    ) as save_chat_end, patch.object(
+        interview.job_queue, "submit"
+    ) as submit:
+        asyncio.run(run())
+    assert [c.args for c in close_session.call_args_list] == [("sid",), ("sid2",)]
+    save_chat_end.assert_called_once_with("sid")
+    submit.assert_called_once_with(interview.FINAL_EVAL, "sid")
+
+
+def test_engine_defers_completion_when_logs_are_not_saved():
+    """
+    인터랙션 로그를 모두 저장하지 못하면 종료 상태로 바꾸거나 최종 평가를 요청하지 않아야 한다.
+    """
+    async def run():
+        engine = interview.InterviewEngine.from_session("sid", {"questions": [{"text": "질문1"}]})
+        return await engine.complete(), engine.ended
+
+    with patch.object(
+        interview.interaction_logger, "close_session", return_value=False
+    ), patch.object(
+        interview.firebase_crud_async, "save_chat_end"
+    ) as save_chat_end, patch.object(
+        interview.job_queue, "submit"
+    ) as submit:
+        completed, ended = asyncio.run(run())
+    assert (completed, ended) == (False, False)
+    save_chat_end.assert_not_called()
+    submit.assert_not_called()
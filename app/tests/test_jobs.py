@@ -0,0 +1,82 @@
+import asyncio
+from unittest.mock import patch
+
+from app.services import jobs
+from app.services.jobs import FINAL_EVAL, JobQueue, MemoryJobStore, SQLiteJobStore
+
+
+def test_final_eval_job_dedupes_and_records_status():
+    """
+    같은 세션의 최종 평가는 한 번만 실행되고, 상태와 결과가 세션 문서에 기록되어야 한다.
+    """
+    updates = []
+    calls = []
+
+    async def fake_final_eval_async(logs):
+        calls.append(logs)
+        await asyncio.sleep(0.01)
+        return {"total_score": 4.0}
+
+    async def run():
+        queue = JobQueue(store=MemoryJobStore(), workers=2)
+        first = queue.submit(FINAL_EVAL, "sid")
+        second = queue.submit(FINAL_EVAL, "sid")
+        result = await queue.wait(first["id"], timeout=1)
+        await asyncio.sleep(0.01)
+        job = queue.get(first["id"])
+        # 끝난 작업의 Future는 실행 중 목록에 남지 않고, 최근 결과로 다시 받을 수 있어야 한다
+        assert queue._futures == {}
+        assert await queue.wait(first["id"], timeout=1) == result
+        await queue.stop()
+        return first, second, result, job
+
+    with patch.object(
+        jobs.firebase_crud_async, "get_session", return_value={}
+    ), patch.object(
+        jobs.firebase_crud_async, "get_interactions", return_value=[{"turn": 1}]
+    ), patch.object(
+        jobs.firebase_crud_async, "update_session",
+        side_effect=lambda sid, data: updates.append(data),
+    ), patch.object(
+        jobs.llm_service, "final_eval_async", side_effect=fake_final_eval_async
+    ):
+        first, second, result, job = asyncio.run(run())
+    assert first["id"] == second["id"]
+    assert len(calls) == 1
+    assert result == {"total_score": 4.0}
+    assert job["status"] == jobs.DONE
+    assert {"final_eval": {"total_score": 4.0}} in updates
+    statuses = [u["final_eval_job"]["status"] for u in updates if "final_eval_job" in u]
+    assert statuses[-1] == jobs.DONE
+
+
+def test_sqlite_store_requeues_unfinished_jobs(tmp_path):
+    """
+    재시작 시 SQLite 저장소에 남아 있던 미완료 작업을 다시 실행해야 한다.
+    """
+    store = SQLiteJobStore(str(tmp_path / "jobs.sqlite3"))
+    store.save({
+        "id": "j1", "kind": FINAL_EVAL, "session_id": "sid", "status": jobs.RUNNING,
+        "created_at": None, "started_at": None, "finished_at": None, "error": None,
+    })
+
+    async def handler(session_id):
+        raise RuntimeError("boom")
+
+    async def run():
+        queue = JobQueue(store=store, workers=1)
+        queue.handlers[FINAL_EVAL] = handler
+        queue.start()
+        try:
+            await queue.wait("j1", timeout=1)
+        except RuntimeError:
+            pass
+        await asyncio.sleep(0.01)
+        await queue.stop()
+
+    with patch.object(jobs.firebase_crud_async, "update_session"):
+        asyncio.run(run())
+    job = store.get("j1")
+    assert job["status"] == jobs.FAILED
+    assert job["error"] == "boom"
+    assert store.unfinished() == []
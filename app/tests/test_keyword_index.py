@@ -0,0 +1,38 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.services import keyword_index
+
+VOCAB = ["python", "docker", "팀워크", "성장", "kafka"]
+
+
+def _fake_embedding(model, input):
+    # 단어가 포함되어 있으면 해당 축이 1인 bag-of-words 임베딩
+    data = []
+    for text in input:
+        data.append({"embedding": [1.0 if w in text else 0.0 for w in VOCAB] + [0.1]})
+    return SimpleNamespace(data=data)
+
+
+def test_build_and_search_index(tmp_path):
+    keywords_path = tmp_path / "keywords.json"
+    keywords_path.write_text(
+        json.dumps(
+            {
+                "technical_skills": ["python", "docker", "kafka"],
+                "attitude": ["팀워크", "성장"],
+                "empty": [],
+            },
+            ensure_ascii=False,
+        ),
+        encoding="utf-8",
+    )
+    index_dir = tmp_path / "index"
+    with patch("litellm.embedding", side_effect=_fake_embedding):
+        keyword_index.build_index(str(keywords_path), str(index_dir), model="fake")
+        index = keyword_index.KeywordIndex(str(index_dir))
+        result = index.search("python과 docker를 쓰는 팀워크", top_k=2)
+    assert set(result["technical_skills"]) == {"python", "docker"}
+    assert result["attitude"][0] == "팀워크"
+    assert result["empty"] == []
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from app.services import llm_cache, llm_service
+
+
+def test_identical_evaluation_hits_cache(fake_llm):
+    """
+    공백/문장부호만 다른 같은 (질문, 답변)은 캐시에서 비용 없이 반환되고, use_cache=False면 다시 호출해야 한다.
+    """
+    fake_llm.reply(*['{"categories": [{"name": "기술 이해도", "score": 4}]}'] * 2)
+    fake_llm.cost = 0.01
+
+    async def run():
+        first = await llm_service.ask_llm_async(
+            llm_service._evaluate_prompt("질문", "답변"),
+            cache_template=llm_service._EVALUATE_TEMPLATE_ID,
+            cache_inputs={"question": "질문", "answer": "답변"},
+        )
+        second = await llm_service.ask_llm_async(
+            llm_service._evaluate_prompt("질문?", " 답변 "),
+            cache_template=llm_service._EVALUATE_TEMPLATE_ID,
+            cache_inputs={"question": "질문?", "answer": " 답변 "},
+        )
+        third = await llm_service.evaluate_answer_async("질문", "답변", use_cache=False)
+        return first, second, third
+
+    cache = llm_cache.MemoryLLMCache(maxsize=10, ttl=60)
+    llm_cache.set_cache(cache)
+    try:
+        first, second, third = asyncio.run(run())
+    finally:
+        llm_cache.set_cache(llm_cache.create_cache())
+    assert len(fake_llm.calls) == 2
+    assert first == (second[0], 0.01)
+    assert second[1] == 0.0
+    assert third["categories"][0]["score"] == 4
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_sqlite_cache_ttl_and_size_bound(tmp_path):
+    cache = llm_cache.SQLiteLLMCache(str(tmp_path / "llm.sqlite3"), maxsize=2, ttl=60)
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+        time.sleep(0.01)
+    assert cache.size() == 2
+    assert cache.get("a") is None
+    assert cache.get("c") == "C"
+
+    expiring = llm_cache.SQLiteLLMCache(str(tmp_path / "ttl.sqlite3"), ttl=0.01)
+    expiring.set("k", "v")
+    time.sleep(0.02)
+    assert expiring.get("k") is None
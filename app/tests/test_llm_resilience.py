@@ -0,0 +1,140 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+from app.services import llm_resilience, llm_service
+from app.services.llm_resilience import CircuitBreaker
+
+
+def test_circuit_breaker_opens_and_probes():
+    breaker = CircuitBreaker("m", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == llm_resilience.OPEN
+    assert not breaker.allow()
+    time.sleep(0.06)
+    # 리셋 시간이 지나면 시험 호출 하나만 허용
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == llm_resilience.CLOSED
+
+
+def test_ask_llm_async_falls_back_and_short_circuits(fake_llm):
+    """
+    기본 모델이 계속 실패하면 대체 모델로 응답하고, 회로가 열린 뒤에는 기본 모델을 호출하지 않아야 한다.
+    """
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs["model"])
+        if kwargs["model"] == "primary":
+            raise RuntimeError("provider down")
+        return fake_llm.response('{"ok": true}')
+
+    async def run():
+        first = await llm_service.ask_llm_async("prompt", model="primary")
+        second = await llm_service.ask_llm_async("prompt", model="primary")
+        return first, second
+
+    fake_llm.handler = fake_acompletion
+    with patch.object(llm_resilience, "LLM_FALLBACK_MODEL", "backup"), patch.object(
+        llm_service, "LLM_MAX_RETRIES", 2
+    ), patch.dict(
+        llm_resilience._breakers,
+        {"primary": CircuitBreaker("primary", failure_threshold=3, reset_timeout=60)},
+    ):
+        first, second = asyncio.run(run())
+        stats = llm_resilience.stats()
+    assert first == ('{"ok": true}', 0.0)
+    assert second == ('{"ok": true}', 0.0)
+    assert calls == ["primary"] * 3 + ["backup", "backup"]
+    assert stats["breakers"]["primary"]["state"] == llm_resilience.OPEN
+    assert stats["counters"]["fallbacks"] == 2
+    assert stats["counters"]["short_circuits"] == 1
+
+
+def test_ask_llm_async_respects_deadline(fake_llm):
+    async def slow_acompletion(**kwargs):
+        await asyncio.sleep(1)
+        return fake_llm.response("{}")
+
+    fake_llm.handler = slow_acompletion
+    start = time.monotonic()
+    content, _ = asyncio.run(
+        llm_service.ask_llm_async("prompt", timeout=0.5, deadline=0.1))
+    assert content == ""
+    assert time.monotonic() - start < 0.5
+
+
+def test_cancelled_probe_releases_half_open_breaker(fake_llm):
+    """
+    반열림 상태의 시험 호출이 취소되면 다음 호출이 다시 시험할 수 있어야 한다.
+    """
+    breaker = CircuitBreaker("probe", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    async def hanging_acompletion(**kwargs):
+        await asyncio.sleep(10)
+
+    async def run():
+        task = asyncio.create_task(llm_service.ask_llm_async("prompt", model="probe"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    fake_llm.handler = hanging_acompletion
+    with patch.dict(llm_resilience._breakers, {"probe": breaker}):
+        asyncio.run(run())
+    assert breaker.allow()
+
+
+def test_backoff_only_between_attempts_and_timeouts_counted_alike(fake_llm):
+    """
+    마지막 시도 뒤에는 기다리지 않고, 동기/비동기 모두 타임아웃을 timeouts로 센다.
+    """
+    def timeout_completion(**kwargs):
+        raise TimeoutError("slow")
+
+    fake_llm.handler = timeout_completion
+    with patch.object(llm_service, "LLM_MAX_RETRIES", 1), patch.dict(
+        llm_resilience._breakers,
+        {"slow": CircuitBreaker("slow", failure_threshold=10, reset_timeout=60)},
+    ):
+        llm_service.ask_llm("prompt", model="slow", use_cache=False)
+        asyncio.run(llm_service.ask_llm_async("prompt", model="slow", use_cache=False))
+        stats = llm_resilience.stats()
+    assert fake_llm.backoff.call_count == 2
+    assert stats["counters"]["timeouts"] == 4
+    assert stats["counters"]["errors"] == 0
+
+
+def test_deadline_includes_wait_for_concurrency_slot(fake_llm):
+    """
+    동시 호출 자리를 기다리는 시간도 deadline에 포함되어, 대기열 뒤쪽 호출은 deadline 안에 포기해야 한다.
+    """
+    async def slow_acompletion(**kwargs):
+        await asyncio.sleep(0.25)
+        return fake_llm.response('{"ok": true}')
+
+    async def timed_call():
+        start = time.monotonic()
+        content, _ = await llm_service.ask_llm_async("prompt", use_cache=False, deadline=0.3)
+        return content, time.monotonic() - start
+
+    async def run():
+        return await asyncio.gather(*[timed_call() for _ in range(4)])
+
+    fake_llm.handler = slow_acompletion
+    with patch.object(llm_service, "LLM_MAX_CONCURRENCY", 1), patch.object(
+        llm_service, "_llm_semaphore", None
+    ):
+        results = asyncio.run(run())
+        stats = llm_resilience.stats()
+    assert [content for content, _ in results] == ['{"ok": true}', "", "", ""]
+    assert all(elapsed < 0.45 for _, elapsed in results)
+    assert stats["counters"]["deadline_exceeded"] == 3
@@ -0,0 +1,51 @@
+import asyncio
+import json
+
+from app.models import llm_schemas
+from app.services import llm_resilience, llm_service
+
+
+def test_repair_json_handles_near_valid_output():
+    """
+    코드 펜스, // 주석, 끝 쉼표, 파이썬 리터럴, 잘린 괄호는 다시 호출하지 않고 고쳐야 한다.
+    """
+    text = """설명입니다.
+```json
+{
+  "categories": [
+    {"name": "기술 이해도", "score": 4, "feedback": "http://예시 // 문자열 안"},
+  ],
+  "total_score": 78,  // 100점 만점 환산 총점
+  "followup": True,
+  "question": "왜 그런가요
+```"""
+    data = llm_schemas.repair_json(text)
+    assert data["categories"][0]["feedback"] == "http://예시 // 문자열 안"
+    assert data["total_score"] == 78
+    assert data["followup"] is True
+    assert llm_schemas.repair_json("답변할 수 없습니다") is None
+
+
+def test_schema_call_repairs_before_recalling(fake_llm):
+    """
+    스키마를 JSON 스키마 제약으로 요청하고, 고칠 수 있는 응답은 재호출 없이, 스키마에 맞지 않는 응답은 재호출로 처리해야 한다.
+    """
+    fake_llm.reply('{"summary": "요약",}', '{"wrong": 1}', '{"summary": "두번째"}')
+
+    async def run():
+        first = await llm_service.ask_llm_async(
+            "prompt", schema=llm_schemas.CategorySummaryResponse)
+        second = await llm_service.ask_llm_async(
+            "prompt", schema=llm_schemas.CategorySummaryResponse)
+        return first, second
+
+    first, second = asyncio.run(run())
+    counters = llm_resilience.stats()["counters"]
+    calls = [kwargs["response_format"] for kwargs in fake_llm.calls]
+    assert json.loads(first[0]) == {"summary": "요약"}
+    assert json.loads(second[0]) == {"summary": "두번째"}
+    assert len(calls) == 3
+    assert calls[0]["type"] == "json_schema"
+    assert calls[0]["json_schema"]["name"] == "CategorySummaryResponse"
+    assert counters["repairs"] == 1
+    assert counters["recalls"] == 1
@@ -0,0 +1,150 @@
+import asyncio
+import inspect
+import json
+from unittest.mock import patch
+
+from app.services import llm_service
+
+
+def test_ask_llm_async_limits_concurrency(fake_llm):
+    """
+    동시에 여러 평가를 요청해도 LLM_MAX_CONCURRENCY 이상 동시에 호출되지 않아야 한다.
+    """
+    state = {"running": 0, "peak": 0}
+
+    async def fake_acompletion(**kwargs):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return fake_llm.response('{"categories": []}')
+
+    async def run():
+        return await asyncio.gather(
+            *[llm_service.evaluate_answer_async("질문", "답변") for _ in range(10)]
+        )
+
+    fake_llm.handler = fake_acompletion
+    with patch.object(llm_service, "LLM_MAX_CONCURRENCY", 3):
+        results = asyncio.run(run())
+    assert results == [{"categories": []}] * 10
+    assert state["peak"] <= 3
+
+
+def test_ask_llm_async_timeout_returns_empty(fake_llm):
+    """
+    타임아웃이 나면 예외 대신 빈 응답을 돌려주고, 평가 결과는 빈 dict가 되어야 한다.
+    """
+
+    async def slow_acompletion(**kwargs):
+        await asyncio.sleep(1)
+        return fake_llm.response("{}")
+
+    fake_llm.handler = slow_acompletion
+    content, cost = asyncio.run(llm_service.ask_llm_async("prompt", timeout=0.01))
+    assert content == ""
+    assert cost == 0.0
+
+
+def test_ask_llm_sync_and_async_share_signature_and_request(fake_llm):
+    """
+    동기/비동기 호출은 인자 순서가 같고, 같은 요청(response_format 포함)을 보내야 한다.
+    """
+    assert list(inspect.signature(llm_service.ask_llm).parameters) == list(
+        inspect.signature(llm_service.ask_llm_async).parameters)
+    fake_llm.reply('{"a": 1}', '{"a": 1}')
+    response_format = {"type": "json_schema"}
+    sync_result = llm_service.ask_llm("prompt", response_format=response_format)
+    async_result = asyncio.run(
+        llm_service.ask_llm_async("prompt", response_format=response_format))
+    assert sync_result == async_result == ('{"a": 1}', 0.0)
+    sync_call, async_call = fake_llm.calls
+    assert sync_call.pop("timeout") > 0
+    assert sync_call == async_call
+    assert async_call["response_format"] == response_format
+
+
+def test_final_eval_runs_summaries_concurrently(fake_llm):
+    """
+    카테고리 요약 5개와 최종 총평 1개가 동시에 요청되어야 한다.
+    """
+    state = {"running": 0, "peak": 0, "calls": 0}
+
+    async def fake_acompletion(**kwargs):
+        state["calls"] += 1
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        prompt = kwargs["messages"][0]["content"]
+        if "final_feedback" in prompt:
+            return fake_llm.response('{"final_feedback": "총평"}')
+        return fake_llm.response('{"summary": "요약"}')
+
+    categories = [
+        {"name": name, "score": 4, "feedback": "좋음"}
+        for name in llm_service.FINAL_EVAL_CATEGORIES
+    ]
+    logs = [{"question": "q", "answer": "a", "evaluation": [{"categories": categories}]}]
+    fake_llm.handler = fake_acompletion
+    result = asyncio.run(llm_service.final_eval_async(logs, mode="multi"))
+    assert state["calls"] == 6
+    assert state["peak"] == 6
+    assert result["final_feedback"] == "총평"
+    assert set(result["category_feedbacks"].values()) == {"요약"}
+    assert result["total_score"] == 4.0
+
+
+def test_final_eval_single_mode_uses_one_schema_call(fake_llm):
+    """
+    single 모드는 JSON 스키마 호출 한 번으로 요약과 총평을 받고, 점수 집계는 multi와 같아야 한다.
+    """
+    calls = []
+
+    async def fake_acompletion(**kwargs):
+        calls.append(kwargs["response_format"])
+        feedbacks = {name: "요약" for name in llm_service.FINAL_EVAL_CATEGORIES}
+        return fake_llm.response(
+            json.dumps({"category_feedbacks": feedbacks, "final_feedback": "총평"})
+        )
+
+    categories = [
+        {"name": name, "score": 3, "feedback": "보통"}
+        for name in llm_service.FINAL_EVAL_CATEGORIES
+    ]
+    logs = [{"question": "q", "answer": "a", "evaluation": [{"categories": categories}]}]
+    fake_llm.handler = fake_acompletion
+    fake_llm.cost = 0.001
+    result, cost = asyncio.run(llm_service._final_eval_single_async(logs))
+    assert len(calls) == 1
+    assert calls[0]["type"] == "json_schema"
+    assert result["final_feedback"] == "총평"
+    assert set(result["category_feedbacks"].values()) == {"요약"}
+    assert result["category_scores"] == {
+        name: 3.0 for name in llm_service.FINAL_EVAL_CATEGORIES
+    }
+    assert cost == 0.001
+
+
+def test_evaluate_with_followup_parses_single_response(fake_llm):
+    """
+    평가와 꼬리질문 판단을 한 번의 호출로 받고, 질문이 비어 있으면 followup은 False가 되어야 한다.
+    """
+    responses = [
+        '{"categories": [{"name": "기술 이해도", "score": 2}], "followup": true, "question": "왜죠?"}',
+        '{"categories": [{"name": "기술 이해도", "score": 2}], "followup": true, "question": ""}',
+    ]
+    fake_llm.reply(*responses)
+
+    async def run():
+        return [
+            await llm_service.evaluate_with_followup_async(
+                "질문", "답변", "persona", [], use_cache=False)
+            for _ in responses
+        ]
+
+    first, second = asyncio.run(run())
+    assert len(fake_llm.calls) == 2
+    assert first["followup"] is True and first["question"] == "왜죠?"
+    assert first["categories"][0]["score"] == 2
+    assert second["followup"] is False and second["question"] == ""
@@ -0,0 +1,62 @@
+import asyncio
+import time
+
+from app.services import ownership
+from app.services.ownership import MemoryLeaseStore, SessionLease
+
+
+def test_memory_lease_store_expires_and_fences():
+    """
+    살아 있는 lease는 다른 워커가 가져갈 수 없고, 만료되면 넘겨받으며 이전 소유자의 갱신은 실패해야 한다.
+    """
+    store = MemoryLeaseStore()
+    ok, lease = store.acquire("sid", "interview", "a", "http://a", ttl=0.05)
+    assert ok and lease["generation"] == 1
+    ok, current = store.acquire("sid", "interview", "b", "http://b", ttl=0.05)
+    assert not ok and current["owner"] == "a"
+    time.sleep(0.06)
+    assert store.get("sid", "interview") is None
+    ok, lease = store.acquire("sid", "interview", "b", "http://b", ttl=1)
+    assert ok and lease["generation"] == 2
+    assert not store.renew("sid", "interview", "a", ttl=1)
+    store.release("sid", "interview", "a")
+    assert store.get("sid", "interview")["owner"] == "b"
+
+
+def test_session_lease_hands_off_within_worker_and_waits_across_workers():
+    store = MemoryLeaseStore()
+    lost = []
+
+    async def run():
+        first = SessionLease("sid", store=store, on_lost=lambda: lost.append("first"))
+        assert await first.acquire()
+        # 같은 워커의 재접속은 기다리지 않고 바로 넘겨받음
+        second = SessionLease("sid", store=store)
+        assert await second.acquire(wait=0)
+        await first.release()
+        owner_after_first = store.get("sid", ownership.INTERVIEW)
+        await second.release()
+
+        # 다른 워커가 소유 중이면 해제될 때까지 기다렸다가 얻음
+        store.acquire("sid", ownership.INTERVIEW, "other", "", ttl=10)
+        third = SessionLease("sid", store=store)
+        waiting = asyncio.create_task(third.acquire(wait=1))
+        await asyncio.sleep(0.1)
+        assert not waiting.done()
+        store.release("sid", ownership.INTERVIEW, "other")
+        acquired = await waiting
+        await third.release()
+        # 기다릴 수 없으면 현재 소유자 정보를 남기고 실패
+        store.acquire("sid", ownership.INTERVIEW, "other", "http://other", ttl=10)
+        fourth = SessionLease("sid", store=store)
+        rejected = not await fourth.acquire(wait=0)
+        return first, second, owner_after_first, acquired, rejected, fourth
+
+    first, second, owner_after_first, acquired, rejected, fourth = asyncio.run(run())
+    assert lost == ["first"]
+    assert not first.held and not second.held
+    # 넘겨준 연결이 종료되어도 새 연결의 lease는 유지
+    assert owner_after_first["owner"] == ownership.WORKER_ID
+    assert acquired
+    assert rejected
+    assert ownership.public(fourth.lease)["url"] == "http://other"
@@ -0,0 +1,53 @@
+from app.services import prompt_builder, telemetry
+from app.services.llm_service import FINAL_EVAL_CATEGORIES
+
+
+def _log(turn, answer, created_at=""):
+    categories = [
+        {"name": name, "score": 3, "feedback": f"{name} 피드백"}
+        for name in FINAL_EVAL_CATEGORIES
+    ]
+    return {
+        "id": f"id-{turn}",
+        "turn": turn,
+        "question": f"질문 {turn}",
+        "answer": answer,
+        "created_at": created_at,
+        "evaluation": [{"categories": categories}],
+    }
+
+
+def test_session_logs_are_ordered_and_compact():
+    """
+    턴 순서로 정렬하고, id/created_at 같은 불필요한 필드 없이 질문/답변/점수/피드백만 담아야 한다.
+    """
+    logs = [_log(2, "둘째 답변"), _log(1, "첫째 답변")]
+    text = prompt_builder.render_session_logs(logs, FINAL_EVAL_CATEGORIES, budget=10_000)
+    assert text.index("질문 1") < text.index("질문 2")
+    assert "id-1" not in text
+    assert "점수: 3/3/3/3/3" in text
+    assert prompt_builder.estimate_tokens(text) < prompt_builder.estimate_tokens(repr(logs))
+
+
+def test_session_logs_fit_budget_by_compacting_older_turns():
+    """
+    예산을 넘으면 오래된 턴부터 줄이고, 최근 턴은 최대한 원문을 유지해야 한다.
+    """
+    logs = [_log(turn, "아주 긴 답변입니다. " * 100) for turn in range(1, 11)]
+    budget = 3000
+    telemetry.reset()
+    text = prompt_builder.render_session_logs(logs, FINAL_EVAL_CATEGORIES, budget=budget, name="test")
+    assert prompt_builder.estimate_tokens(text) <= budget
+    assert "질문 10" in text
+    # 프롬프트 크기는 /metrics로 노출
+    metrics = telemetry.render_prometheus()
+    telemetry.reset()
+    assert 'llm_prompt_tokens_count{prompt="test"} 1' in metrics
+    assert 'llm_prompt_tokens_bucket{prompt="test",le="4000"} 1' in metrics
+    saved = [line for line in metrics.splitlines()
+             if line.startswith('llm_prompt_saved_tokens_total{prompt="test"}')]
+    assert int(saved[0].split()[-1]) > 0
+    compacted = sum(
+        int(line.split()[-1]) for line in metrics.splitlines()
+        if line.startswith('llm_prompt_items_total{prompt="test"'))
+    assert compacted > 0
@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from app.core.cache import TTLCache
+from app.services import question_bank
+
+
+def test_ttl_cache_lru_and_expiry():
+    cache = TTLCache(maxsize=2, ttl=None)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)  # 가장 오래 안 쓴 b가 밀려남
+    assert "a" in cache and "c" in cache and "b" not in cache
+
+    cache.set("d", 4, ttl=-1)  # 이미 만료
+    assert cache.get("d") is None
+
+
+def test_sample_questions_dedupes_and_falls_back():
+    """
+    중복 질문은 한 번만 뽑히고, 풀이 모자라거나 페르소나가 다르면 None(LLM 대체)이어야 한다.
+    """
+    persona = "무뚝뚝한 백엔드 면접관"
+    entries = [
+        {
+            "persona": persona,
+            "persona_key": question_bank.persona_key(persona),
+            "questions": [
+                {"question": "트랜잭션 격리 수준을 설명해 주세요?"},
+                {"question": "트랜잭션  격리 수준을 설명해 주세요"},
+                {"question": "인덱스가 느려지는 경우는?"},
+                {"question": "캐시 무효화 전략을 말해 주세요."},
+            ],
+        }
+    ]
+    with patch.object(question_bank, "get_bank_entries", return_value=entries):
+        picked = question_bank.sample_questions("네이버", "백엔드", persona, 3)
+        assert picked is not None and len(picked) == 3
+        texts = {question_bank.normalize_text(q["question"]) for q in picked}
+        assert len(texts) == 3
+        assert question_bank.sample_questions("네이버", "백엔드", persona, 4) is None
+        assert question_bank.sample_questions("네이버", "백엔드", "다른 면접관", 1) is None
@@ -0,0 +1,37 @@
+import asyncio
+from unittest.mock import patch
+
+from app.services import rag
+
+
+def test_rerank_fan_out_is_concurrent_and_cached():
+    """
+    카테고리별 rerank는 동시에 실행되고, 공백/문장부호만 다른 텍스트는 캐시를 재사용해야 한다.
+    """
+    state = {"calls": 0, "running": 0, "peak": 0}
+
+    async def fake_arerank(model, query, documents, top_n):
+        state["calls"] += 1
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return {"results": [{"document": {"text": d}} for d in documents[:top_n]]}
+
+    keywords = {f"cat{i}": [f"kw{i}-{j}" for j in range(20)] for i in range(5)}
+    rag._candidates_cache.clear()
+    with patch.object(rag, "arerank", side_effect=fake_arerank), patch.object(
+        rag, "JINA_API_KEY", "test"
+    ), patch.object(rag, "load_keywords", return_value=keywords), patch.object(
+        rag.keyword_index, "get_index", return_value=None
+    ):
+        first = rag.get_top_keywords_by_category(
+            {"company": "네이버", "self_intro": "Python 백엔드 개발!"}
+        )
+        second = rag.get_top_keywords_by_category(
+            {"company": "네이버", "self_intro": "python  백엔드 개발"}
+        )
+    assert state["calls"] == 5
+    assert state["peak"] == 5
+    assert set(first) == set(second) == set(keywords)
+    assert all(len(v) == 3 for v in first.values())
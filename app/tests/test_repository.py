@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db import repository
+from app.db.repository import MemoryRepository, SQLiteRepository
+from app.models.schemas import InteractionLogSchema, SessionCreateSchema
+from app.services import firebase_crud, firebase_crud_async
+
+
+def test_memory_and_sqlite_repositories_behave_like_firestore(tmp_path):
+    """
+    중첩 필드('a.b') 갱신, 증가분 합산, 코드 조회, 인터랙션/채용 공고/질문 은행 저장이
+    두 로컬 저장소에서 같게 동작하고, SQLite는 datetime을 그대로 돌려줘야 한다.
+    """
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for repo in (MemoryRepository(), SQLiteRepository(str(tmp_path / "storage.sqlite3"))):
+        session_id = repo.create_session({"code": "ABC123", "status": "ready"})
+        repo.update_session(session_id, {"status": "chat_end", "final_eval.score": 80})
+        repo.increment_session(session_id, {"llm_usage.cost": 0.5, "llm_usage.by_function.final_eval": 0.5})
+        repo.increment_session(session_id, {"llm_usage.cost": 0.25})
+        assert repo.get_session(session_id) == {
+            "code": "ABC123",
+            "status": "chat_end",
+            "final_eval": {"score": 80},
+            "llm_usage": {"cost": 0.75, "by_function": {"final_eval": 0.5}},
+        }
+        assert repo.find_session_by_code("ABC123") == session_id
+        assert repo.find_session_by_code("ZZZ999") is None
+        assert repo.get_session("missing") is None
+
+        repo.add_interactions(session_id, [{"turn": 1, "created_at": created_at}, {"turn": 2}])
+        assert repo.get_interactions(session_id) == [{"turn": 1, "created_at": created_at}, {"turn": 2}]
+
+        job_id = repository.job_doc_id("네이버", "백엔드")
+        repo.save_job(job_id, {"title": "백엔드 개발자"})
+        assert repo.get_job(job_id) == {"title": "백엔드 개발자"}
+        assert repo.list_jobs() == [(job_id, {"title": "백엔드 개발자"})]
+
+        repo.save_bank_entry("b1", {"company": "네이버", "position": "백엔드", "questions": []})
+        assert len(repo.get_bank_entries("네이버", "백엔드")) == 1
+        assert repo.get_bank_entries("네이버", "프론트엔드") == []
+
+
+def test_crud_runs_offline_on_memory_repository():
+    """
+    memory 저장소로 바꾸면 동기/비동기 CRUD가 Firebase 없이 같은 데이터를 봐야 한다.
+    """
+    firebase_crud._session_cache.clear()
+    firebase_crud._code_cache.clear()
+    repository.set_repository(MemoryRepository())
+    try:
+        session_id, code = firebase_crud.create_session(
+            SessionCreateSchema(username="u", password="pw"))
+        firebase_crud._code_cache.clear()
+        assert firebase_crud.get_session_id_by_code(code) == session_id
+
+        async def run():
+            await firebase_crud_async.add_interactions(
+                session_id, [InteractionLogSchema(turn=1, question="q", answer="a")])
+            await firebase_crud_async.add_session_llm_usage(
+                session_id, {"cost": 0.1, "requests": 1, "tokens": 10, "by_function": {}})
+            await firebase_crud_async.save_chat_end(session_id)
+
+        asyncio.run(run())
+        assert firebase_crud.get_session_status(session_id) == "chat_end"
+        assert firebase_crud.get_session(session_id)["llm_usage"]["tokens"] == 10
+        assert [log["turn"] for log in firebase_crud.get_interactions(session_id)] == [1]
+        assert firebase_crud.get_job_info("네이버", "백엔드") is None
+    finally:
+        repository.set_repository(None)
+        firebase_crud._session_cache.clear()
+        firebase_crud._code_cache.clear()
+
+
+def test_incomplete_repository_fails_on_instantiation():
+    class PartialRepository(repository.Repository):
+        def get_session(self, session_id):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialRepository()
@@ -164,8 +164,10 @@ def test_eval_missing_fields():
         f"/sessions/{code}/questions", json={"num_questions": 1}
     )
     questions = res_questions.json()["questions"]
-    # patch evaluate_answer to return abnormal result
-    with patch("app.services.llm_service.evaluate_answer", return_value={}):
+    # 답변 평가(평가 + 꼬리질문 판단 한 번에 호출)가 비정상 결과를 반환하도록 patch
+    with patch(
+        "app.services.llm_service.evaluate_with_followup_async", return_value={}
+    ), patch("app.services.llm_service.evaluate_answer_async", return_value={}):
         with client.websocket_connect(f"/sessions/{code}/ws/chat") as ws:
             msg = ws.receive_json()
             ws.send_text("테스트 답변")
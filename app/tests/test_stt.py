@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from app.services import stt
+
+
+class BlockingBackend(stt.STTBackend):
+    """테스트용 로컬 엔진: 이벤트가 풀릴 때까지 대기 후 고정 텍스트 반환"""
+
+    name = "blocking"
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def transcribe(self, wav_bytes: bytes) -> str:
+        self.release.wait(5)
+        return wav_bytes.decode()
+
+
+def test_pool_runs_off_loop_and_applies_backpressure():
+    backend = BlockingBackend()
+    pool = stt.STTWorkerPool(backend, workers=1, max_queue=1, mode="thread")
+
+    async def run():
+        first = asyncio.create_task(pool.transcribe(b"a"))
+        second = asyncio.create_task(pool.transcribe(b"b"))
+        await asyncio.sleep(0.05)
+        # 워커 1 + 대기 1이 찼으므로 세 번째는 즉시 거절
+        with pytest.raises(stt.STTBusyError):
+            await pool.transcribe(b"c")
+        stats = pool.stats()
+        assert stats["in_flight"] == 1 and stats["queue_depth"] == 1
+        backend.release.set()
+        return await asyncio.gather(first, second)
+
+    try:
+        assert asyncio.run(run()) == ["a", "b"]
+        stats = pool.stats()
+        assert stats["completed"] == 2 and stats["rejected"] == 1
+        assert stats["queue_depth"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_register_backend():
+    stt.register_backend("blocking", BlockingBackend)
+    assert isinstance(stt.create_backend("blocking"), BlockingBackend)
+    with pytest.raises(ValueError):
+        stt.create_backend("missing")
+
+
+def test_offline_backend_is_deterministic():
+    """
+    offline 백엔드는 네트워크 없이 발화마다 고정 문장을 돌려주고, 무음이면 빈 문자열을 돌려줘야 한다.
+    """
+    t = np.arange(8000) / 16000
+    tone = (3000 * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+    silence = b"\x00\x00" * 16000
+    backend = stt.create_backend("offline")
+    pool = stt.STTWorkerPool(backend, workers=1, max_queue=1, mode="thread")
+
+    async def run():
+        return await asyncio.gather(
+            pool.transcribe(stt.pcm_to_wav(tone + silence + tone)),
+            pool.transcribe(stt.pcm_to_wav(silence)),
+        )
+
+    try:
+        spoken, silent = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert spoken == f"{backend.text} {backend.text}"
+    assert silent == ""
+    assert backend.transcribe(b"not a wav") == ""
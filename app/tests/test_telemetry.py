@@ -0,0 +1,40 @@
+import asyncio
+
+from app.config import LLM_MODEL
+from app.services import llm_service, telemetry
+
+
+def test_ask_llm_async_records_function_model_and_session(fake_llm):
+    """
+    파싱 실패 후 재시도까지 함수/모델별로 기록되고, 비용은 바인딩된 세션에 합산되어야 한다.
+    """
+    responses = [
+        fake_llm.response("not json", 10, 5),
+        fake_llm.response('{"categories": []}', 10, 5),
+    ]
+    fake_llm.handler = lambda **kwargs: responses.pop(0)
+    fake_llm.cost = 0.25
+
+    async def run():
+        telemetry.bind_session("s1")
+        return await llm_service.evaluate_answer_async("q", "a", use_cache=False)
+
+    telemetry.reset()
+    asyncio.run(run())
+
+    text = telemetry.render_prometheus()
+    labels = f'function="evaluate_answer",model="{LLM_MODEL}"'
+    assert f'llm_requests_total{{{labels},outcome="parse_failure"}} 1' in text
+    assert f'llm_requests_total{{{labels},outcome="ok"}} 1' in text
+    assert f"llm_retries_total{{{labels}}} 1" in text
+    assert f'llm_tokens_total{{{labels},type="prompt"}} 20' in text
+    assert f'llm_request_duration_seconds_count{{{labels}}} 2' in text
+    assert f"llm_cost_usd_total{{{labels}}} 0.5" in text
+
+    usage = telemetry.pop_session_usage("s1")
+    assert usage == {
+        "cost": 0.5, "requests": 2, "tokens": 30,
+        "by_function": {"evaluate_answer": 0.5},
+    }
+    assert telemetry.pop_session_usage("s1") is None
+    telemetry.reset()
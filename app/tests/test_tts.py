@@ -0,0 +1,100 @@
+import asyncio
+import sys
+
+import pytest
+
+from app.services import tts
+
+
+def test_rechunk_emits_fixed_size_chunks():
+    """
+    임의 크기로 도착한 PCM 조각을 고정 크기 청크로 나누고, 남은 바이트는 마지막에 보낸다.
+    """
+
+    async def source():
+        for size in (3, 10, 1, 7):
+            yield b"x" * size
+
+    async def collect():
+        return [chunk async for chunk in tts.rechunk(source(), chunk_bytes=4)]
+
+    chunks = asyncio.run(collect())
+    assert [len(c) for c in chunks] == [4, 4, 4, 4, 4, 1]
+    assert b"".join(chunks) == b"x" * 21
+
+
+def test_stream_pcm_uses_cache(tmp_path, monkeypatch):
+    """
+    한 번 끝까지 합성한 문장은 디스크/메모리 캐시에서 합성 없이 재생되어야 한다.
+    """
+    calls = []
+
+    async def fake_source_pcm(text, decoder):
+        calls.append(text)
+        yield b"a" * 10
+
+    monkeypatch.setattr(tts, "TTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(tts, "_synthesis_source", fake_source_pcm)
+    tts._pcm_cache.clear()
+
+    async def collect(text):
+        return b"".join([chunk async for chunk in tts.stream_pcm(text)])
+
+    assert asyncio.run(tts.prerender(["질문 1", "질문 1", ""])) == 1
+    assert asyncio.run(collect("질문 1")) == b"a" * 10
+    tts._pcm_cache.clear()  # 메모리 캐시가 비어도 디스크에서 읽음
+    assert asyncio.run(collect("질문 1")) == b"a" * 10
+    assert calls == ["질문 1"]
+
+
+def test_speech_prefetch_replays_buffered_chunks(monkeypatch):
+    """
+    미리 시작한 합성은 소비 전에 받은 청크와 이후 청크를 순서대로 모두 돌려줘야 한다.
+    """
+
+    async def fake_stream_pcm(text):
+        for i in range(3):
+            await asyncio.sleep(0.01)
+            yield bytes([i])
+
+    monkeypatch.setattr(tts, "stream_pcm", fake_stream_pcm)
+
+    async def run():
+        speech = tts.SpeechPrefetch("다음 질문")
+        await asyncio.sleep(0.015)
+        return [chunk async for chunk in speech.stream()]
+
+    assert asyncio.run(run()) == [b"\x00", b"\x01", b"\x02"]
+
+
+def test_cache_key_depends_on_decoder():
+    assert tts.cache_key("질문", "ffmpeg") != tts.cache_key("질문", "pydub")
+
+
+def test_failed_ffmpeg_output_is_not_cached(tmp_path, monkeypatch):
+    """
+    ffmpeg가 비정상 종료하면 오류를 전달하고, 그때까지 받은 PCM은 캐시에 남기지 않아야 한다.
+    """
+
+    async def fake_mp3(text):
+        yield b"mp3"
+
+    real_exec = asyncio.create_subprocess_exec
+
+    def failing_ffmpeg(*args, **kwargs):
+        script = "import sys; sys.stdin.read(); sys.stdout.write('pcm'); sys.exit('decode error')"
+        return real_exec(sys.executable, "-c", script, **kwargs)
+
+    monkeypatch.setattr(tts, "TTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(tts, "_decoder", lambda: "ffmpeg")
+    monkeypatch.setattr(tts, "_edge_tts_mp3", fake_mp3)
+    monkeypatch.setattr(tts.asyncio, "create_subprocess_exec", failing_ffmpeg)
+    tts._pcm_cache.clear()
+
+    async def collect():
+        async for _ in tts.stream_pcm("질문"):
+            pass
+
+    with pytest.raises(RuntimeError, match="decode error"):
+        asyncio.run(collect())
+    assert asyncio.run(tts.load_cached_pcm("질문", "ffmpeg")) is None
@@ -0,0 +1,84 @@
+import asyncio
+
+import numpy as np
+
+import pytest
+
+from app.services import stt, vad as vad_module
+from app.services.vad import EnergyVAD
+
+SAMPLE_RATE = 16000
+
+
+def _tone(seconds: float) -> bytes:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return (3000 * np.sin(2 * np.pi * 220 * t)).astype("<i2").tobytes()
+
+
+def _silence(seconds: float) -> bytes:
+    return b"\x00\x00" * int(SAMPLE_RATE * seconds)
+
+
+def test_vad_splits_utterances_on_silence():
+    vad = EnergyVAD(sample_rate=SAMPLE_RATE, end_silence_ms=300)
+    audio = _silence(0.3) + _tone(0.5) + _silence(0.5) + _tone(0.4)
+    segments = []
+    # 클라이언트가 보내는 작은 프레임 단위로 입력
+    for i in range(0, len(audio), 640):
+        segments.extend(vad.feed(audio[i: i + 640]))
+    assert len(segments) == 1
+    tail = vad.flush()
+    assert tail is not None
+    # 너무 짧은 잡음은 발화로 치지 않음
+    vad.feed(_tone(0.05) + _silence(0.5))
+    assert vad.flush() is None
+
+
+def test_sample_rate_is_validated():
+    """
+    클라이언트가 보낸 sample_rate는 허용 목록만 받아야 하고, 프레임 크기가 0인 VAD는 만들 수 없어야 한다.
+    """
+    assert vad_module.parse_sample_rate(16000) == 16000
+    assert vad_module.parse_sample_rate("48000") == 48000
+    for value in (0, 33, -16000, None, "abc", [], True, 16000.5, 44100):
+        assert vad_module.parse_sample_rate(value) is None
+    with pytest.raises(ValueError):
+        EnergyVAD(sample_rate=0)
+
+
+class SegmentLengthBackend(stt.STTBackend):
+    """테스트용 로컬 엔진: 발화 길이(초)를 텍스트로 반환"""
+
+    name = "length"
+
+    def transcribe(self, wav_bytes: bytes) -> str:
+        return f"{(len(wav_bytes) - 44) / 2 / SAMPLE_RATE:.1f}"
+
+
+def test_streaming_transcriber_emits_partials_and_final_text():
+    pool = stt.STTWorkerPool(SegmentLengthBackend(), workers=2, max_queue=4)
+    partials = []
+
+    async def on_partial(text):
+        partials.append(text)
+
+    async def run():
+        transcriber = stt.StreamingTranscriber(
+            pool,
+            sample_rate=SAMPLE_RATE,
+            on_partial=on_partial,
+            vad=EnergyVAD(sample_rate=SAMPLE_RATE, end_silence_ms=300, pre_roll_ms=0),
+        )
+        transcriber.feed(_tone(1.0) + _silence(0.4))
+        await asyncio.sleep(0.1)
+        # 말이 끝나기 전에 첫 발화 전사가 이미 도착
+        assert len(partials) == 1
+        transcriber.feed(_tone(0.5))
+        return await transcriber.finish()
+
+    try:
+        text = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    assert len(partials) == 2
+    assert text == " ".join(partials)
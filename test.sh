@@ -11,4 +11,7 @@ PYTHONPATH=. pytest --log-file=test.log --log-file-level=INFO app/tests/test_ses
 ## stt socket test
 python3 -m http.server 8080
 
-#http://localhost:8080/tools/ws_stt_test.html 로 접속
\ No newline at end of file
+#http://localhost:8080/tools/ws_stt_test.html 로 접속
+
+## final_eval 모드 비교 벤치마크 (multi vs single)
+# PYTHONPATH=. python tools/bench_final_eval.py --logs logs.json --runs 3
@@ -0,0 +1,88 @@
+"""
+final_eval multi / single 모드 비교 벤치마크 (지연 시간, completion_cost 기준 비용, 결과 일치도)
+
+사용법:
+    PYTHONPATH=. python tools/bench_final_eval.py --logs logs.json --runs 3
+    PYTHONPATH=. python tools/bench_final_eval.py --session <session_id>
+"""
+import argparse
+import asyncio
+import difflib
+import json
+import statistics
+import time
+
+from app.services import llm_service
+
+
+def load_logs(args) -> list:
+    if args.logs:
+        with open(args.logs, "r", encoding="utf-8") as f:
+            return json.load(f)
+    from app.services import firebase_crud
+
+    return firebase_crud.get_interactions(args.session)
+
+
+def similarity(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, a or "", b or "").ratio()
+
+
+async def run_mode(mode: str, logs: list, runs: int) -> dict:
+    latencies = []
+    costs = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result, cost = await llm_service._FINAL_EVAL_MODES[mode](logs)
+        latencies.append(time.perf_counter() - start)
+        costs.append(cost)
+    return {
+        "mode": mode,
+        "latency_mean": statistics.mean(latencies),
+        "latency_max": max(latencies),
+        "cost_mean": statistics.mean(costs),
+        "result": result,
+    }
+
+
+def parity(multi: dict, single: dict) -> dict:
+    deterministic = ["total_score", "question_count",
+                     "category_scores", "questions"]
+    return {
+        "deterministic_equal": all(multi[k] == single[k] for k in deterministic),
+        "category_keys_equal": set(multi["category_feedbacks"]) == set(single["category_feedbacks"]),
+        "empty_category_feedbacks": {
+            "multi": sum(1 for v in multi["category_feedbacks"].values() if not v),
+            "single": sum(1 for v in single["category_feedbacks"].values() if not v),
+        },
+        "category_similarity": {
+            cat: round(similarity(multi["category_feedbacks"].get(cat), single["category_feedbacks"].get(cat)), 3)
+            for cat in llm_service.FINAL_EVAL_CATEGORIES
+        },
+        "final_feedback_similarity": round(similarity(multi["final_feedback"], single["final_feedback"]), 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--logs", help="인터랙션 로그 JSON 파일 경로")
+    source.add_argument("--session", help="Firestore session_id")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    logs = load_logs(args)
+    multi = await run_mode("multi", logs, args.runs)
+    single = await run_mode("single", logs, args.runs)
+    for stat in (multi, single):
+        print(
+            f"{stat['mode']:>6}  latency mean {stat['latency_mean']:.2f}s "
+            f"max {stat['latency_max']:.2f}s  cost mean ${stat['cost_mean']:.6f}"
+        )
+    print(json.dumps(parity(multi["result"], single["result"]),
+          ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())